@@ -3,9 +3,14 @@
 This package provides data models shared across the application.
 """
 
-from quantshark_shared import models, settings
+from quantshark_shared import catalog, diagnostics, ingestion, models, queries, settings, timescale
 
 __all__ = [
+    "catalog",
+    "diagnostics",
+    "ingestion",
     "models",
+    "queries",
     "settings",
+    "timescale",
 ]
@@ -0,0 +1,21 @@
+"""Contract catalog access."""
+
+from quantshark_shared.catalog.registry import (
+    REGISTRY_CHANNEL,
+    ContractInfo,
+    ContractKey,
+    ContractRegistry,
+    RegistryStats,
+)
+from quantshark_shared.catalog.sync import CatalogDiff, Listing, sync_catalog
+
+__all__ = [
+    "REGISTRY_CHANNEL",
+    "CatalogDiff",
+    "ContractInfo",
+    "ContractKey",
+    "ContractRegistry",
+    "Listing",
+    "RegistryStats",
+    "sync_catalog",
+]
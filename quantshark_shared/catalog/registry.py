@@ -0,0 +1,258 @@
+"""In-process contract registry kept coherent with LISTEN/NOTIFY."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import psycopg
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from quantshark_shared.settings.engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_CHANNEL = "contract_registry"
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+ContractKey = tuple[str, str, str]  # (asset_name, section_name, quote_name)
+
+_REGISTRY_COLUMNS = """
+    id, asset_name, section_name, quote_name, funding_interval,
+    multiplier_1h::FLOAT8, multiplier_8h::FLOAT8, multiplier_1d::FLOAT8, multiplier_365d::FLOAT8
+"""
+
+LOAD_ALL_SQL = text(f"SELECT {_REGISTRY_COLUMNS} FROM contract_enriched;")
+LOAD_AFFECTED_SQL = text(
+    f"""
+    SELECT {_REGISTRY_COLUMNS} FROM contract_enriched
+    WHERE id = ANY(CAST(:ids AS UUID[]))
+       OR asset_name = ANY(CAST(:asset_names AS TEXT[]))
+       OR section_name = ANY(CAST(:section_names AS TEXT[]));
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ContractInfo:
+    id: uuid.UUID
+    asset_name: str
+    section_name: str
+    quote_name: str
+    funding_interval: int
+    multiplier_1h: float
+    multiplier_8h: float
+    multiplier_1d: float
+    multiplier_365d: float
+
+    @property
+    def key(self) -> ContractKey:
+        return (self.asset_name, self.section_name, self.quote_name)
+
+
+@dataclass(frozen=True)
+class RegistryStats:
+    contracts: int
+    hits: int
+    misses: int
+    full_reloads: int
+    partial_reloads: int
+    notifications: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ContractRegistry:
+    """Lookup maps of all non-deprecated contracts: key -> id and id -> ContractInfo.
+
+    ``start()`` subscribes to the contract_registry channel, then loads every contract
+    from contract_enriched. Each notification reloads only the contracts it names; a
+    notification that fails to apply triggers a full reload, as does a lost listener
+    connection once it is re-established.
+
+    Maps are replaced, never mutated, so lookups are plain dict reads and safe from
+    any task or thread. Reloads are serialized by an asyncio lock.
+    """
+
+    def __init__(self, engine: AsyncEngine | None = None) -> None:
+        self._engine = engine or get_engine()
+        self._ids: dict[ContractKey, uuid.UUID] = {}
+        self._contracts: dict[uuid.UUID, ContractInfo] = {}
+        self._reload_lock = asyncio.Lock()
+        self._listener: asyncio.Task[None] | None = None
+        self._ready = asyncio.Event()
+        self._hits = 0
+        self._misses = 0
+        self._full_reloads = 0
+        self._partial_reloads = 0
+        self._notifications = 0
+
+    async def start(self) -> None:
+        """Start listening and wait for the initial load."""
+        if self._listener is None:
+            self._ready.clear()
+            self._listener = asyncio.create_task(self._listen(), name="contract-registry")
+        ready = asyncio.create_task(self._ready.wait())
+        done, _ = await asyncio.wait({ready, self._listener}, return_when=asyncio.FIRST_COMPLETED)
+        if ready not in done:
+            ready.cancel()
+            listener, self._listener = self._listener, None
+            listener.result()  # re-raise the listener failure
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._listener
+        self._listener = None
+
+    async def __aenter__(self) -> ContractRegistry:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    def get_id(self, asset_name: str, section_name: str, quote_name: str) -> uuid.UUID | None:
+        contract_id = self._ids.get((asset_name, section_name, quote_name))
+        if contract_id is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return contract_id
+
+    def get(self, contract_id: uuid.UUID) -> ContractInfo | None:
+        info = self._contracts.get(contract_id)
+        if info is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return info
+
+    def __len__(self) -> int:
+        return len(self._contracts)
+
+    def __contains__(self, contract_id: object) -> bool:
+        return contract_id in self._contracts
+
+    @property
+    def stats(self) -> RegistryStats:
+        return RegistryStats(
+            contracts=len(self._contracts),
+            hits=self._hits,
+            misses=self._misses,
+            full_reloads=self._full_reloads,
+            partial_reloads=self._partial_reloads,
+            notifications=self._notifications,
+        )
+
+    async def reload(self) -> None:
+        """Replace the maps with a fresh snapshot of contract_enriched."""
+        async with self._reload_lock:
+            async with self._engine.connect() as connection:
+                result = await connection.execute(LOAD_ALL_SQL)
+                contracts = {row[0]: ContractInfo(*row) for row in result.tuples()}
+            self._swap(contracts)
+            self._full_reloads += 1
+
+    async def reload_affected(
+        self,
+        ids: Iterable[uuid.UUID] = (),
+        asset_names: Iterable[str] = (),
+        section_names: Iterable[str] = (),
+    ) -> None:
+        """Reload the given contracts and every contract of the given assets/sections."""
+        ids, asset_names, section_names = set(ids), set(asset_names), set(section_names)
+        async with self._reload_lock:
+            async with self._engine.connect() as connection:
+                result = await connection.execute(
+                    LOAD_AFFECTED_SQL,
+                    {
+                        "ids": list(ids),
+                        "asset_names": list(asset_names),
+                        "section_names": list(section_names),
+                    },
+                )
+                fresh = [ContractInfo(*row) for row in result.tuples()]
+
+            contracts = {
+                contract_id: info
+                for contract_id, info in self._contracts.items()
+                if contract_id not in ids
+                and info.asset_name not in asset_names
+                and info.section_name not in section_names
+            }
+            contracts.update((info.id, info) for info in fresh)
+            self._swap(contracts)
+            self._partial_reloads += 1
+
+    def _swap(self, contracts: dict[uuid.UUID, ContractInfo]) -> None:
+        self._ids = {info.key: contract_id for contract_id, info in contracts.items()}
+        self._contracts = contracts
+
+    async def _apply(self, payload: str) -> None:
+        self._notifications += 1
+        message: dict[str, Any] = json.loads(payload)
+        keys: list[str] | None = message.get("keys")
+        table_name = message.get("table")
+        if keys is None:
+            await self.reload()
+        elif table_name == "contract":
+            await self.reload_affected(ids=(uuid.UUID(key) for key in keys))
+        elif table_name == "asset":
+            await self.reload_affected(asset_names=keys)
+        elif table_name == "section":
+            await self.reload_affected(section_names=keys)
+        else:
+            logger.warning("Unexpected %s payload: %s", REGISTRY_CHANNEL, payload)
+
+    def _conninfo(self) -> str:
+        url = self._engine.url.set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    async def _listen(self) -> None:
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                connection = await psycopg.AsyncConnection.connect(
+                    self._conninfo(), autocommit=True
+                )
+                async with connection:
+                    await connection.execute(f"LISTEN {REGISTRY_CHANNEL}")
+                    # Subscribe before loading, so no change between the two is lost
+                    await self.reload()
+                    self._ready.set()
+                    delay = RECONNECT_DELAY
+                    async for notify in connection.notifies():
+                        try:
+                            await self._apply(notify.payload)
+                        except Exception:
+                            # A bad payload or failed partial reload must not end the
+                            # listener; a full reload brings the cache back in line
+                            logger.exception(
+                                "Failed to apply %s payload: %s, reloading all contracts",
+                                REGISTRY_CHANNEL,
+                                notify.payload,
+                            )
+                            await self.reload()
+            except (psycopg.OperationalError, DBAPIError, OSError):
+                if not self._ready.is_set():
+                    raise
+                logger.warning(
+                    "Contract registry listener lost, reconnecting in %.0fs", delay, exc_info=True
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
@@ -0,0 +1,240 @@
+"""Set-based sync of one section's listings into asset, quote and contract."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+INSERT_SECTION_SQL = text(
+    "INSERT INTO section (name) VALUES (:section_name) ON CONFLICT DO NOTHING RETURNING name;"
+)
+
+# Names are bound sorted and every statement touching asset or quote rows takes them in
+# name order, so concurrent syncs of sections sharing assets cannot deadlock on each other
+INSERT_ASSETS_SQL = text(
+    """
+    INSERT INTO asset (name, market_cap_rank)
+    SELECT name, rank
+    FROM unnest(CAST(:names AS TEXT[]), CAST(:ranks AS INTEGER[])) AS t (name, rank)
+    ORDER BY name
+    ON CONFLICT DO NOTHING
+    RETURNING name;
+    """
+)
+
+# Only ranks the listing provides and that differ: unchanged rows are not rewritten.
+# The rows are locked in name order first; the UPDATE's join order is up to the planner.
+UPDATE_RANKS_SQL = text(
+    """
+    WITH listing AS (
+        SELECT name, rank
+        FROM unnest(CAST(:names AS TEXT[]), CAST(:ranks AS INTEGER[])) AS t (name, rank)
+        WHERE rank IS NOT NULL
+    ),
+    locked AS (
+        SELECT a.name
+        FROM asset a
+        JOIN listing l ON l.name = a.name
+        WHERE a.market_cap_rank IS DISTINCT FROM l.rank
+        ORDER BY a.name
+        FOR NO KEY UPDATE OF a
+    )
+    UPDATE asset a SET market_cap_rank = l.rank
+    FROM listing l
+    WHERE a.name = l.name
+      AND a.name IN (SELECT name FROM locked)
+      AND a.market_cap_rank IS DISTINCT FROM l.rank
+    RETURNING a.name;
+    """
+)
+
+INSERT_QUOTES_SQL = text(
+    """
+    INSERT INTO quote (name)
+    SELECT DISTINCT name FROM unnest(CAST(:names AS TEXT[])) AS t (name)
+    ORDER BY name
+    ON CONFLICT DO NOTHING
+    RETURNING name;
+    """
+)
+
+# Inserts new contracts, updates funding_interval and clears deprecated where they
+# differ. previous is read from the statement's snapshot, i.e. before the upsert.
+UPSERT_CONTRACTS_SQL = text(
+    """
+    WITH listing AS (
+        SELECT asset_name, quote_name, funding_interval
+        FROM unnest(
+            CAST(:asset_names AS TEXT[]),
+            CAST(:quote_names AS TEXT[]),
+            CAST(:funding_intervals AS INTEGER[])
+        ) AS t (asset_name, quote_name, funding_interval)
+    ),
+    previous AS (
+        SELECT c.id, c.funding_interval, c.deprecated
+        FROM contract c
+        JOIN listing l ON l.asset_name = c.asset_name AND l.quote_name = c.quote_name
+        WHERE c.section_name = :section_name
+    ),
+    written AS (
+        INSERT INTO contract (asset_name, section_name, quote_name, funding_interval,
+                              synced, deprecated)
+        SELECT asset_name, :section_name, quote_name, funding_interval, false, false
+        FROM listing
+        ON CONFLICT (asset_name, section_name, quote_name) DO UPDATE
+        SET funding_interval = EXCLUDED.funding_interval, deprecated = false
+        WHERE contract.funding_interval <> EXCLUDED.funding_interval OR contract.deprecated
+        RETURNING id, funding_interval
+    )
+    SELECT
+        w.id,
+        p.id IS NULL AS created,
+        p.id IS NOT NULL AND p.funding_interval <> w.funding_interval AS interval_changed,
+        coalesce(p.deprecated, false) AS reactivated
+    FROM written w
+    LEFT JOIN previous p ON p.id = w.id;
+    """
+)
+
+DEPRECATE_MISSING_SQL = text(
+    """
+    UPDATE contract c SET deprecated = true
+    WHERE c.section_name = :section_name
+      AND NOT c.deprecated
+      AND NOT EXISTS (
+          SELECT 1
+          FROM unnest(CAST(:asset_names AS TEXT[]), CAST(:quote_names AS TEXT[]))
+              AS l (asset_name, quote_name)
+          WHERE l.asset_name = c.asset_name AND l.quote_name = c.quote_name
+      )
+    RETURNING c.id;
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Listing:
+    """One contract a section currently lists; market_cap_rank None keeps the stored one."""
+
+    asset_name: str
+    quote_name: str
+    funding_interval: int
+    market_cap_rank: int | None = None
+
+
+@dataclass(frozen=True)
+class CatalogDiff:
+    section_name: str
+    section_created: bool = False
+    assets_created: list[str] = field(default_factory=list)
+    quotes_created: list[str] = field(default_factory=list)
+    ranks_updated: list[str] = field(default_factory=list)
+    contracts_created: list[uuid.UUID] = field(default_factory=list)
+    contracts_updated: list[uuid.UUID] = field(default_factory=list)  # funding_interval
+    contracts_reactivated: list[uuid.UUID] = field(default_factory=list)
+    contracts_deprecated: list[uuid.UUID] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(
+            self.section_created
+            or self.assets_created
+            or self.quotes_created
+            or self.ranks_updated
+            or self.contracts_created
+            or self.contracts_updated
+            or self.contracts_reactivated
+            or self.contracts_deprecated
+        )
+
+    @property
+    def contracts_changed(self) -> bool:
+        return bool(
+            self.contracts_created
+            or self.contracts_updated
+            or self.contracts_reactivated
+            or self.contracts_deprecated
+        )
+
+
+async def sync_catalog(
+    session: AsyncSession,
+    section_name: str,
+    listings: Iterable[Listing],
+    deprecate_missing: bool = True,
+) -> CatalogDiff:
+    """Make section's contracts match listings, the section's full current listing set.
+
+    Runs six statements whatever the number of listings: section, assets, ranks, quotes,
+    contract upsert and, with deprecate_missing, one UPDATE marking contracts absent
+    from listings deprecated. Listed deprecated contracts are reactivated. A repeated
+    (asset_name, quote_name) keeps its last listing.
+
+    Only rows that differ are written, so an unchanged listing set writes nothing and
+    neither the contract_enriched triggers nor registry notifications do any work.
+
+    The caller owns the transaction: nothing is committed here.
+    """
+    by_key = {(listing.asset_name, listing.quote_name): listing for listing in listings}
+    asset_ranks: dict[str, int | None] = {}
+    for listing in by_key.values():
+        if listing.market_cap_rank is not None or listing.asset_name not in asset_ranks:
+            asset_ranks[listing.asset_name] = listing.market_cap_rank
+    asset_names = sorted(asset_ranks)
+    assets = {"names": asset_names, "ranks": [asset_ranks[name] for name in asset_names]}
+    contracts = {
+        "section_name": section_name,
+        "asset_names": [listing.asset_name for listing in by_key.values()],
+        "quote_names": [listing.quote_name for listing in by_key.values()],
+    }
+
+    section_created = (
+        await session.execute(INSERT_SECTION_SQL, {"section_name": section_name})
+    ).first() is not None
+    assets_created = list((await session.execute(INSERT_ASSETS_SQL, assets)).scalars())
+    ranks_updated = list((await session.execute(UPDATE_RANKS_SQL, assets)).scalars())
+    quotes_created = list(
+        (
+            await session.execute(
+                INSERT_QUOTES_SQL, {"names": sorted(set(contracts["quote_names"]))}
+            )
+        ).scalars()
+    )
+
+    created: list[uuid.UUID] = []
+    updated: list[uuid.UUID] = []
+    reactivated: list[uuid.UUID] = []
+    result = await session.execute(
+        UPSERT_CONTRACTS_SQL,
+        {
+            **contracts,
+            "funding_intervals": [listing.funding_interval for listing in by_key.values()],
+        },
+    )
+    for contract_id, is_created, interval_changed, was_deprecated in result.tuples():
+        if is_created:
+            created.append(contract_id)
+        if interval_changed:
+            updated.append(contract_id)
+        if was_deprecated:
+            reactivated.append(contract_id)
+
+    deprecated: list[uuid.UUID] = []
+    if deprecate_missing:
+        deprecated = list((await session.execute(DEPRECATE_MISSING_SQL, contracts)).scalars())
+
+    return CatalogDiff(
+        section_name=section_name,
+        section_created=section_created,
+        assets_created=assets_created,
+        quotes_created=quotes_created,
+        ranks_updated=ranks_updated,
+        contracts_created=created,
+        contracts_updated=updated,
+        contracts_reactivated=reactivated,
+        contracts_deprecated=deprecated,
+    )
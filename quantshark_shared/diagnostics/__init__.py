@@ -0,0 +1,52 @@
+"""Database telemetry (storage, aggregate freshness, background jobs) and query
+instrumentation."""
+
+from quantshark_shared.diagnostics.instrumentation import (
+    InstrumentationConfig,
+    InstrumentationSnapshot,
+    PoolStats,
+    QueryInstrumentation,
+    SlowQuery,
+    StatementStats,
+    get_instrumentation,
+    instrument_engine,
+    normalize_statement,
+    uninstrument_engine,
+)
+from quantshark_shared.diagnostics.prometheus import (
+    PROMETHEUS_CONTENT_TYPE,
+    render_instrumentation,
+    render_prometheus,
+)
+from quantshark_shared.diagnostics.telemetry import (
+    AggregateFreshness,
+    DatabaseTelemetry,
+    HypertableStorage,
+    IndexActivity,
+    JobStatus,
+    TableActivity,
+    collect_telemetry,
+)
+
+__all__ = [
+    "PROMETHEUS_CONTENT_TYPE",
+    "AggregateFreshness",
+    "DatabaseTelemetry",
+    "HypertableStorage",
+    "IndexActivity",
+    "InstrumentationConfig",
+    "InstrumentationSnapshot",
+    "JobStatus",
+    "PoolStats",
+    "QueryInstrumentation",
+    "SlowQuery",
+    "StatementStats",
+    "TableActivity",
+    "collect_telemetry",
+    "get_instrumentation",
+    "instrument_engine",
+    "normalize_statement",
+    "render_instrumentation",
+    "render_prometheus",
+    "uninstrument_engine",
+]
@@ -0,0 +1,476 @@
+"""Opt-in per-statement latency, row count, pool and slow-query instrumentation.
+
+Statements are keyed by a normalized form (bind parameters, literals and IN lists
+collapsed), so one histogram covers every execution of the same query shape.
+With ``sample_rate < 1`` only that fraction of executions is timed; the rest cost one
+random() call. Slow statements get a plain ``EXPLAIN`` (estimated costs, nothing is
+executed) on a separate connection, at most once per statement shape per
+``explain_interval``. ``explain_analyze`` opts read-only statements into
+``EXPLAIN (ANALYZE, BUFFERS)``, which runs them again in a read-only transaction.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import functools
+import logging
+import random
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool, PoolProxiedConnection, QueuePool
+
+from quantshark_shared.settings.db import DBSettings
+
+logger = logging.getLogger(__name__)
+
+DBAPIParameters = Mapping[str, Any] | Sequence[Any] | None
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+OVERFLOW_STATEMENT = "<other>"
+SKIP_OPTION = "quantshark_skip_instrumentation"
+TIMING_KEY = "quantshark_statement_started"  # connection info: stack of start times
+
+_BIND_PARAMETER = re.compile(r"%\([^)]*\)s|%s")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+_WRITE_KEYWORD = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE|COPY|CALL)\b", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """Collapse a SQL string to its shape: parameters and literals become ``?``."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("?, ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _is_read_only(statement: str) -> bool:
+    words = statement.split(None, 1)
+    head = words[0].upper() if words else ""
+    return head in ("SELECT", "WITH") and _WRITE_KEYWORD.search(statement) is None
+
+
+@dataclass(frozen=True)
+class InstrumentationConfig:
+    sample_rate: float = 1.0  # fraction of executions timed
+    slow_threshold: float | None = 0.5  # seconds; None disables slow-query capture
+    explain_slow: bool = True
+    explain_interval: float = 300.0  # seconds between EXPLAINs of one statement shape
+    explain_analyze: bool = False  # re-execute read-only statements for actual timings
+    explain_timeout: float = 5.0  # seconds; statement_timeout of the EXPLAIN
+    latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    max_statements: int = 500  # distinct shapes tracked; the rest go to "<other>"
+    slow_log_size: int = 100
+
+    @classmethod
+    def from_settings(cls, settings: DBSettings) -> InstrumentationConfig:
+        return cls(
+            sample_rate=settings.instrument_sample_rate,
+            slow_threshold=settings.slow_query_ms / 1000 if settings.slow_query_ms else None,
+            explain_analyze=settings.instrument_explain_analyze,
+        )
+
+
+@dataclass(slots=True)
+class _StatementCounter:
+    bucket_counts: list[int]
+    count: int = 0
+    errors: int = 0
+    rows: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class StatementStats:
+    statement: str  # normalized
+    count: int
+    errors: int
+    rows: int
+    total_seconds: float
+    max_seconds: float
+    bucket_counts: tuple[int, ...]  # per bucket, not cumulative; last is +Inf
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    size: int
+    checked_out: int
+    overflow: int
+    connects: int
+    checkouts: int
+    invalidations: int
+    checkout_wait_count: int
+    checkout_wait_seconds: float
+    checkout_wait_max_seconds: float
+
+
+@dataclass(frozen=True, slots=True)
+class SlowQuery:
+    statement: str  # as sent, with driver placeholders
+    normalized: str
+    seconds: float
+    captured_at: datetime.datetime  # naive UTC
+    plan: str | None  # EXPLAIN output, None when not captured
+
+
+@dataclass(frozen=True)
+class InstrumentationSnapshot:
+    sample_rate: float
+    latency_buckets: tuple[float, ...]
+    statements: list[StatementStats]
+    pool: PoolStats
+    slow_queries: list[SlowQuery]
+
+
+@dataclass
+class _PoolCounters:
+    connects: int = 0
+    checkouts: int = 0
+    invalidations: int = 0
+    wait_count: int = 0
+    wait_seconds: float = 0.0
+    wait_max_seconds: float = 0.0
+
+
+class QueryInstrumentation:
+    """Event listeners recording statement timing, pool activity and slow queries.
+
+    Use ``instrument_engine(engine)`` to attach; ``detach()`` removes every listener.
+    """
+
+    def __init__(self, engine: AsyncEngine, config: InstrumentationConfig | None = None) -> None:
+        self._engine = engine
+        self._config = config or InstrumentationConfig()
+        self._lock = threading.Lock()
+        self._statements: dict[str, _StatementCounter] = {}
+        self._pool = _PoolCounters()
+        self._slow_queries: deque[SlowQuery] = deque(maxlen=self._config.slow_log_size)
+        self._last_explained: dict[str, float] = {}
+        self._explain_tasks: set[asyncio.Task[None]] = set()
+        self._listened_pool: Pool | None = None
+        self._wrapped_pool: Pool | None = None
+        self._attached = False
+
+    @property
+    def config(self) -> InstrumentationConfig:
+        return self._config
+
+    def attach(self) -> None:
+        if self._attached:
+            return
+        sync_engine = self._engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "handle_error", self._on_error)
+        event.listen(sync_engine, "engine_disposed", self._on_disposed)
+        # Pool listeners are registered once; recreated pools copy them on dispose()
+        self._listened_pool = sync_engine.pool
+        event.listen(self._listened_pool, "connect", self._on_connect)
+        event.listen(self._listened_pool, "checkout", self._on_checkout)
+        event.listen(self._listened_pool, "invalidate", self._on_invalidate)
+        self._wrap_pool(sync_engine.pool)
+        self._attached = True
+
+    def detach(self) -> None:
+        if not self._attached:
+            return
+        sync_engine = self._engine.sync_engine
+        event.remove(sync_engine, "before_cursor_execute", self._before_execute)
+        event.remove(sync_engine, "after_cursor_execute", self._after_execute)
+        event.remove(sync_engine, "handle_error", self._on_error)
+        event.remove(sync_engine, "engine_disposed", self._on_disposed)
+        if self._listened_pool is not None:
+            event.remove(self._listened_pool, "connect", self._on_connect)
+            event.remove(self._listened_pool, "checkout", self._on_checkout)
+            event.remove(self._listened_pool, "invalidate", self._on_invalidate)
+            self._listened_pool = None
+        self._unwrap_pool()
+        self._attached = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._pool = _PoolCounters()
+            self._slow_queries.clear()
+            self._last_explained.clear()
+
+    async def wait_for_explains(self) -> None:
+        """Wait until pending slow-query EXPLAINs have finished."""
+        if self._explain_tasks:
+            await asyncio.gather(*self._explain_tasks, return_exceptions=True)
+
+    def snapshot(self) -> InstrumentationSnapshot:
+        pool = self._engine.sync_engine.pool
+        queue_pool = isinstance(pool, QueuePool)  # size/checkedout/overflow are QueuePool's
+        with self._lock:
+            statements = [
+                StatementStats(
+                    statement=statement,
+                    count=counter.count,
+                    errors=counter.errors,
+                    rows=counter.rows,
+                    total_seconds=counter.total_seconds,
+                    max_seconds=counter.max_seconds,
+                    bucket_counts=tuple(counter.bucket_counts),
+                )
+                for statement, counter in self._statements.items()
+            ]
+            counters = self._pool
+            pool_stats = PoolStats(
+                size=pool.size() if queue_pool else 0,
+                checked_out=pool.checkedout() if queue_pool else 0,
+                overflow=max(pool.overflow(), 0) if queue_pool else 0,
+                connects=counters.connects,
+                checkouts=counters.checkouts,
+                invalidations=counters.invalidations,
+                checkout_wait_count=counters.wait_count,
+                checkout_wait_seconds=counters.wait_seconds,
+                checkout_wait_max_seconds=counters.wait_max_seconds,
+            )
+            slow_queries = list(self._slow_queries)
+
+        return InstrumentationSnapshot(
+            sample_rate=self._config.sample_rate,
+            latency_buckets=self._config.latency_buckets,
+            statements=statements,
+            pool=pool_stats,
+            slow_queries=slow_queries,
+        )
+
+    # Statement events
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        started: list[float | None] = conn.info.setdefault(TIMING_KEY, [])
+        sampled = random.random() < self._config.sample_rate and not (
+            context is not None and context.execution_options.get(SKIP_OPTION)
+        )
+        started.append(time.perf_counter() if sampled else None)
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        pending = conn.info.get(TIMING_KEY)
+        if not pending:
+            return
+        started = pending.pop()
+        if started is None:
+            return
+
+        elapsed = time.perf_counter() - started
+        normalized = normalize_statement(statement)
+        rows = max(cursor.rowcount, 0) if cursor is not None else 0
+        self._record(normalized, elapsed, rows, error=False)
+
+        threshold = self._config.slow_threshold
+        if threshold is not None and elapsed >= threshold:
+            self._capture_slow(statement, normalized, elapsed, parameters, executemany)
+
+    def _on_error(self, exception_context) -> None:  # noqa: ANN001
+        conn = exception_context.connection
+        pending = conn.info.get(TIMING_KEY) if conn is not None else None
+        if not pending:
+            return
+        started = pending.pop()
+        statement = exception_context.statement
+        if started is None or statement is None:
+            return
+        self._record(normalize_statement(statement), time.perf_counter() - started, 0, error=True)
+
+    def _record(self, normalized: str, elapsed: float, rows: int, error: bool) -> None:
+        buckets = self._config.latency_buckets
+        with self._lock:
+            counter = self._statements.get(normalized)
+            if counter is None:
+                if len(self._statements) >= self._config.max_statements:
+                    normalized = OVERFLOW_STATEMENT
+                    counter = self._statements.get(normalized)
+                if counter is None:
+                    counter = _StatementCounter(bucket_counts=[0] * (len(buckets) + 1))
+                    self._statements[normalized] = counter
+
+            counter.count += 1
+            counter.errors += error
+            counter.rows += rows
+            counter.total_seconds += elapsed
+            counter.max_seconds = max(counter.max_seconds, elapsed)
+            for index, bound in enumerate(buckets):
+                if elapsed <= bound:
+                    counter.bucket_counts[index] += 1
+                    break
+            else:
+                counter.bucket_counts[-1] += 1
+
+    # Slow queries
+
+    def _capture_slow(
+        self,
+        statement: str,
+        normalized: str,
+        elapsed: float,
+        parameters: DBAPIParameters,
+        executemany: bool,
+    ) -> None:
+        now = time.monotonic()
+        explain = (
+            self._config.explain_slow
+            and not executemany
+            and now - self._last_explained.get(normalized, float("-inf"))
+            >= self._config.explain_interval
+        )
+        loop = _running_loop() if explain else None
+        if loop is None:
+            self._add_slow_query(statement, normalized, elapsed, None)
+            return
+
+        self._last_explained[normalized] = now
+        task = loop.create_task(self._explain(statement, normalized, elapsed, parameters))
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(
+        self,
+        statement: str,
+        normalized: str,
+        elapsed: float,
+        parameters: DBAPIParameters,
+    ) -> None:
+        # The connection is separate; session-local state such as temp tables is not
+        # visible to it. ANALYZE executes the statement again: the read-only transaction
+        # makes writes through functions fail, and the connection is discarded afterwards
+        # so session-level side effects (advisory locks, settings) do not reach the pool.
+        analyze = self._config.explain_analyze and _is_read_only(statement)
+        timeout_ms = int(self._config.explain_timeout * 1000)
+        plan: str | None = None
+        try:
+            async with self._engine.connect() as connection:
+                connection = await connection.execution_options(**{SKIP_OPTION: True})
+                await connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+                await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+                try:
+                    result = await connection.exec_driver_sql(
+                        f"EXPLAIN {'(ANALYZE, BUFFERS) ' if analyze else ''}{statement}",
+                        parameters,
+                    )
+                    plan = "\n".join(row[0] for row in result.tuples())
+                finally:
+                    await connection.rollback()
+                    if analyze:
+                        await connection.invalidate()
+        except Exception:
+            logger.warning("EXPLAIN of slow statement failed: %s", normalized, exc_info=True)
+        self._add_slow_query(statement, normalized, elapsed, plan)
+
+    def _add_slow_query(
+        self,
+        statement: str,
+        normalized: str,
+        elapsed: float,
+        plan: str | None,
+    ) -> None:
+        captured_at = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        with self._lock:
+            self._slow_queries.append(SlowQuery(statement, normalized, elapsed, captured_at, plan))
+        if plan is None:
+            logger.warning("Slow statement (%.3fs): %s", elapsed, normalized)
+        else:
+            logger.warning("Slow statement (%.3fs): %s\n%s", elapsed, normalized, plan)
+
+    # Pool events
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:  # noqa: ANN001
+        with self._lock:
+            self._pool.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:  # noqa: ANN001
+        with self._lock:
+            self._pool.checkouts += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:  # noqa: ANN001
+        with self._lock:
+            self._pool.invalidations += 1
+
+    def _on_disposed(self, engine: Engine) -> None:
+        # dispose() swaps in a recreated pool; listeners carry over, the wrapper does not
+        self._unwrap_pool()
+        self._wrap_pool(engine.pool)
+
+    def _wrap_pool(self, pool: Pool) -> None:
+        # Pool has no "before checkout" event, so the wait is timed around connect()
+        connect = pool.connect
+
+        @functools.wraps(connect)
+        def timed_connect() -> PoolProxiedConnection:
+            started = time.perf_counter()
+            try:
+                return connect()
+            finally:
+                waited = time.perf_counter() - started
+                with self._lock:
+                    counters = self._pool
+                    counters.wait_count += 1
+                    counters.wait_seconds += waited
+                    counters.wait_max_seconds = max(counters.wait_max_seconds, waited)
+
+        pool.connect = timed_connect  # type: ignore[method-assign]
+        self._wrapped_pool = pool
+
+    def _unwrap_pool(self) -> None:
+        if self._wrapped_pool is not None:
+            self._wrapped_pool.__dict__.pop("connect", None)
+            self._wrapped_pool = None
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+_instrumentations: weakref.WeakKeyDictionary[Engine, QueryInstrumentation] = (
+    weakref.WeakKeyDictionary()
+)
+_instrumentations_lock = threading.Lock()
+
+
+def instrument_engine(
+    engine: AsyncEngine,
+    config: InstrumentationConfig | None = None,
+) -> QueryInstrumentation:
+    """Attach instrumentation to engine, or return the one already attached."""
+    with _instrumentations_lock:
+        instrumentation = _instrumentations.get(engine.sync_engine)
+        if instrumentation is None:
+            instrumentation = QueryInstrumentation(engine, config)
+            instrumentation.attach()
+            _instrumentations[engine.sync_engine] = instrumentation
+        return instrumentation
+
+
+def get_instrumentation(engine: AsyncEngine) -> QueryInstrumentation | None:
+    return _instrumentations.get(engine.sync_engine)
+
+
+def uninstrument_engine(engine: AsyncEngine) -> None:
+    with _instrumentations_lock:
+        instrumentation = _instrumentations.pop(engine.sync_engine, None)
+    if instrumentation is not None:
+        instrumentation.detach()
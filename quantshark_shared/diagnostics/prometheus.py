@@ -0,0 +1,328 @@
+"""Prometheus text exposition (format 0.0.4) for DatabaseTelemetry."""
+
+from __future__ import annotations
+
+import datetime
+from collections.abc import Iterable, Sequence
+
+from quantshark_shared.diagnostics.instrumentation import InstrumentationSnapshot
+from quantshark_shared.diagnostics.telemetry import DatabaseTelemetry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_PREFIX = "quantshark_db"
+
+Labels = dict[str, str]
+Sample = tuple[Labels, float]
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value != value:  # NaN
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _unix_seconds(timestamp: datetime.datetime) -> float:
+    return (timestamp - EPOCH).total_seconds()
+
+
+class _Exposition:
+    def __init__(self, prefix: str) -> None:
+        self._prefix = prefix
+        self._lines: list[str] = []
+
+    def metric(self, name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> None:
+        full_name = f"{self._prefix}_{name}"
+        self._lines.append(f"# HELP {full_name} {help_text}")
+        self._lines.append(f"# TYPE {full_name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            selector = f"{full_name}{{{label_text}}}" if label_text else full_name
+            self._lines.append(f"{selector} {_format_value(value)}")
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: tuple[float, ...],
+        samples: Iterable[tuple[Labels, Sequence[int], float]],
+    ) -> None:
+        """samples: (labels, per-bucket counts with +Inf last, sum of observations)."""
+        full_name = f"{self._prefix}_{name}"
+        self._lines.append(f"# HELP {full_name} {help_text}")
+        self._lines.append(f"# TYPE {full_name} histogram")
+        bounds = [_format_value(bound) for bound in buckets] + ["+Inf"]
+        for labels, counts, total in samples:
+            label_text = "".join(f'{key}="{_escape(val)}",' for key, val in labels.items())
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                self._lines.append(f'{full_name}_bucket{{{label_text}le="{bound}"}} {cumulative}')
+            label_set = f"{{{label_text.rstrip(',')}}}" if label_text else ""
+            self._lines.append(f"{full_name}_sum{label_set} {_format_value(total)}")
+            self._lines.append(f"{full_name}_count{label_set} {cumulative}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def render_prometheus(telemetry: DatabaseTelemetry, prefix: str = METRIC_PREFIX) -> str:
+    """Render telemetry as Prometheus text, ready to serve with PROMETHEUS_CONTENT_TYPE.
+
+    Samples whose source value is unknown (e.g. the lag of an aggregate with nothing
+    materialized yet) are omitted rather than exported as zero.
+    """
+    out = _Exposition(prefix)
+    now = telemetry.collected_at
+
+    storage = telemetry.storage
+    out.metric(
+        "hypertable_chunks",
+        "gauge",
+        "Chunks per hypertable or continuous aggregate.",
+        (({"relation": s.name, "kind": s.kind}, s.chunks) for s in storage),
+    )
+    out.metric(
+        "hypertable_compressed_chunks",
+        "gauge",
+        "Compressed chunks per hypertable or continuous aggregate.",
+        (({"relation": s.name, "kind": s.kind}, s.compressed_chunks) for s in storage),
+    )
+    out.metric(
+        "hypertable_bytes",
+        "gauge",
+        "On-disk size by component (table, index, toast, total).",
+        (
+            ({"relation": s.name, "kind": s.kind, "component": component}, size)
+            for s in storage
+            for component, size in (
+                ("table", s.table_bytes),
+                ("index", s.index_bytes),
+                ("toast", s.toast_bytes),
+                ("total", s.total_bytes),
+            )
+        ),
+    )
+    out.metric(
+        "hypertable_max_chunk_bytes",
+        "gauge",
+        "Size of the largest chunk.",
+        (({"relation": s.name, "kind": s.kind}, s.max_chunk_bytes) for s in storage),
+    )
+
+    aggregates = telemetry.aggregates
+    out.metric(
+        "aggregate_refresh_lag_seconds",
+        "gauge",
+        "Time between now and the continuous aggregate watermark.",
+        (
+            ({"view": a.view_name}, lag.total_seconds())
+            for a in aggregates
+            if (lag := a.lag(now)) is not None
+        ),
+    )
+    out.metric(
+        "aggregate_watermark_timestamp_seconds",
+        "gauge",
+        "End of the materialized range, Unix seconds.",
+        (
+            ({"view": a.view_name}, _unix_seconds(a.watermark))
+            for a in aggregates
+            if a.watermark is not None
+        ),
+    )
+    out.metric(
+        "aggregate_last_refresh_timestamp_seconds",
+        "gauge",
+        "Last successful refresh policy run, Unix seconds.",
+        (
+            ({"view": a.view_name}, _unix_seconds(a.last_successful_refresh))
+            for a in aggregates
+            if a.last_successful_refresh is not None
+        ),
+    )
+    out.metric(
+        "aggregate_materialized_only",
+        "gauge",
+        "1 when real-time aggregation is disabled.",
+        (({"view": a.view_name}, int(a.materialized_only)) for a in aggregates),
+    )
+
+    def job_labels(job_id: int, proc_name: str, relation: str | None) -> Labels:
+        return {"job_id": str(job_id), "proc": proc_name, "relation": relation or ""}
+
+    jobs = telemetry.jobs
+    out.metric(
+        "job_runs_total",
+        "counter",
+        "Background job runs.",
+        ((job_labels(j.job_id, j.proc_name, j.relation), j.total_runs) for j in jobs),
+    )
+    out.metric(
+        "job_failures_total",
+        "counter",
+        "Failed background job runs.",
+        ((job_labels(j.job_id, j.proc_name, j.relation), j.total_failures) for j in jobs),
+    )
+    out.metric(
+        "job_last_run_failed",
+        "gauge",
+        "1 when the most recent run failed.",
+        ((job_labels(j.job_id, j.proc_name, j.relation), int(j.failing)) for j in jobs),
+    )
+    out.metric(
+        "job_last_run_duration_seconds",
+        "gauge",
+        "Duration of the most recent run.",
+        (
+            (job_labels(j.job_id, j.proc_name, j.relation), j.last_run_duration.total_seconds())
+            for j in jobs
+            if j.last_run_duration is not None
+        ),
+    )
+    out.metric(
+        "job_last_success_timestamp_seconds",
+        "gauge",
+        "Last successful finish, Unix seconds.",
+        (
+            (
+                job_labels(j.job_id, j.proc_name, j.relation),
+                _unix_seconds(j.last_successful_finish),
+            )
+            for j in jobs
+            if j.last_successful_finish is not None
+        ),
+    )
+
+    tables = telemetry.tables
+    for name, help_text, attribute in (
+        ("table_seq_scans_total", "Sequential scans.", "seq_scans"),
+        ("table_idx_scans_total", "Index scans.", "idx_scans"),
+        ("table_tuples_inserted_total", "Rows inserted.", "tuples_inserted"),
+        ("table_tuples_updated_total", "Rows updated.", "tuples_updated"),
+        ("table_tuples_deleted_total", "Rows deleted.", "tuples_deleted"),
+    ):
+        out.metric(
+            name,
+            "counter",
+            help_text,
+            (({"relation": t.relation}, getattr(t, attribute)) for t in tables),
+        )
+    out.metric(
+        "table_live_tuples",
+        "gauge",
+        "Estimated live rows.",
+        (({"relation": t.relation}, t.live_tuples) for t in tables),
+    )
+    out.metric(
+        "table_dead_tuples",
+        "gauge",
+        "Estimated dead rows.",
+        (({"relation": t.relation}, t.dead_tuples) for t in tables),
+    )
+
+    indexes = telemetry.indexes
+    out.metric(
+        "index_scans_total",
+        "counter",
+        "Index scans.",
+        (({"relation": i.relation, "index": i.index_name}, i.scans) for i in indexes),
+    )
+    out.metric(
+        "index_tuples_read_total",
+        "counter",
+        "Index entries returned by scans.",
+        (({"relation": i.relation, "index": i.index_name}, i.tuples_read) for i in indexes),
+    )
+    out.metric(
+        "index_bytes",
+        "gauge",
+        "Index size, summed over chunks.",
+        (({"relation": i.relation, "index": i.index_name}, i.size_bytes) for i in indexes),
+    )
+    return out.render()
+
+
+def render_instrumentation(
+    snapshot: InstrumentationSnapshot,
+    prefix: str = METRIC_PREFIX,
+) -> str:
+    """Render query instrumentation as Prometheus text.
+
+    With sampling, statement counts cover only the sampled executions; the
+    sample rate is exported so dashboards can scale them.
+    """
+    out = _Exposition(prefix)
+    statements = snapshot.statements
+
+    out.metric(
+        "instrumentation_sample_rate",
+        "gauge",
+        "Fraction of statement executions timed.",
+        [({}, snapshot.sample_rate)],
+    )
+    out.histogram(
+        "statement_duration_seconds",
+        "Statement latency per normalized statement.",
+        snapshot.latency_buckets,
+        (({"statement": s.statement}, s.bucket_counts, s.total_seconds) for s in statements),
+    )
+    out.metric(
+        "statement_rows_total",
+        "counter",
+        "Rows returned or affected per normalized statement.",
+        (({"statement": s.statement}, s.rows) for s in statements),
+    )
+    out.metric(
+        "statement_errors_total",
+        "counter",
+        "Failed executions per normalized statement.",
+        (({"statement": s.statement}, s.errors) for s in statements),
+    )
+
+    pool = snapshot.pool
+    out.metric("pool_size", "gauge", "Configured pool size.", [({}, pool.size)])
+    out.metric(
+        "pool_checked_out", "gauge", "Connections currently checked out.", [({}, pool.checked_out)]
+    )
+    out.metric(
+        "pool_overflow", "gauge", "Connections open beyond pool_size.", [({}, pool.overflow)]
+    )
+    out.metric(
+        "pool_connects_total", "counter", "New DBAPI connections opened.", [({}, pool.connects)]
+    )
+    out.metric("pool_checkouts_total", "counter", "Pool checkouts.", [({}, pool.checkouts)])
+    out.metric(
+        "pool_invalidations_total",
+        "counter",
+        "Connections invalidated after errors.",
+        [({}, pool.invalidations)],
+    )
+    out.metric(
+        "pool_checkout_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a pooled connection, including connects.",
+        [({}, pool.checkout_wait_seconds)],
+    )
+    out.metric(
+        "pool_checkout_wait_max_seconds",
+        "gauge",
+        "Longest wait for a pooled connection.",
+        [({}, pool.checkout_wait_max_seconds)],
+    )
+    out.metric(
+        "slow_queries_captured",
+        "gauge",
+        "Slow statements held in the capture log.",
+        [({}, len(snapshot.slow_queries))],
+    )
+    return out.render()
@@ -0,0 +1,301 @@
+"""Storage, continuous aggregate and background job telemetry from TimescaleDB catalogs.
+
+Chunks of hypertables and of continuous aggregate materializations are rolled up to
+their hypertable or aggregate view name, so metrics stay one series per relation
+however many chunks exist. Timestamps are naive UTC, like the rest of the schema.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from quantshark_shared.settings.engine import get_engine
+from quantshark_shared.timescale.version import require_internal_catalog
+
+# Hypertables and continuous aggregates, labelled by the name callers know them by.
+# Chunks are counted per hypertable before the join, so each target is one row and the
+# size functions run once per target rather than once per chunk.
+HYPERTABLE_STORAGE_SQL = text(
+    """
+    WITH target AS (
+        SELECT hypertable_name AS name, 'hypertable' AS kind,
+               hypertable_schema AS schema_name, hypertable_name AS table_name
+        FROM timescaledb_information.hypertables
+        WHERE hypertable_schema <> '_timescaledb_internal'
+        UNION ALL
+        SELECT view_name, 'continuous_aggregate',
+               materialization_hypertable_schema, materialization_hypertable_name
+        FROM timescaledb_information.continuous_aggregates
+    ),
+    chunk_count AS (
+        SELECT
+            hypertable_schema,
+            hypertable_name,
+            count(*) AS chunks,
+            count(*) FILTER (WHERE is_compressed) AS compressed_chunks
+        FROM timescaledb_information.chunks
+        GROUP BY hypertable_schema, hypertable_name
+    )
+    SELECT
+        t.name,
+        t.kind,
+        coalesce(cc.chunks, 0),
+        coalesce(cc.compressed_chunks, 0),
+        coalesce(d.table_bytes, 0),
+        coalesce(d.index_bytes, 0),
+        coalesce(d.toast_bytes, 0),
+        coalesce(d.total_bytes, 0),
+        coalesce(cs.max_chunk_bytes, 0)
+    FROM target t
+    LEFT JOIN chunk_count cc
+        ON cc.hypertable_schema = t.schema_name AND cc.hypertable_name = t.table_name
+    CROSS JOIN LATERAL hypertable_detailed_size(
+        CAST(format('%I.%I', t.schema_name, t.table_name) AS REGCLASS)
+    ) d
+    CROSS JOIN LATERAL (
+        SELECT max(total_bytes) AS max_chunk_bytes
+        FROM chunks_detailed_size(CAST(format('%I.%I', t.schema_name, t.table_name) AS REGCLASS))
+    ) cs
+    ORDER BY t.name;
+    """
+)
+
+# The watermark is the end of the materialized range: real-time aggregation reads
+# raw rows past it on every query. An empty aggregate has no finite watermark.
+# cagg_watermark takes the internal hypertable id, so this reads the internal catalog.
+AGGREGATE_FRESHNESS_SQL = text(
+    """
+    SELECT
+        w.view_name,
+        w.materialized_only,
+        CASE WHEN isfinite(w.watermark) THEN w.watermark END,
+        js.last_successful_finish AT TIME ZONE 'UTC',
+        js.last_run_status,
+        js.next_start AT TIME ZONE 'UTC'
+    FROM (
+        SELECT
+            ca.view_name,
+            ca.materialized_only,
+            ca.materialization_hypertable_schema,
+            ca.materialization_hypertable_name,
+            _timescaledb_functions.to_timestamp_without_timezone(
+                _timescaledb_functions.cagg_watermark(h.id)
+            ) AS watermark
+        FROM timescaledb_information.continuous_aggregates ca
+        JOIN _timescaledb_catalog.hypertable h
+            ON h.schema_name = ca.materialization_hypertable_schema
+           AND h.table_name = ca.materialization_hypertable_name
+    ) w
+    LEFT JOIN timescaledb_information.jobs j
+        ON j.proc_name = 'policy_refresh_continuous_aggregate'
+       AND j.hypertable_schema = w.materialization_hypertable_schema
+       AND j.hypertable_name = w.materialization_hypertable_name
+    LEFT JOIN timescaledb_information.job_stats js ON js.job_id = j.job_id
+    ORDER BY w.view_name;
+    """
+)
+
+BACKGROUND_JOBS_SQL = text(
+    """
+    SELECT
+        j.job_id,
+        j.proc_name,
+        coalesce(ca.view_name, j.hypertable_name),
+        j.scheduled,
+        js.last_run_status,
+        js.last_run_duration,
+        js.last_successful_finish AT TIME ZONE 'UTC',
+        js.next_start AT TIME ZONE 'UTC',
+        coalesce(js.total_runs, 0),
+        coalesce(js.total_successes, 0),
+        coalesce(js.total_failures, 0)
+    FROM timescaledb_information.jobs j
+    LEFT JOIN timescaledb_information.job_stats js ON js.job_id = j.job_id
+    LEFT JOIN timescaledb_information.continuous_aggregates ca
+        ON ca.materialization_hypertable_schema = j.hypertable_schema
+       AND ca.materialization_hypertable_name = j.hypertable_name
+    WHERE j.job_id >= 1000  -- below are TimescaleDB's own telemetry and housekeeping jobs
+    ORDER BY j.job_id;
+    """
+)
+
+# pg_stat counters for public tables, chunks summed into their hypertable or aggregate.
+# Compressed chunk tables are not listed in timescaledb_information.chunks and are left out.
+TABLE_ACTIVITY_SQL = text(
+    """
+    SELECT
+        coalesce(ca.view_name, ch.hypertable_name, s.relname) AS relation,
+        sum(s.seq_scan),
+        sum(coalesce(s.idx_scan, 0)),
+        sum(s.n_tup_ins),
+        sum(s.n_tup_upd),
+        sum(s.n_tup_del),
+        sum(s.n_live_tup),
+        sum(s.n_dead_tup),
+        max(greatest(s.last_vacuum, s.last_autovacuum)) AT TIME ZONE 'UTC',
+        max(greatest(s.last_analyze, s.last_autoanalyze)) AT TIME ZONE 'UTC'
+    FROM pg_stat_user_tables s
+    LEFT JOIN timescaledb_information.chunks ch
+        ON ch.chunk_schema = s.schemaname AND ch.chunk_name = s.relname
+    LEFT JOIN timescaledb_information.continuous_aggregates ca
+        ON ca.materialization_hypertable_schema = ch.hypertable_schema
+       AND ca.materialization_hypertable_name = ch.hypertable_name
+    WHERE s.schemaname = 'public' OR ch.chunk_name IS NOT NULL
+    GROUP BY 1
+    ORDER BY 1;
+    """
+)
+
+# Chunk index to hypertable index names are only in the internal catalog
+INDEX_ACTIVITY_SQL = text(
+    """
+    SELECT
+        coalesce(ca.view_name, h.table_name, s.relname) AS relation,
+        coalesce(ci.hypertable_index_name, s.indexrelname) AS index_name,
+        sum(s.idx_scan),
+        sum(s.idx_tup_read),
+        sum(s.idx_tup_fetch),
+        sum(pg_relation_size(s.indexrelid))
+    FROM pg_stat_user_indexes s
+    LEFT JOIN _timescaledb_catalog.chunk ch
+        ON ch.schema_name = s.schemaname AND ch.table_name = s.relname
+    LEFT JOIN _timescaledb_catalog.chunk_index ci
+        ON ci.chunk_id = ch.id AND ci.index_name = s.indexrelname
+    LEFT JOIN _timescaledb_catalog.hypertable h ON h.id = ch.hypertable_id
+    LEFT JOIN timescaledb_information.continuous_aggregates ca
+        ON ca.materialization_hypertable_schema = h.schema_name
+       AND ca.materialization_hypertable_name = h.table_name
+    WHERE s.schemaname = 'public' OR ch.id IS NOT NULL
+    GROUP BY 1, 2
+    ORDER BY 1, 2;
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class HypertableStorage:
+    name: str  # hypertable, or continuous aggregate view for its materialization
+    kind: str  # "hypertable" | "continuous_aggregate"
+    chunks: int
+    compressed_chunks: int
+    table_bytes: int
+    index_bytes: int
+    toast_bytes: int
+    total_bytes: int
+    max_chunk_bytes: int
+
+
+@dataclass(frozen=True, slots=True)
+class AggregateFreshness:
+    view_name: str
+    materialized_only: bool
+    watermark: datetime.datetime | None  # None while nothing is materialized
+    last_successful_refresh: datetime.datetime | None
+    last_run_status: str | None  # "Success" | "Failed", None if never run
+    next_refresh: datetime.datetime | None
+
+    def lag(self, now: datetime.datetime) -> datetime.timedelta | None:
+        """How far the materialized range trails now (naive UTC)."""
+        if self.watermark is None:
+            return None
+        return now - self.watermark
+
+
+@dataclass(frozen=True, slots=True)
+class JobStatus:
+    job_id: int
+    proc_name: str
+    relation: str | None
+    scheduled: bool
+    last_run_status: str | None
+    last_run_duration: datetime.timedelta | None
+    last_successful_finish: datetime.datetime | None
+    next_start: datetime.datetime | None
+    total_runs: int
+    total_successes: int
+    total_failures: int
+
+    @property
+    def failing(self) -> bool:
+        return self.last_run_status == "Failed"
+
+
+@dataclass(frozen=True, slots=True)
+class TableActivity:
+    relation: str
+    seq_scans: int
+    idx_scans: int
+    tuples_inserted: int
+    tuples_updated: int
+    tuples_deleted: int
+    live_tuples: int
+    dead_tuples: int
+    last_vacuum: datetime.datetime | None
+    last_analyze: datetime.datetime | None
+
+
+@dataclass(frozen=True, slots=True)
+class IndexActivity:
+    relation: str
+    index_name: str  # hypertable index name for chunk indexes
+    scans: int
+    tuples_read: int
+    tuples_fetched: int
+    size_bytes: int
+
+
+@dataclass(frozen=True)
+class DatabaseTelemetry:
+    collected_at: datetime.datetime  # naive UTC, database clock
+    storage: list[HypertableStorage]
+    aggregates: list[AggregateFreshness]
+    jobs: list[JobStatus]
+    tables: list[TableActivity]
+    indexes: list[IndexActivity]
+
+    @property
+    def failed_jobs(self) -> list[JobStatus]:
+        return [job for job in self.jobs if job.failing]
+
+    def aggregate_lag(self, view_name: str) -> datetime.timedelta | None:
+        for aggregate in self.aggregates:
+            if aggregate.view_name == view_name:
+                return aggregate.lag(self.collected_at)
+        raise KeyError(view_name)
+
+
+async def collect_telemetry(engine: AsyncEngine | None = None) -> DatabaseTelemetry:
+    """Read storage, aggregate, job and activity telemetry over one connection.
+
+    Raises RuntimeError on TimescaleDB versions the internal catalog queries (aggregate
+    watermarks, chunk index names) are not written against.
+    """
+    engine = engine or get_engine()
+    async with engine.connect() as connection:
+        await require_internal_catalog(connection)
+        collected_at = (
+            await connection.execute(text("SELECT NOW() AT TIME ZONE 'UTC';"))
+        ).scalar_one()
+        storage = [
+            HypertableStorage(*row)
+            for row in (await connection.execute(HYPERTABLE_STORAGE_SQL)).tuples()
+        ]
+        aggregates = [
+            AggregateFreshness(*row)
+            for row in (await connection.execute(AGGREGATE_FRESHNESS_SQL)).tuples()
+        ]
+        jobs = [
+            JobStatus(*row) for row in (await connection.execute(BACKGROUND_JOBS_SQL)).tuples()
+        ]
+        tables = [
+            TableActivity(*row) for row in (await connection.execute(TABLE_ACTIVITY_SQL)).tuples()
+        ]
+        indexes = [
+            IndexActivity(*row) for row in (await connection.execute(INDEX_ACTIVITY_SQL)).tuples()
+        ]
+
+    return DatabaseTelemetry(collected_at, storage, aggregates, jobs, tables, indexes)
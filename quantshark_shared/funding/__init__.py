@@ -0,0 +1,31 @@
+"""Funding rate normalization and columnar reads (requires the ``analytics`` extra)."""
+
+from quantshark_shared.funding.columnar import (
+    FUNDING_SOURCES,
+    FundingColumns,
+    FundingSource,
+    decode_copy_binary,
+    read_funding_columns,
+)
+from quantshark_shared.funding.normalization import (
+    TARGET_HOURS,
+    NormalizedFunding,
+    funding_multipliers,
+    get_funding_multiplier,
+    normalize_funding,
+    normalize_rates,
+)
+
+__all__ = [
+    "FUNDING_SOURCES",
+    "TARGET_HOURS",
+    "FundingColumns",
+    "FundingSource",
+    "NormalizedFunding",
+    "decode_copy_binary",
+    "funding_multipliers",
+    "get_funding_multiplier",
+    "normalize_funding",
+    "normalize_rates",
+    "read_funding_columns",
+]
@@ -0,0 +1,172 @@
+"""Columnar funding range reads decoded straight from binary COPY.
+
+Rows never become Python objects: the COPY stream of (uuid, timestamp, float8) tuples
+has a fixed width, so it is viewed as a NumPy structured array and split into columns.
+"""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+from numpy.typing import NDArray
+from psycopg import sql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from quantshark_shared.ingestion.bulk import (
+    COPY_SIGNATURE,
+    COPY_TRAILER,
+    PG_EPOCH_US,
+    get_driver_connection,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+FundingSource = Literal[
+    "live",
+    "historical",
+    "lfp_5min",
+    "lfp_15min",
+    "lfp_1hour",
+    "lfp_1day",
+    "lfp_smart",
+]
+
+# source -> (relation, time column, rate column)
+FUNDING_SOURCES: dict[FundingSource, tuple[str, str, str]] = {
+    "live": ("live_funding_point", "timestamp", "funding_rate"),
+    "historical": ("historical_funding_point", "timestamp", "funding_rate"),
+    "lfp_5min": ("lfp_5min", "bucket", "avg_funding_rate"),
+    "lfp_15min": ("lfp_15min", "bucket", "avg_funding_rate"),
+    "lfp_1hour": ("lfp_1hour", "bucket", "avg_funding_rate"),
+    "lfp_1day": ("lfp_1day", "bucket", "avg_funding_rate"),
+    "lfp_smart": ("lfp_smart", "bucket", "avg_funding_rate"),
+}
+
+# One binary COPY tuple: field count, then (length, value) per column, big-endian
+COPY_ROW_DTYPE = np.dtype(
+    [
+        ("field_count", ">i2"),
+        ("contract_id_len", ">i4"),
+        ("contract_id", "V16"),
+        ("timestamp_len", ">i4"),
+        ("timestamp", ">i8"),
+        ("rate_len", ">i4"),
+        ("rate", ">f8"),
+    ]
+)
+
+
+@dataclass(frozen=True)
+class FundingColumns:
+    contract_id: NDArray[np.void]  # 16-byte UUIDs, network order
+    timestamp: NDArray[np.datetime64]  # datetime64[us], naive UTC
+    rate: NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return len(self.rate)
+
+    def contract_uuids(self) -> list[uuid.UUID]:
+        raw = self.contract_id.tobytes()
+        return [uuid.UUID(bytes=raw[offset : offset + 16]) for offset in range(0, len(raw), 16)]
+
+    def to_arrow(self) -> pa.Table:
+        """Return a pyarrow Table of contract_id (uuid), timestamp and rate."""
+        import pyarrow as pa
+
+        storage = pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(16), len(self), [None, pa.py_buffer(self.contract_id.tobytes())]
+        )
+        return pa.table(
+            {
+                "contract_id": pa.ExtensionArray.from_storage(pa.uuid(), storage),
+                "timestamp": pa.array(self.timestamp),
+                "rate": pa.array(self.rate),
+            }
+        )
+
+
+def decode_copy_binary(data: bytes | bytearray | memoryview) -> FundingColumns:
+    """Decode a binary COPY stream of non-null (uuid, timestamp, float8) rows."""
+    buffer = memoryview(data)
+    if bytes(buffer[:11]) != COPY_SIGNATURE or bytes(buffer[-2:]) != COPY_TRAILER:
+        raise ValueError("Not a binary COPY stream")
+
+    extension_len = int.from_bytes(buffer[15:19], "big")
+    body = buffer[19 + extension_len : -2]
+    if len(body) % COPY_ROW_DTYPE.itemsize:
+        raise ValueError("Binary COPY rows are not (uuid, timestamp, float8) without NULLs")
+
+    rows = np.frombuffer(body, dtype=COPY_ROW_DTYPE)
+    if not (
+        (rows["field_count"] == 3).all()
+        and (rows["contract_id_len"] == 16).all()
+        and (rows["timestamp_len"] == 8).all()
+        and (rows["rate_len"] == 8).all()
+    ):
+        raise ValueError("Binary COPY rows are not (uuid, timestamp, float8) without NULLs")
+
+    return FundingColumns(
+        contract_id=rows["contract_id"].copy(),
+        timestamp=(rows["timestamp"].astype(np.int64) + PG_EPOCH_US).view("datetime64[us]"),
+        rate=rows["rate"].astype(np.float64),
+    )
+
+
+def _range_copy_statement(
+    source: FundingSource,
+    contract_ids: Sequence[uuid.UUID],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> sql.Composed:
+    relation, time_column, rate_column = FUNDING_SOURCES[source]
+    # COPY takes no bind parameters: values are rendered as typed literals
+    return sql.SQL(
+        """
+        COPY (
+            SELECT contract_id, {time}::TIMESTAMP, {rate}::FLOAT8
+            FROM {relation}
+            WHERE contract_id = ANY({contract_ids})
+              AND {time} >= {start} AND {time} < {end}
+            ORDER BY contract_id, {time}
+        ) TO STDOUT (FORMAT BINARY)
+        """
+    ).format(
+        time=sql.Identifier(time_column),
+        rate=sql.Identifier(rate_column),
+        relation=sql.Identifier(relation),
+        contract_ids=sql.Literal(list(contract_ids)),
+        start=sql.Literal(start),
+        end=sql.Literal(end),
+    )
+
+
+async def read_funding_columns(
+    session: AsyncSession,
+    source: FundingSource,
+    contract_ids: Sequence[uuid.UUID],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> FundingColumns:
+    """Read [start, end) of a funding hypertable, lfp_* aggregate or lfp_smart as columns,
+    ordered by contract_id and time. Aggregate times are bucket starts (lfp_smart: ends).
+    """
+    if not contract_ids:
+        return FundingColumns(
+            contract_id=np.empty(0, dtype="V16"),
+            timestamp=np.empty(0, dtype="datetime64[us]"),
+            rate=np.empty(0, dtype=np.float64),
+        )
+
+    driver_connection = await get_driver_connection(session)
+    data = bytearray()
+    statement = _range_copy_statement(source, contract_ids, start, end)
+    async with driver_connection.cursor() as cursor, cursor.copy(statement) as copy:
+        async for chunk in copy:
+            data += chunk
+    return decode_copy_binary(data)
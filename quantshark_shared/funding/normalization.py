@@ -0,0 +1,135 @@
+"""Vectorized funding rate normalization mirroring SQL get_funding_multiplier.
+
+Multipliers are computed with PostgreSQL NUMERIC division semantics (result scale
+from select_div_scale, rounding half away from zero) and converted to float64 with
+correct rounding, exactly like ``numeric::float8``. Normalized rates therefore match
+``funding_rate * multiplier_*`` evaluated in the database bit for bit.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal, localcontext
+from functools import cache
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+NUMERIC_MIN_SIG_DIGITS = 16
+NUMERIC_MAX_DISPLAY_SCALE = 1000
+NBASE_DIGITS = 4  # PostgreSQL NUMERIC stores base-10000 digits
+
+TARGET_HOURS: dict[str, int] = {
+    "1h": 1,
+    "8h": 8,
+    "1d": 24,
+    "365d": 8760,
+}
+
+# Literal divisors of the CASE branches in get_funding_multiplier
+_CASE_DIVISORS = {
+    2: Decimal("2.0"),
+    4: Decimal("4.0"),
+    8: Decimal("8.0"),
+}
+
+
+@dataclass(frozen=True)
+class NormalizedFunding:
+    rate_1h: NDArray[np.float64]
+    rate_8h: NDArray[np.float64]
+    rate_1d: NDArray[np.float64]
+    rate_365d: NDArray[np.float64]  # APR
+
+
+def _dscale(value: Decimal) -> int:
+    exponent = value.as_tuple().exponent
+    assert isinstance(exponent, int)
+    return max(0, -exponent)
+
+
+def _weight_and_first_digit(value: Decimal) -> tuple[int, int]:
+    if value.is_zero():
+        return 0, 0
+    weight = value.adjusted() // NBASE_DIGITS
+    first_digit = int(abs(value).scaleb(-weight * NBASE_DIGITS))
+    return weight, first_digit
+
+
+def _select_div_scale(dividend: Decimal, divisor: Decimal) -> int:
+    weight1, first_digit1 = _weight_and_first_digit(dividend)
+    weight2, first_digit2 = _weight_and_first_digit(divisor)
+    quotient_weight = weight1 - weight2
+    if first_digit1 <= first_digit2:
+        quotient_weight -= 1
+
+    rscale = NUMERIC_MIN_SIG_DIGITS - quotient_weight * NBASE_DIGITS
+    rscale = max(rscale, _dscale(dividend), _dscale(divisor), 0)
+    return min(rscale, NUMERIC_MAX_DISPLAY_SCALE)
+
+
+def _numeric_div(dividend: Decimal, divisor: Decimal) -> Decimal:
+    if divisor.is_zero():
+        raise ZeroDivisionError("division by zero")
+
+    rscale = _select_div_scale(dividend, divisor)
+    with localcontext() as context:
+        # Truncate far past rscale, then round once, as div_var does
+        context.prec = max(dividend.adjusted() - divisor.adjusted(), 0) + rscale + 10
+        context.rounding = ROUND_DOWN
+        quotient = dividend / divisor
+        return quotient.quantize(Decimal(1).scaleb(-rscale), rounding=ROUND_HALF_UP)
+
+
+@cache
+def get_funding_multiplier(funding_interval: int, target_hours: Decimal | int) -> Decimal:
+    """Python twin of SQL get_funding_multiplier(INTEGER, NUMERIC)."""
+    target = Decimal(target_hours)
+    if funding_interval == 1:
+        return target
+    divisor = _CASE_DIVISORS.get(funding_interval, Decimal(funding_interval))
+    return _numeric_div(target, divisor)
+
+
+def funding_multipliers(
+    funding_intervals: ArrayLike,
+    target_hours: Decimal | int,
+) -> NDArray[np.float64]:
+    """Return float64 multipliers for an array of funding intervals (hours)."""
+    intervals = np.asarray(funding_intervals, dtype=np.int64)
+    unique, inverse = np.unique(intervals, return_inverse=True)
+    values = np.array(
+        [float(get_funding_multiplier(int(interval), target_hours)) for interval in unique],
+        dtype=np.float64,
+    )
+    return values[inverse].reshape(intervals.shape)
+
+
+def normalize_rates(
+    funding_rates: ArrayLike,
+    funding_intervals: ArrayLike,
+    target_hours: Decimal | int,
+) -> NDArray[np.float64]:
+    """Normalize funding rates paid every funding_intervals hours to target_hours."""
+    rates = np.asarray(funding_rates, dtype=np.float64)
+    return rates * funding_multipliers(funding_intervals, target_hours)
+
+
+def normalize_funding(
+    funding_rates: ArrayLike,
+    funding_intervals: ArrayLike,
+) -> NormalizedFunding:
+    """Normalize funding rates to 1h, 8h, 1d and 365d (APR) in one call."""
+    rates = np.asarray(funding_rates, dtype=np.float64)
+    intervals = np.broadcast_to(np.asarray(funding_intervals, dtype=np.int64), rates.shape)
+    unique, inverse = np.unique(intervals, return_inverse=True)
+    inverse = inverse.reshape(rates.shape)
+
+    normalized: dict[str, NDArray[np.float64]] = {}
+    for name, hours in TARGET_HOURS.items():
+        multipliers = np.array(
+            [float(get_funding_multiplier(int(interval), hours)) for interval in unique],
+            dtype=np.float64,
+        )
+        normalized[f"rate_{name}"] = rates * multipliers[inverse]
+    return NormalizedFunding(**normalized)
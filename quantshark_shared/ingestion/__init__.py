@@ -0,0 +1,19 @@
+"""Bulk write paths for funding data."""
+
+from quantshark_shared.ingestion.bulk import (
+    ConflictAction,
+    FundingPointRow,
+    IngestionResult,
+    copy_funding_points,
+)
+from quantshark_shared.ingestion.writer import LiveFundingWriter, OverflowPolicy, WriterMetrics
+
+__all__ = [
+    "ConflictAction",
+    "FundingPointRow",
+    "IngestionResult",
+    "LiveFundingWriter",
+    "OverflowPolicy",
+    "WriterMetrics",
+    "copy_funding_points",
+]
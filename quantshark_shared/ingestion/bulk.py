@@ -0,0 +1,201 @@
+"""COPY-based bulk ingestion for funding point hypertables."""
+
+from __future__ import annotations
+
+import datetime
+import struct
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Literal, cast
+
+from psycopg import AsyncConnection
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from quantshark_shared.models.base import BaseFundingPoint
+from quantshark_shared.models.records import FundingPointBatch
+
+FundingPointRow = tuple[uuid.UUID, datetime.datetime, float]
+ConflictAction = Literal["update", "ignore"]
+
+STAGING_TABLE = "_funding_point_staging"
+COPY_TYPES = ["uuid", "timestamp", "float8"]
+
+# Binary COPY framing for (uuid, timestamp, float8) tuples
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+COPY_HEADER = COPY_SIGNATURE + bytes(8)  # flags and header extension length
+COPY_TRAILER = b"\xff\xff"
+COPY_ROW = struct.Struct(">hi16siqid")
+PG_EPOCH_US = 946_684_800_000_000  # 2000-01-01 in Unix microseconds
+COPY_CHUNK_ROWS = 65_536
+
+# Hypertables mirrored into funding_latest (migration 016) -> column prefix
+LATEST_COLUMN_PREFIXES = {
+    "live_funding_point": "live",
+    "historical_funding_point": "historical",
+}
+
+
+@dataclass(frozen=True)
+class IngestionResult:
+    inserted: int
+    updated: int
+    skipped: int
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.skipped
+
+
+async def get_driver_connection(session: AsyncSession) -> AsyncConnection:
+    """Return the psycopg connection bound to the session's current transaction."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return cast(AsyncConnection, raw_connection.driver_connection)
+
+
+def encode_copy_binary(batch: FundingPointBatch) -> Iterator[bytes]:
+    """Yield a binary COPY stream of the batch in chunks, straight from its buffers."""
+    yield COPY_HEADER
+    contract_ids = bytes(batch.contract_id_bytes)
+    pack = COPY_ROW.pack_into
+    rows = zip(batch.timestamps_us, batch.funding_rates, strict=True)
+    chunk = bytearray(COPY_ROW.size * COPY_CHUNK_ROWS)
+    filled = 0
+    for index, (micros, funding_rate) in enumerate(rows):
+        offset = index * 16
+        pack(
+            chunk,
+            filled * COPY_ROW.size,
+            3,
+            16,
+            contract_ids[offset : offset + 16],
+            8,
+            micros - PG_EPOCH_US,
+            8,
+            funding_rate,
+        )
+        filled += 1
+        if filled == COPY_CHUNK_ROWS:
+            yield bytes(chunk)
+            filled = 0
+    yield bytes(chunk[: filled * COPY_ROW.size])
+    yield COPY_TRAILER
+
+
+def _latest_statement(table_name: str) -> str:
+    prefix = LATEST_COLUMN_PREFIXES.get(table_name)
+    if prefix is None:
+        return ""
+
+    # Newest written point per contract; an older point never replaces a newer one
+    return f""",
+        latest AS (
+            INSERT INTO funding_latest (contract_id, {prefix}_timestamp, {prefix}_funding_rate)
+            SELECT DISTINCT ON (contract_id) contract_id, timestamp, funding_rate
+            FROM written
+            ORDER BY contract_id, timestamp DESC
+            ON CONFLICT (contract_id) DO UPDATE
+            SET {prefix}_timestamp = EXCLUDED.{prefix}_timestamp,
+                {prefix}_funding_rate = EXCLUDED.{prefix}_funding_rate,
+                updated_at = NOW() AT TIME ZONE 'UTC'
+            WHERE funding_latest.{prefix}_timestamp IS NULL
+               OR funding_latest.{prefix}_timestamp <= EXCLUDED.{prefix}_timestamp
+        )"""
+
+
+def _upsert_statement(table_name: str, on_conflict: ConflictAction) -> str:
+    if on_conflict == "update":
+        conflict_clause = (
+            "ON CONFLICT (contract_id, timestamp) DO UPDATE "
+            "SET funding_rate = EXCLUDED.funding_rate "
+            f"WHERE {table_name}.funding_rate IS DISTINCT FROM EXCLUDED.funding_rate"
+        )
+    else:
+        conflict_clause = "ON CONFLICT (contract_id, timestamp) DO NOTHING"
+
+    # Last row wins for duplicates inside one batch; xmax = 0 marks a fresh insert.
+    return f"""
+        WITH written AS (
+            INSERT INTO {table_name} (contract_id, timestamp, funding_rate)
+            SELECT DISTINCT ON (contract_id, timestamp) contract_id, timestamp, funding_rate
+            FROM {STAGING_TABLE}
+            ORDER BY contract_id, timestamp, seq DESC
+            {conflict_clause}
+            RETURNING contract_id, timestamp, funding_rate, (xmax = 0) AS inserted
+        ){_latest_statement(table_name)}
+        SELECT
+            count(*) FILTER (WHERE inserted) AS inserted,
+            count(*) FILTER (WHERE NOT inserted) AS updated
+        FROM written;
+    """
+
+
+async def copy_funding_points(
+    session: AsyncSession,
+    model: type[BaseFundingPoint],
+    rows: Iterable[FundingPointRow] | FundingPointBatch,
+    on_conflict: ConflictAction = "update",
+) -> IngestionResult:
+    """Stream (contract_id, timestamp, funding_rate) rows into a funding point hypertable.
+
+    rows may be plain tuples, FundingPointRecord or a FundingPointBatch; a batch is
+    encoded from its packed buffers without building per-row objects.
+
+    Rows are written with binary COPY into a transaction-scoped staging table and
+    merged into the target with ON CONFLICT (contract_id, timestamp). With
+    ``on_conflict="update"`` existing points take the new rate, with ``"ignore"`` they
+    are kept as is. Rows that did not change the target are reported as skipped.
+    For live and historical points, the newest written point per contract is also
+    upserted into funding_latest in the same statement.
+
+    The caller owns the transaction: nothing is committed here.
+    """
+    table_name = cast(str, model.__tablename__)
+    driver_connection = await get_driver_connection(session)
+
+    await session.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE};"))
+    await session.execute(
+        text(
+            f"""
+            CREATE TEMP TABLE {STAGING_TABLE} (
+                seq BIGINT GENERATED ALWAYS AS IDENTITY,
+                contract_id UUID NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                funding_rate DOUBLE PRECISION NOT NULL
+            ) ON COMMIT DROP;
+            """
+        )
+    )
+
+    copied = 0
+    async with driver_connection.cursor() as cursor:
+        copy_sql = (
+            f"COPY {STAGING_TABLE} (contract_id, timestamp, funding_rate) "
+            "FROM STDIN (FORMAT BINARY)"
+        )
+        async with cursor.copy(copy_sql) as copy:
+            if isinstance(rows, FundingPointBatch):
+                for data in encode_copy_binary(rows):
+                    await copy.write(data)
+                copied = len(rows)
+            else:
+                copy.set_types(COPY_TYPES)
+                for row in rows:
+                    await copy.write_row(row)
+                    copied += 1
+
+    if not copied:
+        await session.execute(text(f"DROP TABLE {STAGING_TABLE};"))
+        return IngestionResult(inserted=0, updated=0, skipped=0)
+
+    result = await session.execute(text(_upsert_statement(table_name, on_conflict)))
+    inserted, updated = result.one()
+    await session.execute(text(f"DROP TABLE {STAGING_TABLE};"))
+
+    return IngestionResult(
+        inserted=inserted,
+        updated=updated,
+        skipped=copied - inserted - updated,
+    )
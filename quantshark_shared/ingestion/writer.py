@@ -0,0 +1,218 @@
+"""Write-behind buffer coalescing live funding points before bulk COPY."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from quantshark_shared.ingestion.bulk import ConflictAction, copy_funding_points
+from quantshark_shared.models.base import BaseFundingPoint
+from quantshark_shared.models.live_funding_point import LiveFundingPoint
+from quantshark_shared.models.records import FundingPointBatch
+from quantshark_shared.settings.engine import get_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["block", "drop"]
+PointKey = tuple[uuid.UUID, datetime.datetime]
+
+
+@dataclass(frozen=True)
+class WriterMetrics:
+    received: int
+    coalesced: int  # replaced a buffered point with the same key
+    dropped: int  # rejected on overflow, or lost after a failed flush
+    flushed: int
+    batches: int
+    flush_errors: int
+    buffered: int
+    last_batch_size: int
+    last_flush_seconds: float
+    max_flush_seconds: float
+    total_flush_seconds: float
+
+
+class LiveFundingWriter:
+    """Buffer points keyed by (contract_id, timestamp) and flush them with COPY.
+
+    The latest rate per key wins. A flush runs when max_batch_size keys are buffered
+    or flush_interval seconds after the previous one. Besides the batch being written,
+    at most max_buffered keys are held: beyond that ``put`` waits for a flush
+    ("block") or rejects the point ("drop"). ``close()`` stops intake and drains
+    everything still buffered.
+
+    Use as ``async with LiveFundingWriter() as writer: await writer.put(...)``.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession] | None = None,
+        model: type[BaseFundingPoint] = LiveFundingPoint,
+        max_batch_size: int = 5_000,
+        flush_interval: float = 1.0,
+        max_buffered: int = 50_000,
+        overflow: OverflowPolicy = "block",
+        on_conflict: ConflictAction = "update",
+    ) -> None:
+        if max_buffered < max_batch_size:
+            raise ValueError("max_buffered must be at least max_batch_size")
+
+        self._sessionmaker = sessionmaker or get_sessionmaker()
+        self._model = model
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._max_buffered = max_buffered
+        self._overflow: OverflowPolicy = overflow
+        self._on_conflict: ConflictAction = on_conflict
+
+        self._buffer: dict[PointKey, float] = {}
+        self._space = asyncio.Condition()
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._closed = False
+
+        self._received = 0
+        self._coalesced = 0
+        self._dropped = 0
+        self._flushed = 0
+        self._batches = 0
+        self._flush_errors = 0
+        self._last_batch_size = 0
+        self._last_flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+        self._total_flush_seconds = 0.0
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._closed = False
+            self._flusher = asyncio.create_task(self._run(), name="live-funding-writer")
+
+    async def close(self) -> None:
+        """Stop accepting points and flush everything still buffered."""
+        self._closed = True
+        async with self._space:
+            self._space.notify_all()  # blocked producers fail fast
+        if self._flusher is not None:
+            self._flush_requested.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+
+    async def __aenter__(self) -> LiveFundingWriter:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def put(
+        self,
+        contract_id: uuid.UUID,
+        timestamp: datetime.datetime,
+        funding_rate: float,
+    ) -> bool:
+        """Buffer a point; returns False when it was dropped on overflow."""
+        if self._closed:
+            raise RuntimeError("LiveFundingWriter is closed")
+
+        self._received += 1
+        key = (contract_id, timestamp)
+        while key not in self._buffer and len(self._buffer) >= self._max_buffered:
+            if self._overflow == "drop":
+                self._dropped += 1
+                return False
+            async with self._space:
+                self._flush_requested.set()
+                await self._space.wait_for(
+                    lambda: self._closed or len(self._buffer) < self._max_buffered
+                )
+            if self._closed:
+                raise RuntimeError("LiveFundingWriter is closed")
+
+        if key in self._buffer:
+            self._coalesced += 1
+        self._buffer[key] = funding_rate
+        if len(self._buffer) >= self._max_batch_size:
+            self._flush_requested.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write the buffered points now; returns the number of points written."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            pending, self._buffer = self._buffer, {}
+            async with self._space:
+                self._space.notify_all()
+
+            batch = FundingPointBatch(
+                (contract_id, timestamp, funding_rate)
+                for (contract_id, timestamp), funding_rate in pending.items()
+            )
+            started = time.perf_counter()
+            try:
+                async with self._sessionmaker() as session, session.begin():
+                    await copy_funding_points(session, self._model, batch, self._on_conflict)
+            except Exception:
+                self._flush_errors += 1
+                self._requeue(pending)
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                self._last_flush_seconds = elapsed
+                self._max_flush_seconds = max(self._max_flush_seconds, elapsed)
+                self._total_flush_seconds += elapsed
+
+            self._batches += 1
+            self._flushed += len(batch)
+            self._last_batch_size = len(batch)
+            return len(batch)
+
+    def _requeue(self, pending: dict[PointKey, float]) -> None:
+        # Newer points for the same key win; the rest go back while there is room
+        for key, funding_rate in pending.items():
+            if key in self._buffer:
+                continue
+            if len(self._buffer) >= self._max_buffered:
+                self._dropped += 1
+                continue
+            self._buffer[key] = funding_rate
+
+    async def _run(self) -> None:
+        while not self._closed:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._flush_requested.wait(), self._flush_interval)
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Live funding flush failed, %d points buffered", self.buffered)
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def metrics(self) -> WriterMetrics:
+        return WriterMetrics(
+            received=self._received,
+            coalesced=self._coalesced,
+            dropped=self._dropped,
+            flushed=self._flushed,
+            batches=self._batches,
+            flush_errors=self._flush_errors,
+            buffered=len(self._buffer),
+            last_batch_size=self._last_batch_size,
+            last_flush_seconds=self._last_flush_seconds,
+            max_flush_seconds=self._max_flush_seconds,
+            total_flush_seconds=self._total_flush_seconds,
+        )
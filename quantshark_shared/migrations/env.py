@@ -69,13 +69,31 @@ def process_revision_directives(context, revision, directives):
     migration_script.rev_id = f"{new_rev_id:03d}"
 
 
+# Tables created by hand-written SQL migrations, without a SQLModel model
+UNMANAGED_TABLES = {
+    "cagg_backfill_progress",
+    "contract_enriched",
+    "contract_search_field",
+    "contract_search_suffix",
+    "funding_latest",
+    "lfp_1day_history",
+    "lfp_1hour_history",
+}
+
+
 def include_object(object_, name, type_, reflected, compare_to):
     """
-    Filter out auto-generated TimescaleDB indexes from autogenerate comparisons.
+    Filter out objects autogenerate must not manage.
 
     TimescaleDB automatically creates indexes for hypertables that should not
-    be managed by Alembic migrations.
+    be managed by Alembic migrations. Tables in UNMANAGED_TABLES (and their
+    indexes) are maintained by SQL migrations and have no model.
     """
+    if type_ == "table" and name in UNMANAGED_TABLES:
+        return False
+    if type_ == "index" and getattr(object_, "table", None) is not None:
+        if object_.table.name in UNMANAGED_TABLES:
+            return False
     return not (
         type_ == "index"
         and name
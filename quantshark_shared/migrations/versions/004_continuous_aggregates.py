@@ -15,9 +15,11 @@ Data Structure Architecture:
 
 Changes:
 1. Creates 3 continuous aggregates (lfp_5min, lfp_15min, lfp_1hour)
-2. Backfills historical data for required ranges (3d/7d/30d)
-3. Sets up refresh policies for automatic updates
-4. Sets up retention policies for continuous aggregates
+2. Sets up refresh policies for automatic updates
+3. Sets up retention policies for continuous aggregates
+
+Backfill is not part of the migration: run
+python -m quantshark_shared.timescale.backfill after upgrading.
 
 NOTE: Uses autocommit_block() because TimescaleDB functions cannot run
 inside transactions. Each operation commits immediately.
@@ -101,35 +103,7 @@ def upgrade() -> None:
         """))
 
     # ============================================================
-    # Step 2: Backfill (ONLY REQUIRED RANGES!)
-    # ============================================================
-
-    with op.get_context().autocommit_block():
-        op.execute(sa.text("""
-            CALL refresh_continuous_aggregate('lfp_5min',
-                (NOW() - INTERVAL '3 days')::TIMESTAMP,
-                NOW()::TIMESTAMP
-            );
-        """))
-
-    with op.get_context().autocommit_block():
-        op.execute(sa.text("""
-            CALL refresh_continuous_aggregate('lfp_15min',
-                (NOW() - INTERVAL '7 days')::TIMESTAMP,
-                NOW()::TIMESTAMP
-            );
-        """))
-
-    with op.get_context().autocommit_block():
-        op.execute(sa.text("""
-            CALL refresh_continuous_aggregate('lfp_1hour',
-                (NOW() - INTERVAL '30 days')::TIMESTAMP,
-                NOW()::TIMESTAMP
-            );
-        """))
-
-    # ============================================================
-    # Step 3: Refresh Policies (Auto-Update)
+    # Step 2: Refresh Policies (Auto-Update)
     # ============================================================
 
     with op.get_context().autocommit_block():
@@ -175,7 +149,7 @@ def upgrade() -> None:
         """))
 
     # ============================================================
-    # Step 4: Retention Policies for Continuous Aggregates
+    # Step 3: Retention Policies for Continuous Aggregates
     # ============================================================
 
     with op.get_context().autocommit_block():
@@ -0,0 +1,112 @@
+"""Columnar compression for funding hypertables
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 10:12:41.208113
+
+Enables TimescaleDB native compression on live_funding_point and
+historical_funding_point and adds compression policies.
+
+Compression Layout:
+- segmentby = contract_id      (one compressed batch per contract per chunk)
+- orderby   = timestamp DESC   (latest points first inside each batch)
+
+Compression Thresholds:
+- live_funding_point:       chunks older than 3 days (past every lfp_* refresh
+                            window and the 3h raw tier of lfp_smart)
+- historical_funding_point: chunks older than 7 days (room for late settlements)
+
+Late points keep working: INSERT ... ON CONFLICT and COPY into compressed
+chunks are supported by TimescaleDB >= 2.11 (the project image is 2.23).
+
+NOTE: Uses autocommit_block() because TimescaleDB functions cannot run
+inside transactions. Each operation commits immediately.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Step 1: Enable Compression
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            ALTER TABLE live_funding_point SET (
+                timescaledb.compress,
+                timescaledb.compress_segmentby = 'contract_id',
+                timescaledb.compress_orderby = 'timestamp DESC'
+            );
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            ALTER TABLE historical_funding_point SET (
+                timescaledb.compress,
+                timescaledb.compress_segmentby = 'contract_id',
+                timescaledb.compress_orderby = 'timestamp DESC'
+            );
+        """))
+
+    # ============================================================
+    # Step 2: Compression Policies
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT remove_compression_policy('live_funding_point', if_exists => true);
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT add_compression_policy('live_funding_point', INTERVAL '3 days');
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT remove_compression_policy('historical_funding_point', if_exists => true);
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT add_compression_policy('historical_funding_point', INTERVAL '7 days');
+        """))
+
+
+def downgrade() -> None:
+    # Remove compression policies
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("SELECT remove_compression_policy('live_funding_point', if_exists => true);"))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("SELECT remove_compression_policy('historical_funding_point', if_exists => true);"))
+
+    # Decompress chunks (compression cannot be disabled while compressed chunks exist)
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT decompress_chunk(c, if_compressed => true)
+            FROM show_chunks('live_funding_point') c;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT decompress_chunk(c, if_compressed => true)
+            FROM show_chunks('historical_funding_point') c;
+        """))
+
+    # Disable compression
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("ALTER TABLE live_funding_point SET (timescaledb.compress = false);"))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("ALTER TABLE historical_funding_point SET (timescaledb.compress = false);"))
@@ -0,0 +1,126 @@
+"""Raw live funding retention and daily rollup
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 11:03:17.554920
+
+Adds a retention policy to the raw live_funding_point hypertable and a daily
+continuous aggregate with unlimited retention for long-horizon history.
+
+Data Structure Architecture:
+- 0-7d:   Raw data (live_funding_point) - dropped after 7 days
+- 5m-3d:  lfp_5min continuous aggregate
+- 15m-7d: lfp_15min continuous aggregate
+- 1h-30d: lfp_1hour continuous aggregate
+- 1d-*:   lfp_1day continuous aggregate (new, never dropped)
+
+Retention Alignment:
+Every aggregate reading live_funding_point refreshes at most 3 days back
+(lfp_1day start_offset; lfp_5min 3h, lfp_15min 12h, lfp_1hour 2d). Raw chunks
+are kept for 7 days, so each refresh window is materialized several times
+over before its source data is dropped. Refreshing an aggregate over a range
+whose raw data was already dropped deletes the aggregate rows for that range,
+so manual backfills must stay inside the raw retention window.
+
+Changes:
+1. Creates lfp_1day continuous aggregate
+2. Backfills lfp_1day over the full raw history (before retention drops it)
+3. Sets up refresh policy for lfp_1day
+4. Sets up retention policy for live_funding_point
+
+NOTE: Uses autocommit_block() because TimescaleDB functions cannot run
+inside transactions. Each operation commits immediately.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Step 1: Create Daily Continuous Aggregate (WITHOUT DATA)
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            DROP MATERIALIZED VIEW IF EXISTS lfp_1day CASCADE;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            CREATE MATERIALIZED VIEW lfp_1day
+            WITH (timescaledb.continuous) AS
+            SELECT
+                time_bucket('1 day', timestamp) AS bucket,
+                contract_id,
+                AVG(funding_rate) AS avg_funding_rate
+            FROM live_funding_point
+            GROUP BY time_bucket('1 day', timestamp), contract_id
+            WITH NO DATA;
+        """))
+
+    # ============================================================
+    # Step 2: Backfill (FULL HISTORY, raw data is still complete)
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            CALL refresh_continuous_aggregate('lfp_1day',
+                NULL,
+                (NOW() - INTERVAL '1 day')::TIMESTAMP
+            );
+        """))
+
+    # ============================================================
+    # Step 3: Refresh Policy (Auto-Update)
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT remove_continuous_aggregate_policy('lfp_1day', if_exists => true);
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT add_continuous_aggregate_policy('lfp_1day',
+                start_offset => INTERVAL '3 days',
+                end_offset => INTERVAL '1 day',
+                schedule_interval => INTERVAL '12 hours'
+            );
+        """))
+
+    # ============================================================
+    # Step 4: Retention Policy for Raw Data
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT remove_retention_policy('live_funding_point', if_exists => true);
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT add_retention_policy('live_funding_point', INTERVAL '7 days');
+        """))
+
+
+def downgrade() -> None:
+    # Remove retention policy
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("SELECT remove_retention_policy('live_funding_point', if_exists => true);"))
+
+    # Remove refresh policy
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("SELECT remove_continuous_aggregate_policy('lfp_1day', if_exists => true);"))
+
+    # Drop continuous aggregate
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP MATERIALIZED VIEW IF EXISTS lfp_1day CASCADE;"))
@@ -0,0 +1,124 @@
+"""Parameterized tiered funding series function
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 11:41:52.870316
+
+Creates lfp_series(contract_ids, from, to), a set-returning replacement for
+the lfp_smart view that pushes contract and time predicates into every tier.
+
+Data Structure Architecture (same tiers as lfp_smart, plus daily history):
+- 0-3h:   Raw data (live_funding_point) - second precision
+- 3h-3d:  5min aggregates (lfp_5min)
+- 3d-7d:  15min aggregates (lfp_15min)
+- 7d-30d: 1hour aggregates (lfp_1hour)
+- 30d+:   1day aggregates (lfp_1day)
+
+Buckets are shifted to the END of each interval, as in lfp_smart. The range
+[from, to) applies to the shifted bucket; each tier rewrites it onto its own
+unshifted bucket column so chunk exclusion and the (contract_id, bucket)
+indexes apply. Only the filtered result is ordered.
+
+The function is LANGUAGE sql STABLE with a single SELECT, so the planner
+inlines it into the calling query.
+
+Changes:
+- Creates lfp_series(UUID[], TIMESTAMP, TIMESTAMP) function
+- lfp_smart is kept for existing readers
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        CREATE FUNCTION lfp_series(
+            p_contract_ids UUID[],
+            p_from TIMESTAMP,
+            p_to TIMESTAMP
+        )
+        RETURNS TABLE (bucket TIMESTAMP, contract_id UUID, avg_funding_rate DOUBLE PRECISION)
+        AS $$
+            SELECT bucket, contract_id, avg_funding_rate
+            FROM (
+                -- Layer 1: Raw data (0-3h) - no aggregation
+                SELECT
+                    lfp.timestamp AS bucket,
+                    lfp.contract_id,
+                    lfp.funding_rate AS avg_funding_rate
+                FROM live_funding_point lfp
+                WHERE lfp.contract_id = ANY(p_contract_ids)
+                  AND lfp.timestamp >= GREATEST(p_from, NOW()::TIMESTAMP - INTERVAL '3 hours')
+                  AND lfp.timestamp < p_to
+
+                UNION ALL
+
+                -- Layer 2: 5min aggregates (3h-3d) - shifted to interval end
+                SELECT
+                    a.bucket + INTERVAL '5 minutes',
+                    a.contract_id,
+                    a.avg_funding_rate
+                FROM lfp_5min a
+                WHERE a.contract_id = ANY(p_contract_ids)
+                  AND a.bucket >= GREATEST(p_from - INTERVAL '5 minutes',
+                                           NOW()::TIMESTAMP - INTERVAL '3 days')
+                  AND a.bucket < LEAST(p_to - INTERVAL '5 minutes',
+                                       NOW()::TIMESTAMP - INTERVAL '3 hours')
+
+                UNION ALL
+
+                -- Layer 3: 15min aggregates (3d-7d) - shifted to interval end
+                SELECT
+                    a.bucket + INTERVAL '15 minutes',
+                    a.contract_id,
+                    a.avg_funding_rate
+                FROM lfp_15min a
+                WHERE a.contract_id = ANY(p_contract_ids)
+                  AND a.bucket >= GREATEST(p_from - INTERVAL '15 minutes',
+                                           NOW()::TIMESTAMP - INTERVAL '7 days')
+                  AND a.bucket < LEAST(p_to - INTERVAL '15 minutes',
+                                       NOW()::TIMESTAMP - INTERVAL '3 days')
+
+                UNION ALL
+
+                -- Layer 4: 1hour aggregates (7d-30d) - shifted to interval end
+                SELECT
+                    a.bucket + INTERVAL '1 hour',
+                    a.contract_id,
+                    a.avg_funding_rate
+                FROM lfp_1hour a
+                WHERE a.contract_id = ANY(p_contract_ids)
+                  AND a.bucket >= GREATEST(p_from - INTERVAL '1 hour',
+                                           NOW()::TIMESTAMP - INTERVAL '30 days')
+                  AND a.bucket < LEAST(p_to - INTERVAL '1 hour',
+                                       NOW()::TIMESTAMP - INTERVAL '7 days')
+
+                UNION ALL
+
+                -- Layer 5: 1day aggregates (30d+) - shifted to interval end
+                SELECT
+                    a.bucket + INTERVAL '1 day',
+                    a.contract_id,
+                    a.avg_funding_rate
+                FROM lfp_1day a
+                WHERE a.contract_id = ANY(p_contract_ids)
+                  AND a.bucket >= p_from - INTERVAL '1 day'
+                  AND a.bucket < LEAST(p_to - INTERVAL '1 day',
+                                       NOW()::TIMESTAMP - INTERVAL '30 days')
+            ) combined
+            ORDER BY bucket, contract_id;
+        $$ LANGUAGE sql STABLE;
+    """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP FUNCTION IF EXISTS lfp_series(UUID[], TIMESTAMP, TIMESTAMP);"))
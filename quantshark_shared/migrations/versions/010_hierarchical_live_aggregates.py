@@ -0,0 +1,341 @@
+"""Hierarchical continuous aggregates for live funding tiers
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 12:26:09.431877
+
+Rebuilds the live funding aggregates as a hierarchy so each tier refreshes
+from the next finer tier instead of rescanning live_funding_point.
+
+Aggregate Hierarchy:
+- lfp_5min:  live_funding_point -> 5 minute buckets
+- lfp_15min: lfp_5min           -> 15 minute buckets
+- lfp_1hour: lfp_15min          -> 1 hour buckets
+- lfp_1day:  lfp_1hour          -> 1 day buckets
+
+Every tier stores sum_funding_rate and point_count; avg_funding_rate is
+sum / count of the underlying raw points, so averages stay exact instead of
+averaging averages. Column avg_funding_rate keeps its name for lfp_smart and
+lfp_series.
+
+Refresh windows stay inside the retention of the tier they read from:
+- lfp_15min: 12h window, lfp_5min keeps 3 days
+- lfp_1hour: 2d window,  lfp_15min keeps 7 days
+- lfp_1day:  3d window,  lfp_1hour keeps 30 days
+A refresh of a finer tier invalidates the coarser tier above it, so buckets
+materialized before the finer tier caught up are corrected on the next run.
+
+Changes:
+1. Drops lfp_smart, removes old policies, renames old aggregates to *_legacy
+2. Creates the 4 hierarchical continuous aggregates (WITHOUT DATA)
+3. Backfills every tier, in order, from the start of the day holding the
+   oldest raw data live_funding_point retention (7 days) still keeps, so
+   lfp_15min covers the same 7 days as before
+4. Copies legacy lfp_1hour rows older than the oldest raw hour and legacy
+   lfp_1day rows older than that day into lfp_1hour_history and
+   lfp_1day_history: plain tables outside the hierarchy, since legacy rows
+   have an average but no sum or count to refresh coarser tiers from
+   (readers union them in from migration 019). The first backfilled day of
+   lfp_1day only averages the raw hours still kept.
+5. Drops legacy aggregates, restores refresh/retention policies and lfp_smart
+
+NOTE: Uses autocommit_block() because TimescaleDB functions cannot run
+inside transactions. Each operation commits immediately.
+
+NOTE: A manual refresh over a range whose source tier no longer has data
+deletes the rows for that range. Keep backfills inside source retention.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+AGGREGATES = ("lfp_5min", "lfp_15min", "lfp_1hour", "lfp_1day")
+
+REFRESH_POLICIES = {
+    "lfp_5min": ("3 hours", "5 minutes", "30 minutes"),
+    "lfp_15min": ("12 hours", "15 minutes", "1 hour"),
+    "lfp_1hour": ("2 days", "1 hour", "4 hours"),
+    "lfp_1day": ("3 days", "1 day", "12 hours"),
+}
+
+RETENTION_POLICIES = {
+    "lfp_5min": "3 days",
+    "lfp_15min": "7 days",
+    "lfp_1hour": "30 days",
+}
+
+# Start of the day holding the oldest raw data kept by the live_funding_point retention
+# policy; rounded down, so the backfill covers all of it
+BACKFILL_START = "date_trunc('day', NOW()::TIMESTAMP - INTERVAL '7 days')"
+
+# Oldest raw hour: retention drops whole 1-hour chunks, so this hour is complete.
+# Hourly history is kept before it, where the backfilled lfp_1hour has no rows.
+RAW_HOURS_START = f"""GREATEST(
+    {BACKFILL_START},
+    COALESCE(
+        (SELECT time_bucket('1 hour', min(timestamp)) FROM live_funding_point),
+        NOW()::TIMESTAMP
+    )
+)"""
+
+# Legacy rows before these bounds are copied into the history tables
+HISTORY_END = {
+    "lfp_1hour": RAW_HOURS_START,
+    "lfp_1day": BACKFILL_START,
+}
+
+LFP_SMART_SQL = """
+    CREATE VIEW lfp_smart AS
+    SELECT bucket, contract_id, avg_funding_rate
+    FROM (
+        -- Layer 1: Raw data (0-3h) - no aggregation
+        SELECT
+            timestamp AS bucket,
+            contract_id,
+            funding_rate AS avg_funding_rate
+        FROM live_funding_point
+        WHERE timestamp >= NOW() - INTERVAL '3 hours'
+
+        UNION ALL
+
+        -- Layer 2: 5min aggregates (3h-3d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '5 minutes' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_5min
+        WHERE bucket >= NOW() - INTERVAL '3 days'
+          AND bucket < NOW() - INTERVAL '3 hours'
+
+        UNION ALL
+
+        -- Layer 3: 15min aggregates (3d-7d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '15 minutes' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_15min
+        WHERE bucket >= NOW() - INTERVAL '7 days'
+          AND bucket < NOW() - INTERVAL '3 days'
+
+        UNION ALL
+
+        -- Layer 4: 1hour aggregates (7d-30d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '1 hour' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_1hour
+        WHERE bucket >= NOW() - INTERVAL '30 days'
+          AND bucket < NOW() - INTERVAL '7 days'
+    ) combined
+    ORDER BY bucket, contract_id;
+"""
+
+
+def _remove_policies(view_name: str) -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(
+            f"SELECT remove_continuous_aggregate_policy('{view_name}', if_exists => true);"
+        ))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"SELECT remove_retention_policy('{view_name}', if_exists => true);"))
+
+
+def _add_policies(view_name: str) -> None:
+    start_offset, end_offset, schedule_interval = REFRESH_POLICIES[view_name]
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"""
+            SELECT add_continuous_aggregate_policy('{view_name}',
+                start_offset => INTERVAL '{start_offset}',
+                end_offset => INTERVAL '{end_offset}',
+                schedule_interval => INTERVAL '{schedule_interval}'
+            );
+        """))
+
+    if view_name in RETENTION_POLICIES:
+        with op.get_context().autocommit_block():
+            op.execute(sa.text(f"""
+                SELECT add_retention_policy('{view_name}', INTERVAL '{RETENTION_POLICIES[view_name]}');
+            """))
+
+
+def _backfill(view_name: str, start: str) -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"""
+            CALL refresh_continuous_aggregate('{view_name}',
+                ({start})::TIMESTAMP,
+                NOW()::TIMESTAMP
+            );
+        """))
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Step 1: Detach Old Aggregates
+    # ============================================================
+
+    op.execute(sa.text("DROP VIEW IF EXISTS lfp_smart;"))
+
+    for view_name in AGGREGATES:
+        _remove_policies(view_name)
+        with op.get_context().autocommit_block():
+            op.execute(sa.text(
+                f"ALTER MATERIALIZED VIEW {view_name} RENAME TO {view_name}_legacy;"
+            ))
+
+    # ============================================================
+    # Step 2: Create Hierarchical Continuous Aggregates (WITHOUT DATA)
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            CREATE MATERIALIZED VIEW lfp_5min
+            WITH (timescaledb.continuous) AS
+            SELECT
+                time_bucket('5 minutes', timestamp) AS bucket,
+                contract_id,
+                SUM(funding_rate) AS sum_funding_rate,
+                COUNT(*) AS point_count,
+                SUM(funding_rate) / COUNT(*) AS avg_funding_rate
+            FROM live_funding_point
+            GROUP BY time_bucket('5 minutes', timestamp), contract_id
+            WITH NO DATA;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            CREATE MATERIALIZED VIEW lfp_15min
+            WITH (timescaledb.continuous) AS
+            SELECT
+                time_bucket('15 minutes', bucket) AS bucket,
+                contract_id,
+                SUM(sum_funding_rate) AS sum_funding_rate,
+                SUM(point_count)::BIGINT AS point_count,
+                SUM(sum_funding_rate) / SUM(point_count)::DOUBLE PRECISION AS avg_funding_rate
+            FROM lfp_5min
+            GROUP BY time_bucket('15 minutes', bucket), contract_id
+            WITH NO DATA;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            CREATE MATERIALIZED VIEW lfp_1hour
+            WITH (timescaledb.continuous) AS
+            SELECT
+                time_bucket('1 hour', bucket) AS bucket,
+                contract_id,
+                SUM(sum_funding_rate) AS sum_funding_rate,
+                SUM(point_count)::BIGINT AS point_count,
+                SUM(sum_funding_rate) / SUM(point_count)::DOUBLE PRECISION AS avg_funding_rate
+            FROM lfp_15min
+            GROUP BY time_bucket('1 hour', bucket), contract_id
+            WITH NO DATA;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            CREATE MATERIALIZED VIEW lfp_1day
+            WITH (timescaledb.continuous) AS
+            SELECT
+                time_bucket('1 day', bucket) AS bucket,
+                contract_id,
+                SUM(sum_funding_rate) AS sum_funding_rate,
+                SUM(point_count)::BIGINT AS point_count,
+                SUM(sum_funding_rate) / SUM(point_count)::DOUBLE PRECISION AS avg_funding_rate
+            FROM lfp_1hour
+            GROUP BY time_bucket('1 day', bucket), contract_id
+            WITH NO DATA;
+        """))
+
+    # ============================================================
+    # Step 3: Backfill (finer tiers first)
+    # ============================================================
+
+    for view_name in AGGREGATES:
+        _backfill(view_name, BACKFILL_START)
+
+    # ============================================================
+    # Step 4: Keep History Older Than Raw Retention
+    # ============================================================
+
+    for view_name, history_end in HISTORY_END.items():
+        with op.get_context().autocommit_block():
+            op.execute(sa.text(f"""
+                CREATE TABLE {view_name}_history (
+                    contract_id UUID NOT NULL,
+                    bucket TIMESTAMP NOT NULL,
+                    avg_funding_rate DOUBLE PRECISION NOT NULL,
+                    PRIMARY KEY (contract_id, bucket)
+                );
+            """))
+
+        with op.get_context().autocommit_block():
+            op.execute(sa.text(f"""
+                INSERT INTO {view_name}_history (contract_id, bucket, avg_funding_rate)
+                SELECT contract_id, bucket, avg_funding_rate
+                FROM {view_name}_legacy
+                WHERE bucket < {history_end}
+                  AND avg_funding_rate IS NOT NULL;
+            """))
+
+    # ============================================================
+    # Step 5: Drop Legacy Aggregates, Restore Policies and lfp_smart
+    # ============================================================
+
+    for view_name in reversed(AGGREGATES):
+        with op.get_context().autocommit_block():
+            op.execute(sa.text(f"DROP MATERIALIZED VIEW IF EXISTS {view_name}_legacy CASCADE;"))
+
+    for view_name in AGGREGATES:
+        _add_policies(view_name)
+
+    op.execute(sa.text(LFP_SMART_SQL))
+
+
+def downgrade() -> None:
+    # Rebuilds flat AVG-only aggregates from the raw data still retained;
+    # history older than raw retention is not carried back.
+    op.execute(sa.text("DROP VIEW IF EXISTS lfp_smart;"))
+    op.execute(sa.text("DROP TABLE IF EXISTS lfp_1hour_history;"))
+    op.execute(sa.text("DROP TABLE IF EXISTS lfp_1day_history;"))
+
+    for view_name in AGGREGATES:
+        _remove_policies(view_name)
+
+    for view_name in reversed(AGGREGATES):
+        with op.get_context().autocommit_block():
+            op.execute(sa.text(f"DROP MATERIALIZED VIEW IF EXISTS {view_name} CASCADE;"))
+
+    for view_name, bucket_width in (
+        ("lfp_5min", "5 minutes"),
+        ("lfp_15min", "15 minutes"),
+        ("lfp_1hour", "1 hour"),
+        ("lfp_1day", "1 day"),
+    ):
+        with op.get_context().autocommit_block():
+            op.execute(sa.text(f"""
+                CREATE MATERIALIZED VIEW {view_name}
+                WITH (timescaledb.continuous) AS
+                SELECT
+                    time_bucket('{bucket_width}', timestamp) AS bucket,
+                    contract_id,
+                    AVG(funding_rate) AS avg_funding_rate
+                FROM live_funding_point
+                GROUP BY time_bucket('{bucket_width}', timestamp), contract_id
+                WITH NO DATA;
+            """))
+        _backfill(view_name, BACKFILL_START)
+        _add_policies(view_name)
+
+    op.execute(sa.text(LFP_SMART_SQL))
@@ -0,0 +1,205 @@
+"""Continuous aggregates for historical funding with normalized rates
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 13:08:45.117602
+
+Creates daily, weekly and monthly continuous aggregates over
+historical_funding_point with precomputed normalized rates, so long-range
+charts and cross-exchange comparisons don't rescan raw settlements.
+
+Aggregate Hierarchy:
+- hfp_1day:   historical_funding_point JOIN contract -> 1 day buckets
+- hfp_7day:   hfp_1day                               -> 7 day buckets
+- hfp_1month: hfp_1day                               -> 1 month buckets
+
+Columns (every tier):
+- sum_funding_rate: realized funding over the bucket (sum of settlements)
+- point_count:      number of settlements
+- avg_funding_rate: sum / count of the underlying settlements
+- rate_1h, rate_8h, rate_1d, rate_365d: avg_funding_rate normalized with
+  get_funding_multiplier(funding_interval, 1 | 8 | 24 | 8760); rate_365d is APR
+
+funding_interval is carried as a grouping column from contract. The join to
+contract is not tracked by invalidation: if a contract's funding_interval
+changes, refresh the affected range manually.
+
+All tiers are real-time (materialized_only = false) so the bucket in
+progress is visible. No retention policies: history is kept forever.
+
+Backfill is not part of the migration: run
+python -m quantshark_shared.timescale.backfill hfp_1day hfp_7day hfp_1month
+after upgrading. Until then queries fall back to real-time aggregation.
+
+NOTE: Uses autocommit_block() because TimescaleDB functions cannot run
+inside transactions. Each operation commits immediately.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def averaged_columns(sum_rate: str, count: str) -> str:
+    """avg_funding_rate and the normalized rates from a bucket's sum and count.
+
+    Every tier uses this one formula: hfp_1day over raw settlements, the upper tiers
+    over the sum_funding_rate and point_count hfp_1day stores.
+    """
+    average = f"({sum_rate} / {count})::DOUBLE PRECISION"
+    return f"""
+        {average} AS avg_funding_rate,
+        {average}
+            * get_funding_multiplier(funding_interval, 1::NUMERIC) AS rate_1h,
+        {average}
+            * get_funding_multiplier(funding_interval, 8::NUMERIC) AS rate_8h,
+        {average}
+            * get_funding_multiplier(funding_interval, 24::NUMERIC) AS rate_1d,
+        {average}
+            * get_funding_multiplier(funding_interval, 8760::NUMERIC) AS rate_365d
+    """
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Step 1: Create Continuous Aggregates (WITHOUT DATA)
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            DROP MATERIALIZED VIEW IF EXISTS hfp_1day CASCADE;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"""
+            CREATE MATERIALIZED VIEW hfp_1day
+            WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+            SELECT
+                time_bucket('1 day', hfp.timestamp) AS bucket,
+                hfp.contract_id,
+                c.funding_interval,
+                SUM(hfp.funding_rate) AS sum_funding_rate,
+                COUNT(*) AS point_count,
+                {averaged_columns("SUM(hfp.funding_rate)", "COUNT(*)")}
+            FROM historical_funding_point hfp
+            JOIN contract c ON c.id = hfp.contract_id
+            GROUP BY time_bucket('1 day', hfp.timestamp), hfp.contract_id, c.funding_interval
+            WITH NO DATA;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            DROP MATERIALIZED VIEW IF EXISTS hfp_7day CASCADE;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"""
+            CREATE MATERIALIZED VIEW hfp_7day
+            WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+            SELECT
+                time_bucket('7 days', bucket) AS bucket,
+                contract_id,
+                funding_interval,
+                SUM(sum_funding_rate) AS sum_funding_rate,
+                SUM(point_count)::BIGINT AS point_count,
+                {averaged_columns("SUM(sum_funding_rate)", "SUM(point_count)")}
+            FROM hfp_1day
+            GROUP BY time_bucket('7 days', bucket), contract_id, funding_interval
+            WITH NO DATA;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            DROP MATERIALIZED VIEW IF EXISTS hfp_1month CASCADE;
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"""
+            CREATE MATERIALIZED VIEW hfp_1month
+            WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+            SELECT
+                time_bucket('1 month', bucket) AS bucket,
+                contract_id,
+                funding_interval,
+                SUM(sum_funding_rate) AS sum_funding_rate,
+                SUM(point_count)::BIGINT AS point_count,
+                {averaged_columns("SUM(sum_funding_rate)", "SUM(point_count)")}
+            FROM hfp_1day
+            GROUP BY time_bucket('1 month', bucket), contract_id, funding_interval
+            WITH NO DATA;
+        """))
+
+    # ============================================================
+    # Step 2: Refresh Policies (Auto-Update)
+    # ============================================================
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT remove_continuous_aggregate_policy('hfp_1day', if_exists => true);
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT add_continuous_aggregate_policy('hfp_1day',
+                start_offset => INTERVAL '10 days',
+                end_offset => INTERVAL '1 hour',
+                schedule_interval => INTERVAL '1 hour'
+            );
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT remove_continuous_aggregate_policy('hfp_7day', if_exists => true);
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT add_continuous_aggregate_policy('hfp_7day',
+                start_offset => INTERVAL '35 days',
+                end_offset => INTERVAL '1 day',
+                schedule_interval => INTERVAL '6 hours'
+            );
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT remove_continuous_aggregate_policy('hfp_1month', if_exists => true);
+        """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("""
+            SELECT add_continuous_aggregate_policy('hfp_1month',
+                start_offset => INTERVAL '3 months',
+                end_offset => INTERVAL '1 day',
+                schedule_interval => INTERVAL '1 day'
+            );
+        """))
+
+
+def downgrade() -> None:
+    # Remove refresh policies
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("SELECT remove_continuous_aggregate_policy('hfp_1month', if_exists => true);"))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("SELECT remove_continuous_aggregate_policy('hfp_7day', if_exists => true);"))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("SELECT remove_continuous_aggregate_policy('hfp_1day', if_exists => true);"))
+
+    # Drop continuous aggregates (coarser tiers first)
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP MATERIALIZED VIEW IF EXISTS hfp_1month CASCADE;"))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP MATERIALIZED VIEW IF EXISTS hfp_7day CASCADE;"))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP MATERIALIZED VIEW IF EXISTS hfp_1day CASCADE;"))
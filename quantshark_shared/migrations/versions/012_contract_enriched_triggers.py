@@ -0,0 +1,235 @@
+"""Trigger-maintained contract_enriched table
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18 13:47:20.663418
+
+Replaces the contract_enriched materialized view with a regular table kept
+in sync by statement-level triggers on contract and section. New, updated,
+deprecated and deleted contracts are visible as soon as the writing
+transaction commits; no REFRESH, no reader locks.
+
+Structure:
+- contract_enriched_source: plain view with the former materialized view
+  query (single definition of the enriched columns)
+- contract_enriched: table with the same columns, primary key on id and the
+  asset_name/quote_name/section_name indexes from migration 003
+- contract_enriched_sync(): trigger function applying transition tables
+- rebuild_contract_enriched(): full resync, for repairs only
+
+Triggers:
+- contract: AFTER INSERT / UPDATE / DELETE (transition tables), AFTER TRUNCATE
+- section:  AFTER UPDATE / DELETE (resync contracts of affected sections)
+
+Changes:
+1. Drops materialized view contract_enriched
+2. Creates contract_enriched_source view and contract_enriched table
+3. Creates sync functions and triggers
+4. Populates contract_enriched
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("DROP MATERIALIZED VIEW IF EXISTS contract_enriched;"))
+
+    # Single definition of enriched columns (former materialized view query)
+    op.execute(sa.text("""
+        CREATE VIEW contract_enriched_source AS
+        SELECT
+            c.id,
+            c.asset_name,
+            c.quote_name,
+            c.funding_interval,
+            s.name AS section_name,
+            c.deprecated,
+            get_funding_multiplier(c.funding_interval, 1::NUMERIC) AS multiplier_1h,
+            get_funding_multiplier(c.funding_interval, 8::NUMERIC) AS multiplier_8h,
+            get_funding_multiplier(c.funding_interval, 24::NUMERIC) AS multiplier_1d,
+            get_funding_multiplier(c.funding_interval, 8760::NUMERIC) AS multiplier_365d
+        FROM contract c
+        JOIN section s ON (c.section_name::TEXT = s.name::TEXT)
+        WHERE c.deprecated = false;
+    """))
+
+    op.execute(sa.text("""
+        CREATE TABLE contract_enriched AS
+        SELECT * FROM contract_enriched_source
+        WITH NO DATA;
+    """))
+
+    op.execute(sa.text("""
+        ALTER TABLE contract_enriched ADD CONSTRAINT contract_enriched_pkey PRIMARY KEY (id);
+    """))
+
+    op.execute(sa.text("""
+        CREATE INDEX contract_enriched_asset_name_idx ON contract_enriched (asset_name);
+    """))
+
+    op.execute(sa.text("""
+        CREATE INDEX contract_enriched_quote_name_idx ON contract_enriched (quote_name);
+    """))
+
+    op.execute(sa.text("""
+        CREATE INDEX contract_enriched_section_name_idx ON contract_enriched (section_name);
+    """))
+
+    # Trigger function: transition tables are only referenced in branches
+    # matching TG_OP, so one function serves all three contract triggers.
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_enriched_sync() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM contract_enriched ce
+                USING old_rows o
+                WHERE ce.id = o.id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO contract_enriched
+                SELECT src.*
+                FROM contract_enriched_source src
+                JOIN new_rows n ON n.id = src.id
+                ON CONFLICT (id) DO NOTHING;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_enriched_sync_section() RETURNS TRIGGER AS $$
+        BEGIN
+            DELETE FROM contract_enriched ce
+            USING old_rows o
+            WHERE ce.section_name = o.name;
+
+            IF TG_OP = 'UPDATE' THEN
+                INSERT INTO contract_enriched
+                SELECT src.*
+                FROM contract_enriched_source src
+                JOIN new_rows n ON n.name = src.section_name
+                ON CONFLICT (id) DO NOTHING;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_enriched_truncate() RETURNS TRIGGER AS $$
+        BEGIN
+            TRUNCATE contract_enriched;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE FUNCTION rebuild_contract_enriched() RETURNS VOID AS $$
+            DELETE FROM contract_enriched;
+            INSERT INTO contract_enriched SELECT * FROM contract_enriched_source;
+        $$ LANGUAGE sql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_enriched_insert
+        AFTER INSERT ON contract
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_enriched_sync();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_enriched_update
+        AFTER UPDATE ON contract
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_enriched_sync();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_enriched_delete
+        AFTER DELETE ON contract
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_enriched_sync();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_enriched_truncate
+        AFTER TRUNCATE ON contract
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_enriched_truncate();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_enriched_section_update
+        AFTER UPDATE ON section
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_enriched_sync_section();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_enriched_section_delete
+        AFTER DELETE ON section
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_enriched_sync_section();
+    """))
+
+    op.execute(sa.text("SELECT rebuild_contract_enriched();"))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_enriched_section_delete ON section;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_enriched_section_update ON section;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_enriched_truncate ON contract;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_enriched_delete ON contract;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_enriched_update ON contract;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_enriched_insert ON contract;"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS rebuild_contract_enriched();"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_enriched_truncate();"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_enriched_sync_section();"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_enriched_sync();"))
+    op.execute(sa.text("DROP TABLE IF EXISTS contract_enriched;"))
+
+    op.execute(sa.text("DROP VIEW IF EXISTS contract_enriched_source;"))
+
+    # Restore materialized view from migration 003
+    op.execute(sa.text("""
+        CREATE MATERIALIZED VIEW contract_enriched AS
+        SELECT
+            c.id,
+            c.asset_name,
+            c.quote_name,
+            c.funding_interval,
+            s.name AS section_name,
+            c.deprecated,
+            get_funding_multiplier(c.funding_interval, 1::NUMERIC) AS multiplier_1h,
+            get_funding_multiplier(c.funding_interval, 8::NUMERIC) AS multiplier_8h,
+            get_funding_multiplier(c.funding_interval, 24::NUMERIC) AS multiplier_1d,
+            get_funding_multiplier(c.funding_interval, 8760::NUMERIC) AS multiplier_365d
+        FROM contract c
+        JOIN section s ON (c.section_name::TEXT = s.name::TEXT)
+        WHERE c.deprecated = false
+        WITH NO DATA;
+    """))
+    op.execute(sa.text("CREATE UNIQUE INDEX contract_enriched_id_idx ON contract_enriched (id);"))
+    op.execute(sa.text(
+        "CREATE INDEX contract_enriched_asset_name_idx ON contract_enriched (asset_name);"
+    ))
+    op.execute(sa.text(
+        "CREATE INDEX contract_enriched_quote_name_idx ON contract_enriched (quote_name);"
+    ))
+    op.execute(sa.text(
+        "CREATE INDEX contract_enriched_section_name_idx ON contract_enriched (section_name);"
+    ))
+    op.execute(sa.text("REFRESH MATERIALIZED VIEW contract_enriched;"))
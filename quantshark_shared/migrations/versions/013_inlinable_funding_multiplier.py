@@ -0,0 +1,57 @@
+"""Inlinable get_funding_multiplier
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18 14:21:37.902114
+
+Replaces the plpgsql get_funding_multiplier with a LANGUAGE sql version the
+planner can inline (folding constant intervals at plan time). The CASE and
+its NUMERIC literals are unchanged, so results, including their scale, are
+identical to migration 002. quantshark_shared.funding mirrors this function.
+
+Changes:
+- get_funding_multiplier(integer, numeric) -> numeric: plpgsql -> sql
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        CREATE OR REPLACE FUNCTION get_funding_multiplier(funding_interval INTEGER, target_hours NUMERIC)
+        RETURNS NUMERIC AS $$
+            SELECT CASE funding_interval
+                WHEN 1 THEN target_hours
+                WHEN 2 THEN target_hours / 2.0
+                WHEN 4 THEN target_hours / 4.0
+                WHEN 8 THEN target_hours / 8.0
+                ELSE target_hours / funding_interval
+            END;
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+    """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("""
+        CREATE OR REPLACE FUNCTION get_funding_multiplier(funding_interval INTEGER, target_hours NUMERIC)
+        RETURNS NUMERIC AS $$
+        BEGIN
+            RETURN CASE funding_interval
+                WHEN 1 THEN target_hours
+                WHEN 2 THEN target_hours / 2.0
+                WHEN 4 THEN target_hours / 4.0
+                WHEN 8 THEN target_hours / 8.0
+                ELSE target_hours / funding_interval
+            END;
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE;
+    """))
@@ -0,0 +1,271 @@
+"""Precomputed contract search index and batch search function
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18 15:02:11.384290
+
+Adds trigger-maintained search documents for contracts and a single-statement
+ranked search that reproduces match_quality's scoring tiers without calling
+it per row and per token.
+
+Search Documents:
+- contract_search_field:  lower(trim()) asset_name / section_name / quote_name
+                          per contract (field 1 / 2 / 3), GIN trigram index
+- contract_search_suffix: every suffix of every field value (COLLATE "C",
+                          btree), with its start_pos and whether it starts a
+                          word (previous char is not [a-z0-9])
+
+A token matches a field iff some suffix starts with it, so exact, prefix,
+word-start, whole-word and substring tiers become btree range lookups:
+- start_pos 0 and same length    -> exact
+- start_pos 0                    -> prefix
+- word_start (+ boundary after)  -> word-start / whole-word (short tokens)
+- any suffix                     -> contains
+Trigram similarity (> 0.2, tokens of 3+ chars) comes from the GIN index on
+contract_search_field. Tiers are strictly ordered, so the best tier per
+(contract, field, token) is MAX(score), which equals match_quality().
+
+Ranking (per query):
+- tokens: whitespace split of lower(trim(query))
+- token score: best field score; every token must match (score > 0)
+- contract score: sum of token scores; ties by asset, section, quote
+
+match_quality and contract_search_trgm_idx are kept for existing callers.
+
+Changes:
+1. Creates contract_search_field / contract_search_suffix tables
+2. Creates contract_search_index(UUID[]) and statement-level triggers on contract
+3. Creates search_contracts(TEXT[], INTEGER) batch search function
+4. Indexes existing contracts
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Step 1: Search Document Tables
+    # ============================================================
+
+    op.execute(sa.text("""
+        CREATE TABLE contract_search_field (
+            contract_id UUID NOT NULL REFERENCES contract (id) ON DELETE CASCADE,
+            field SMALLINT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (contract_id, field)
+        );
+    """))
+
+    op.execute(sa.text("""
+        CREATE INDEX contract_search_field_trgm_idx
+        ON contract_search_field USING GIN (value gin_trgm_ops);
+    """))
+
+    op.execute(sa.text("""
+        CREATE TABLE contract_search_suffix (
+            contract_id UUID NOT NULL,
+            field SMALLINT NOT NULL,
+            start_pos INTEGER NOT NULL,
+            suffix TEXT COLLATE "C" NOT NULL,
+            field_len INTEGER NOT NULL,
+            word_start BOOLEAN NOT NULL,
+            PRIMARY KEY (contract_id, field, start_pos),
+            FOREIGN KEY (contract_id, field)
+                REFERENCES contract_search_field (contract_id, field) ON DELETE CASCADE
+        );
+    """))
+
+    op.execute(sa.text("""
+        CREATE INDEX contract_search_suffix_idx ON contract_search_suffix (suffix);
+    """))
+
+    # ============================================================
+    # Step 2: Maintenance Functions and Triggers
+    # ============================================================
+
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_search_index(p_contract_ids UUID[]) RETURNS VOID AS $$
+            DELETE FROM contract_search_field WHERE contract_id = ANY(p_contract_ids);
+
+            INSERT INTO contract_search_field (contract_id, field, value)
+            SELECT c.id, f.field, lower(trim(f.value))
+            FROM contract c
+            CROSS JOIN LATERAL (VALUES
+                (1::SMALLINT, c.asset_name::TEXT),
+                (2::SMALLINT, c.section_name::TEXT),
+                (3::SMALLINT, c.quote_name::TEXT)
+            ) AS f (field, value)
+            WHERE c.id = ANY(p_contract_ids);
+
+            INSERT INTO contract_search_suffix
+                (contract_id, field, start_pos, suffix, field_len, word_start)
+            SELECT
+                f.contract_id,
+                f.field,
+                pos - 1,
+                substr(f.value, pos),
+                length(f.value),
+                pos = 1 OR substr(f.value, pos - 1, 1) !~ '[a-z0-9]'
+            FROM contract_search_field f
+            CROSS JOIN LATERAL generate_series(1, length(f.value)) AS pos
+            WHERE f.contract_id = ANY(p_contract_ids);
+        $$ LANGUAGE sql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_search_sync() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM contract_search_index(ARRAY(SELECT id FROM new_rows));
+            ELSE
+                -- Only reindex contracts whose searchable fields changed
+                PERFORM contract_search_index(ARRAY(
+                    SELECT n.id
+                    FROM new_rows n
+                    JOIN old_rows o ON o.id = n.id
+                    WHERE (n.asset_name, n.section_name, n.quote_name)
+                          IS DISTINCT FROM (o.asset_name, o.section_name, o.quote_name)
+                ));
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_search_insert
+        AFTER INSERT ON contract
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_search_sync();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_search_update
+        AFTER UPDATE ON contract
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_search_sync();
+    """))
+
+    # ============================================================
+    # Step 3: Batch Search Function
+    # ============================================================
+
+    op.execute(sa.text("""
+        CREATE FUNCTION search_contracts(p_queries TEXT[], p_limit INTEGER DEFAULT 20)
+        RETURNS TABLE (query_index INTEGER, contract_id UUID, score BIGINT, rank BIGINT)
+        AS $$
+            WITH tokens AS (
+                SELECT
+                    q.query_index::INTEGER AS query_index,
+                    t.token_index,
+                    t.token,
+                    length(t.token) AS token_len
+                FROM unnest(p_queries) WITH ORDINALITY AS q (query, query_index)
+                CROSS JOIN LATERAL regexp_split_to_table(lower(trim(q.query)), '\\s+')
+                    WITH ORDINALITY AS t (token, token_index)
+                WHERE t.token <> ''
+            ),
+            token_counts AS (
+                SELECT query_index, count(*) AS token_count
+                FROM tokens
+                GROUP BY query_index
+            ),
+            suffix_hits AS (
+                SELECT
+                    tk.query_index,
+                    tk.token_index,
+                    s.contract_id,
+                    MAX(CASE
+                        WHEN s.start_pos = 0 AND s.field_len = tk.token_len THEN 10000
+                        WHEN tk.token_len <= 2 THEN CASE
+                            WHEN s.start_pos = 0 THEN 8000 + 2000 * tk.token_len / s.field_len
+                            WHEN s.word_start
+                                 AND (length(s.suffix) = tk.token_len
+                                      OR substr(s.suffix, tk.token_len + 1, 1) !~ '[a-z0-9]')
+                                THEN 5000
+                            ELSE 300
+                        END
+                        WHEN s.start_pos = 0 THEN 5000 + 5000 * tk.token_len / s.field_len
+                        WHEN s.word_start THEN 2000
+                        ELSE 500
+                    END) AS score
+                FROM tokens tk
+                JOIN contract_search_suffix s
+                  ON s.suffix >= tk.token COLLATE "C"
+                 AND s.suffix < (tk.token || chr(1114111)) COLLATE "C"
+                GROUP BY tk.query_index, tk.token_index, s.contract_id
+            ),
+            similarity_hits AS (
+                SELECT
+                    tk.query_index,
+                    tk.token_index,
+                    f.contract_id,
+                    MAX((similarity(f.value, tk.token) * 300)::INTEGER) AS score
+                FROM tokens tk
+                JOIN contract_search_field f ON f.value % tk.token
+                WHERE tk.token_len >= 3
+                  AND similarity(f.value, tk.token) > 0.2
+                GROUP BY tk.query_index, tk.token_index, f.contract_id
+            ),
+            token_scores AS (
+                SELECT query_index, token_index, contract_id, MAX(score) AS score
+                FROM (
+                    SELECT * FROM suffix_hits
+                    UNION ALL
+                    SELECT * FROM similarity_hits
+                ) hits
+                WHERE score > 0
+                GROUP BY query_index, token_index, contract_id
+            ),
+            contract_scores AS (
+                SELECT ts.query_index, ts.contract_id, SUM(ts.score) AS score
+                FROM token_scores ts
+                JOIN token_counts tc ON tc.query_index = ts.query_index
+                GROUP BY ts.query_index, ts.contract_id, tc.token_count
+                HAVING count(*) = tc.token_count
+            ),
+            ranked AS (
+                SELECT
+                    cs.query_index,
+                    cs.contract_id,
+                    cs.score,
+                    row_number() OVER (
+                        PARTITION BY cs.query_index
+                        ORDER BY cs.score DESC, c.asset_name, c.section_name, c.quote_name
+                    ) AS rank
+                FROM contract_scores cs
+                JOIN contract c ON c.id = cs.contract_id
+            )
+            SELECT query_index, contract_id, score::BIGINT, rank
+            FROM ranked
+            WHERE rank <= p_limit
+            ORDER BY query_index, rank;
+        $$ LANGUAGE sql STABLE
+        SET pg_trgm.similarity_threshold = 0.2;
+    """))
+
+    # ============================================================
+    # Step 4: Index Existing Contracts
+    # ============================================================
+
+    op.execute(sa.text("SELECT contract_search_index(ARRAY(SELECT id FROM contract));"))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP FUNCTION IF EXISTS search_contracts(TEXT[], INTEGER);"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_search_update ON contract;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_search_insert ON contract;"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_search_sync();"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_search_index(UUID[]);"))
+    op.execute(sa.text("DROP TABLE IF EXISTS contract_search_suffix;"))
+    op.execute(sa.text("DROP TABLE IF EXISTS contract_search_field;"))
@@ -0,0 +1,171 @@
+"""NOTIFY triggers for the in-process contract registry
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18 15:41:07.902114
+
+Publishes catalog changes on the contract_registry channel so in-process
+registries (quantshark_shared.catalog.ContractRegistry) can reload only the
+affected contracts. Notifications are sent on commit, after the
+contract_enriched triggers have applied the same change.
+
+Payload (JSON text):
+- {"table": "contract", "keys": [<id>, ...]}   contracts to reload
+- {"table": "asset" | "section", "keys": [<name>, ...]}  contracts to reload
+  by asset_name / section_name
+- {"table": ..., "keys": null}                 reload everything (TRUNCATE,
+                                              or keys over the 8000 byte
+                                              payload limit)
+
+Triggers:
+- contract: AFTER INSERT / UPDATE / DELETE (statement level, transition
+  tables; updates only report contracts whose registry columns changed),
+  AFTER TRUNCATE
+- asset, section: AFTER UPDATE OF name / DELETE (row level)
+
+Changes:
+1. Creates contract_registry_publish(TEXT, JSONB) helper
+2. Creates contract_registry_notify_contract() and contract_registry_notify_name()
+3. Creates triggers on contract, asset and section
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Step 1: Notification Functions
+    # ============================================================
+
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_registry_publish(p_table TEXT, p_keys JSONB) RETURNS VOID AS $$
+        DECLARE
+            payload TEXT;
+        BEGIN
+            IF p_keys IS NOT NULL AND jsonb_array_length(p_keys) = 0 THEN
+                RETURN;
+            END IF;
+
+            payload := jsonb_build_object('table', p_table, 'keys', p_keys)::TEXT;
+            IF octet_length(payload) > 7900 THEN
+                payload := jsonb_build_object('table', p_table, 'keys', NULL)::TEXT;
+            END IF;
+
+            PERFORM pg_notify('contract_registry', payload);
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_registry_notify_contract() RETURNS TRIGGER AS $$
+        DECLARE
+            keys JSONB;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                keys := NULL;
+            ELSIF TG_OP = 'INSERT' THEN
+                SELECT coalesce(jsonb_agg(id), '[]') INTO keys FROM new_rows;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT coalesce(jsonb_agg(id), '[]') INTO keys FROM old_rows;
+            ELSE
+                SELECT coalesce(jsonb_agg(DISTINCT changed.id), '[]') INTO keys
+                FROM (
+                    SELECT coalesce(n.id, o.id) AS id
+                    FROM new_rows n
+                    FULL JOIN old_rows o ON o.id = n.id
+                    WHERE n.id IS NULL
+                       OR o.id IS NULL
+                       OR (n.asset_name, n.section_name, n.quote_name,
+                           n.funding_interval, n.deprecated)
+                          IS DISTINCT FROM
+                          (o.asset_name, o.section_name, o.quote_name,
+                           o.funding_interval, o.deprecated)
+                ) AS changed;
+            END IF;
+
+            PERFORM contract_registry_publish(TG_TABLE_NAME, keys);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    op.execute(sa.text("""
+        CREATE FUNCTION contract_registry_notify_name() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM contract_registry_publish(TG_TABLE_NAME, jsonb_build_array(OLD.name));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    # ============================================================
+    # Step 2: Triggers
+    # ============================================================
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_registry_insert
+        AFTER INSERT ON contract
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_registry_notify_contract();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_registry_update
+        AFTER UPDATE ON contract
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_registry_notify_contract();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_registry_delete
+        AFTER DELETE ON contract
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_registry_notify_contract();
+    """))
+
+    op.execute(sa.text("""
+        CREATE TRIGGER contract_registry_truncate
+        AFTER TRUNCATE ON contract
+        FOR EACH STATEMENT EXECUTE FUNCTION contract_registry_notify_contract();
+    """))
+
+    for table_name in ("asset", "section"):
+        op.execute(sa.text(f"""
+            CREATE TRIGGER contract_registry_{table_name}_update
+            AFTER UPDATE OF name ON {table_name}
+            FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+            EXECUTE FUNCTION contract_registry_notify_name();
+        """))
+
+        op.execute(sa.text(f"""
+            CREATE TRIGGER contract_registry_{table_name}_delete
+            AFTER DELETE ON {table_name}
+            FOR EACH ROW EXECUTE FUNCTION contract_registry_notify_name();
+        """))
+
+
+def downgrade() -> None:
+    for table_name in ("section", "asset"):
+        op.execute(sa.text(
+            f"DROP TRIGGER IF EXISTS contract_registry_{table_name}_delete ON {table_name};"
+        ))
+        op.execute(sa.text(
+            f"DROP TRIGGER IF EXISTS contract_registry_{table_name}_update ON {table_name};"
+        ))
+
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_registry_truncate ON contract;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_registry_delete ON contract;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_registry_update ON contract;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS contract_registry_insert ON contract;"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_registry_notify_name();"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_registry_notify_contract();"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS contract_registry_publish(TEXT, JSONB);"))
@@ -0,0 +1,114 @@
+"""Latest funding snapshot per contract
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18 16:20:33.518407
+
+Adds funding_latest, one row per contract holding the newest live and
+historical funding point, so "current rate for every contract" is a scan
+of a small table instead of a last-point search over recent hypertable
+chunks.
+
+Maintenance:
+- copy_funding_points (quantshark_shared.ingestion) upserts the newest
+  written point per contract in the same statement as the COPY merge;
+  older points never overwrite newer ones
+- rebuild_funding_latest(): full resync from the hypertables, for
+  backfills that bypass the ingestion path and for repairs
+
+funding_latest_enriched joins contract_enriched (non-deprecated contracts
+only) and derives rate_1h / 8h / 1d / 365d for the live and historical
+rate from its multipliers, so a funding_interval change never leaves stale
+normalized values behind.
+
+Changes:
+1. Creates funding_latest table and funding_latest_enriched view
+2. Creates rebuild_funding_latest() and populates the table
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '016'
+down_revision: Union[str, None] = '015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        CREATE TABLE funding_latest (
+            contract_id UUID PRIMARY KEY REFERENCES contract (id) ON DELETE CASCADE,
+            live_timestamp TIMESTAMP,
+            live_funding_rate DOUBLE PRECISION,
+            historical_timestamp TIMESTAMP,
+            historical_funding_rate DOUBLE PRECISION,
+            updated_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'UTC')
+        );
+    """))
+
+    op.execute(sa.text("""
+        CREATE VIEW funding_latest_enriched AS
+        SELECT
+            fl.contract_id,
+            ce.asset_name,
+            ce.section_name,
+            ce.quote_name,
+            ce.funding_interval,
+            fl.live_timestamp,
+            fl.live_funding_rate,
+            fl.live_funding_rate * ce.multiplier_1h AS live_rate_1h,
+            fl.live_funding_rate * ce.multiplier_8h AS live_rate_8h,
+            fl.live_funding_rate * ce.multiplier_1d AS live_rate_1d,
+            fl.live_funding_rate * ce.multiplier_365d AS live_rate_365d,
+            fl.historical_timestamp,
+            fl.historical_funding_rate,
+            fl.historical_funding_rate * ce.multiplier_1h AS historical_rate_1h,
+            fl.historical_funding_rate * ce.multiplier_8h AS historical_rate_8h,
+            fl.historical_funding_rate * ce.multiplier_1d AS historical_rate_1d,
+            fl.historical_funding_rate * ce.multiplier_365d AS historical_rate_365d,
+            fl.updated_at
+        FROM funding_latest fl
+        JOIN contract_enriched ce ON ce.id = fl.contract_id;
+    """))
+
+    # Newest point per contract: one backward primary key scan per contract and table
+    op.execute(sa.text("""
+        CREATE FUNCTION rebuild_funding_latest() RETURNS VOID AS $$
+            DELETE FROM funding_latest;
+
+            INSERT INTO funding_latest (
+                contract_id,
+                live_timestamp, live_funding_rate,
+                historical_timestamp, historical_funding_rate
+            )
+            SELECT c.id, l.timestamp, l.funding_rate, h.timestamp, h.funding_rate
+            FROM contract c
+            LEFT JOIN LATERAL (
+                SELECT timestamp, funding_rate
+                FROM live_funding_point
+                WHERE contract_id = c.id
+                ORDER BY timestamp DESC
+                LIMIT 1
+            ) l ON true
+            LEFT JOIN LATERAL (
+                SELECT timestamp, funding_rate
+                FROM historical_funding_point
+                WHERE contract_id = c.id
+                ORDER BY timestamp DESC
+                LIMIT 1
+            ) h ON true
+            WHERE l.timestamp IS NOT NULL OR h.timestamp IS NOT NULL;
+        $$ LANGUAGE sql;
+    """))
+
+    op.execute(sa.text("SELECT rebuild_funding_latest();"))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP FUNCTION IF EXISTS rebuild_funding_latest();"))
+    op.execute(sa.text("DROP VIEW IF EXISTS funding_latest_enriched;"))
+    op.execute(sa.text("DROP TABLE IF EXISTS funding_latest;"))
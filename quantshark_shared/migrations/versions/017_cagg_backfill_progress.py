@@ -0,0 +1,45 @@
+"""Checkpoints for sliced continuous aggregate backfills
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-18 17:12:40.281905
+
+Adds cagg_backfill_progress, one row per finished slice of a backfill run
+by quantshark_shared.timescale.backfill. A rerun skips the slices recorded
+here, so an interrupted backfill resumes instead of starting over.
+
+Migrations create continuous aggregates WITH NO DATA and leave the
+backfill to that command (see 004 and 011).
+
+Changes:
+1. Creates cagg_backfill_progress table
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '017'
+down_revision: Union[str, None] = '016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        CREATE TABLE cagg_backfill_progress (
+            view_name TEXT NOT NULL,
+            slice_start TIMESTAMP NOT NULL,
+            slice_end TIMESTAMP NOT NULL,
+            materialized_rows BIGINT NOT NULL,
+            seconds DOUBLE PRECISION NOT NULL,
+            finished_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'UTC'),
+            PRIMARY KEY (view_name, slice_start, slice_end)
+        );
+    """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP TABLE IF EXISTS cagg_backfill_progress;"))
@@ -0,0 +1,48 @@
+"""Back contract.quote_name with the quote table
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-18 17:48:02.664013
+
+contract.quote_name was a free-text column next to an unused quote table.
+Every quote in use is inserted into quote, then the foreign key is added
+NOT VALID and committed. VALIDATE runs afterwards in its own
+autocommit_block(), so the scan of contract only holds SHARE UPDATE
+EXCLUSIVE and writes to contract are not blocked while it runs.
+
+Changes:
+1. Inserts missing quote rows from contract.quote_name
+2. Adds foreign key contract.quote_name -> quote.name
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '018'
+down_revision: Union[str, None] = '017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        INSERT INTO quote (name)
+        SELECT DISTINCT quote_name FROM contract
+        ON CONFLICT DO NOTHING;
+    """))
+
+    op.execute(sa.text("""
+        ALTER TABLE contract
+        ADD CONSTRAINT contract_quote_name_fkey
+        FOREIGN KEY (quote_name) REFERENCES quote (name) NOT VALID;
+    """))
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("ALTER TABLE contract VALIDATE CONSTRAINT contract_quote_name_fkey;"))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("ALTER TABLE contract DROP CONSTRAINT IF EXISTS contract_quote_name_fkey;"))
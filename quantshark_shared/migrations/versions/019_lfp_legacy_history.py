@@ -0,0 +1,313 @@
+"""Union legacy lfp history into lfp_smart and lfp_series
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-18 19:05:37.412960
+
+010 keeps live aggregate history older than raw retention in
+lfp_1hour_history and lfp_1day_history, plain tables outside the aggregate
+hierarchy (legacy rows have an average but no sum or count). This adds them
+to the tiered readers. History buckets all precede the rows the hierarchy
+materializes, so the UNION ALL never returns a bucket twice.
+
+Changes:
+1. Recreates lfp_smart with lfp_1hour_history in the 7d-30d tier
+2. Recreates lfp_series with history in the 7d-30d and 30d+ tiers
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '019'
+down_revision: Union[str, None] = '018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LFP_SMART_SQL = """
+    CREATE OR REPLACE VIEW lfp_smart AS
+    SELECT bucket, contract_id, avg_funding_rate
+    FROM (
+        -- Layer 1: Raw data (0-3h) - no aggregation
+        SELECT
+            timestamp AS bucket,
+            contract_id,
+            funding_rate AS avg_funding_rate
+        FROM live_funding_point
+        WHERE timestamp >= NOW() - INTERVAL '3 hours'
+
+        UNION ALL
+
+        -- Layer 2: 5min aggregates (3h-3d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '5 minutes' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_5min
+        WHERE bucket >= NOW() - INTERVAL '3 days'
+          AND bucket < NOW() - INTERVAL '3 hours'
+
+        UNION ALL
+
+        -- Layer 3: 15min aggregates (3d-7d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '15 minutes' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_15min
+        WHERE bucket >= NOW() - INTERVAL '7 days'
+          AND bucket < NOW() - INTERVAL '3 days'
+
+        UNION ALL
+
+        -- Layer 4: 1hour aggregates (7d-30d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '1 hour' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_1hour
+        WHERE bucket >= NOW() - INTERVAL '30 days'
+          AND bucket < NOW() - INTERVAL '7 days'
+
+        UNION ALL
+
+        -- Layer 4 history: legacy 1hour rows older than the hierarchy
+        SELECT
+            bucket + INTERVAL '1 hour' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_1hour_history
+        WHERE bucket >= NOW() - INTERVAL '30 days'
+          AND bucket < NOW() - INTERVAL '7 days'
+    ) combined
+    ORDER BY bucket, contract_id;
+"""
+
+# 010's definition, restored on downgrade
+PREVIOUS_LFP_SMART_SQL = """
+    CREATE OR REPLACE VIEW lfp_smart AS
+    SELECT bucket, contract_id, avg_funding_rate
+    FROM (
+        -- Layer 1: Raw data (0-3h) - no aggregation
+        SELECT
+            timestamp AS bucket,
+            contract_id,
+            funding_rate AS avg_funding_rate
+        FROM live_funding_point
+        WHERE timestamp >= NOW() - INTERVAL '3 hours'
+
+        UNION ALL
+
+        -- Layer 2: 5min aggregates (3h-3d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '5 minutes' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_5min
+        WHERE bucket >= NOW() - INTERVAL '3 days'
+          AND bucket < NOW() - INTERVAL '3 hours'
+
+        UNION ALL
+
+        -- Layer 3: 15min aggregates (3d-7d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '15 minutes' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_15min
+        WHERE bucket >= NOW() - INTERVAL '7 days'
+          AND bucket < NOW() - INTERVAL '3 days'
+
+        UNION ALL
+
+        -- Layer 4: 1hour aggregates (7d-30d) - shifted to interval end
+        SELECT
+            bucket + INTERVAL '1 hour' AS bucket,
+            contract_id,
+            avg_funding_rate
+        FROM lfp_1hour
+        WHERE bucket >= NOW() - INTERVAL '30 days'
+          AND bucket < NOW() - INTERVAL '7 days'
+    ) combined
+    ORDER BY bucket, contract_id;
+"""
+
+LFP_SERIES_SQL = """
+    CREATE OR REPLACE FUNCTION lfp_series(
+        p_contract_ids UUID[],
+        p_from TIMESTAMP,
+        p_to TIMESTAMP
+    )
+    RETURNS TABLE (bucket TIMESTAMP, contract_id UUID, avg_funding_rate DOUBLE PRECISION)
+    AS $$
+        SELECT bucket, contract_id, avg_funding_rate
+        FROM (
+            -- Layer 1: Raw data (0-3h) - no aggregation
+            SELECT
+                lfp.timestamp AS bucket,
+                lfp.contract_id,
+                lfp.funding_rate AS avg_funding_rate
+            FROM live_funding_point lfp
+            WHERE lfp.contract_id = ANY(p_contract_ids)
+              AND lfp.timestamp >= GREATEST(p_from, NOW()::TIMESTAMP - INTERVAL '3 hours')
+              AND lfp.timestamp < p_to
+
+            UNION ALL
+
+            -- Layer 2: 5min aggregates (3h-3d) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '5 minutes',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM lfp_5min a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= GREATEST(p_from - INTERVAL '5 minutes',
+                                       NOW()::TIMESTAMP - INTERVAL '3 days')
+              AND a.bucket < LEAST(p_to - INTERVAL '5 minutes',
+                                   NOW()::TIMESTAMP - INTERVAL '3 hours')
+
+            UNION ALL
+
+            -- Layer 3: 15min aggregates (3d-7d) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '15 minutes',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM lfp_15min a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= GREATEST(p_from - INTERVAL '15 minutes',
+                                       NOW()::TIMESTAMP - INTERVAL '7 days')
+              AND a.bucket < LEAST(p_to - INTERVAL '15 minutes',
+                                   NOW()::TIMESTAMP - INTERVAL '3 days')
+
+            UNION ALL
+
+            -- Layer 4: 1hour aggregates and history (7d-30d) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '1 hour',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM (
+                SELECT bucket, contract_id, avg_funding_rate FROM lfp_1hour
+                UNION ALL
+                SELECT bucket, contract_id, avg_funding_rate FROM lfp_1hour_history
+            ) a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= GREATEST(p_from - INTERVAL '1 hour',
+                                       NOW()::TIMESTAMP - INTERVAL '30 days')
+              AND a.bucket < LEAST(p_to - INTERVAL '1 hour',
+                                   NOW()::TIMESTAMP - INTERVAL '7 days')
+
+            UNION ALL
+
+            -- Layer 5: 1day aggregates and history (30d+) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '1 day',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM (
+                SELECT bucket, contract_id, avg_funding_rate FROM lfp_1day
+                UNION ALL
+                SELECT bucket, contract_id, avg_funding_rate FROM lfp_1day_history
+            ) a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= p_from - INTERVAL '1 day'
+              AND a.bucket < LEAST(p_to - INTERVAL '1 day',
+                                   NOW()::TIMESTAMP - INTERVAL '30 days')
+        ) combined
+        ORDER BY bucket, contract_id;
+    $$ LANGUAGE sql STABLE;
+"""
+
+# 009's definition, restored on downgrade
+PREVIOUS_LFP_SERIES_SQL = """
+    CREATE OR REPLACE FUNCTION lfp_series(
+        p_contract_ids UUID[],
+        p_from TIMESTAMP,
+        p_to TIMESTAMP
+    )
+    RETURNS TABLE (bucket TIMESTAMP, contract_id UUID, avg_funding_rate DOUBLE PRECISION)
+    AS $$
+        SELECT bucket, contract_id, avg_funding_rate
+        FROM (
+            -- Layer 1: Raw data (0-3h) - no aggregation
+            SELECT
+                lfp.timestamp AS bucket,
+                lfp.contract_id,
+                lfp.funding_rate AS avg_funding_rate
+            FROM live_funding_point lfp
+            WHERE lfp.contract_id = ANY(p_contract_ids)
+              AND lfp.timestamp >= GREATEST(p_from, NOW()::TIMESTAMP - INTERVAL '3 hours')
+              AND lfp.timestamp < p_to
+
+            UNION ALL
+
+            -- Layer 2: 5min aggregates (3h-3d) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '5 minutes',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM lfp_5min a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= GREATEST(p_from - INTERVAL '5 minutes',
+                                       NOW()::TIMESTAMP - INTERVAL '3 days')
+              AND a.bucket < LEAST(p_to - INTERVAL '5 minutes',
+                                   NOW()::TIMESTAMP - INTERVAL '3 hours')
+
+            UNION ALL
+
+            -- Layer 3: 15min aggregates (3d-7d) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '15 minutes',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM lfp_15min a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= GREATEST(p_from - INTERVAL '15 minutes',
+                                       NOW()::TIMESTAMP - INTERVAL '7 days')
+              AND a.bucket < LEAST(p_to - INTERVAL '15 minutes',
+                                   NOW()::TIMESTAMP - INTERVAL '3 days')
+
+            UNION ALL
+
+            -- Layer 4: 1hour aggregates (7d-30d) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '1 hour',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM lfp_1hour a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= GREATEST(p_from - INTERVAL '1 hour',
+                                       NOW()::TIMESTAMP - INTERVAL '30 days')
+              AND a.bucket < LEAST(p_to - INTERVAL '1 hour',
+                                   NOW()::TIMESTAMP - INTERVAL '7 days')
+
+            UNION ALL
+
+            -- Layer 5: 1day aggregates (30d+) - shifted to interval end
+            SELECT
+                a.bucket + INTERVAL '1 day',
+                a.contract_id,
+                a.avg_funding_rate
+            FROM lfp_1day a
+            WHERE a.contract_id = ANY(p_contract_ids)
+              AND a.bucket >= p_from - INTERVAL '1 day'
+              AND a.bucket < LEAST(p_to - INTERVAL '1 day',
+                                   NOW()::TIMESTAMP - INTERVAL '30 days')
+        ) combined
+        ORDER BY bucket, contract_id;
+    $$ LANGUAGE sql STABLE;
+"""
+
+
+def upgrade() -> None:
+    op.execute(sa.text(LFP_SMART_SQL))
+    op.execute(sa.text(LFP_SERIES_SQL))
+
+
+def downgrade() -> None:
+    op.execute(sa.text(PREVIOUS_LFP_SERIES_SQL))
+    op.execute(sa.text(PREVIOUS_LFP_SMART_SQL))
@@ -5,7 +5,9 @@ from quantshark_shared.models.base import BaseFundingPoint, NameModel, UUIDModel
 from quantshark_shared.models.contract import Contract
 from quantshark_shared.models.historical_funding_point import HistoricalFundingPoint
 from quantshark_shared.models.live_funding_point import LiveFundingPoint
+from quantshark_shared.models.loading import LOADER_PROFILES, LoaderProfileName, loader_profile
 from quantshark_shared.models.quote import Quote
+from quantshark_shared.models.records import FundingPointBatch, FundingPointRecord
 from quantshark_shared.models.section import Section
 
 __all__ = [
@@ -20,4 +22,11 @@ __all__ = [
     "Contract",
     "HistoricalFundingPoint",
     "LiveFundingPoint",
+    # Lightweight records
+    "FundingPointRecord",
+    "FundingPointBatch",
+    # Loader profiles
+    "LOADER_PROFILES",
+    "LoaderProfileName",
+    "loader_profile",
 ]
@@ -14,7 +14,7 @@ class Asset(NameModel, table=True):
     contracts: list["Contract"] = Relationship(
         back_populates="asset",
         sa_relationship_kwargs={
-            "lazy": "selectin",
+            "lazy": "select",
         },
     )
 
@@ -14,7 +14,7 @@ class Contract(UUIDModel, table=True):
     asset_name: str = Field(foreign_key="asset.name")
     section_name: str = Field(foreign_key="section.name")
     funding_interval: int
-    quote_name: str = Field(index=True)
+    quote_name: str = Field(foreign_key="quote.name", index=True)
     synced: bool = Field(default=False)
     special_fields: dict[str, Any] = Field(
         default_factory=dict, sa_column=Column(JSON, server_default="{}")
@@ -24,13 +24,13 @@ class Contract(UUIDModel, table=True):
     asset: "Asset" = Relationship(
         back_populates="contracts",
         sa_relationship_kwargs={
-            "lazy": "selectin",
+            "lazy": "select",
         },
     )
     section: "Section" = Relationship(
         back_populates="contracts",
         sa_relationship_kwargs={
-            "lazy": "selectin",
+            "lazy": "select",
         },
     )
 
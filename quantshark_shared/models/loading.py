@@ -0,0 +1,56 @@
+"""Named loader profiles for model relationships.
+
+Relationships are not loaded eagerly, and AsyncSession cannot lazy load them on
+attribute access. Apply the profile matching what the caller reads:
+
+    select(Contract).options(*loader_profile("contract_with_asset"))
+"""
+
+from __future__ import annotations
+
+from typing import Any, Literal
+
+from sqlalchemy.orm import QueryableAttribute, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlmodel import SQLModel
+
+from quantshark_shared.models.asset import Asset
+from quantshark_shared.models.contract import Contract
+from quantshark_shared.models.section import Section
+
+LoaderProfileName = Literal[
+    "contract_with_asset",
+    "contract_with_section",
+    "contract_full",
+    "asset_with_contracts",
+    "section_with_contracts",
+    "section_full",
+]
+
+
+def _relationship(model: type[SQLModel], key: str) -> QueryableAttribute[Any]:
+    # SQLModel types relationship attributes as the related model, not as attributes
+    return getattr(model, key)
+
+
+# Many-to-one sides are joined into the same SELECT, collections use one SELECT IN each
+LOADER_PROFILES: dict[LoaderProfileName, tuple[LoaderOption, ...]] = {
+    "contract_with_asset": (joinedload(_relationship(Contract, "asset")),),
+    "contract_with_section": (joinedload(_relationship(Contract, "section")),),
+    "contract_full": (
+        joinedload(_relationship(Contract, "asset")),
+        joinedload(_relationship(Contract, "section")),
+    ),
+    "asset_with_contracts": (selectinload(_relationship(Asset, "contracts")),),
+    "section_with_contracts": (selectinload(_relationship(Section, "contracts")),),
+    "section_full": (
+        selectinload(_relationship(Section, "contracts")).joinedload(
+            _relationship(Contract, "asset")
+        ),
+    ),
+}
+
+
+def loader_profile(name: LoaderProfileName) -> tuple[LoaderOption, ...]:
+    """Return the loader options of a named profile, for ``select(...).options(*...)``."""
+    return LOADER_PROFILES[name]
@@ -0,0 +1,193 @@
+"""Lightweight funding point records for hot paths (dedup sets, bulk writes).
+
+FundingPointRecord is a plain tuple with BaseFundingPoint's identity: two records are
+equal when contract_id and timestamp match, whatever the rate, and sort by that key
+alone. A record never equals, and does not order against, a plain tuple.
+FundingPointBatch packs many points into three flat buffers (16 + 8 + 8 bytes per point).
+"""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple, TypeVar
+
+from quantshark_shared.models.base import BaseFundingPoint
+
+FundingPointModel = TypeVar("FundingPointModel", bound=BaseFundingPoint)
+
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _ordering_key(other: object) -> tuple[uuid.UUID, datetime.datetime] | None:
+    if isinstance(other, FundingPointRecord):
+        return other.key
+    if isinstance(other, tuple):
+        raise TypeError("FundingPointRecord only orders against FundingPointRecord")
+    return None
+
+
+class FundingPointRecord(NamedTuple):
+    contract_id: uuid.UUID
+    timestamp: datetime.datetime
+    funding_rate: float  # Decimal format: 0.0001 = 0.01%
+
+    @property
+    def key(self) -> tuple[uuid.UUID, datetime.datetime]:
+        return (self.contract_id, self.timestamp)
+
+    def __hash__(self) -> int:
+        return hash((self.contract_id, self.timestamp))
+
+    # Comparisons use the key only. Against plain tuples == is False and ordering raises
+    # TypeError: NotImplemented would fall back to tuple comparison including the rate.
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FundingPointRecord):
+            return self.key == other.key
+        return False if isinstance(other, tuple) else NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        if isinstance(other, FundingPointRecord):
+            return self.key != other.key
+        return True if isinstance(other, tuple) else NotImplemented
+
+    def __lt__(self, other: object) -> bool:
+        key = _ordering_key(other)
+        return NotImplemented if key is None else self.key < key
+
+    def __le__(self, other: object) -> bool:
+        key = _ordering_key(other)
+        return NotImplemented if key is None else self.key <= key
+
+    def __gt__(self, other: object) -> bool:
+        key = _ordering_key(other)
+        return NotImplemented if key is None else self.key > key
+
+    def __ge__(self, other: object) -> bool:
+        key = _ordering_key(other)
+        return NotImplemented if key is None else self.key >= key
+
+    @classmethod
+    def from_model(cls, point: BaseFundingPoint) -> FundingPointRecord:
+        return cls(point.contract_id, point.timestamp, point.funding_rate)
+
+    def to_model(self, model: type[FundingPointModel]) -> FundingPointModel:
+        return model(
+            contract_id=self.contract_id,
+            timestamp=self.timestamp,
+            funding_rate=self.funding_rate,
+        )
+
+
+def _to_micros(timestamp: datetime.datetime) -> int:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(datetime.UTC).replace(tzinfo=None)
+    return (timestamp - EPOCH) // MICROSECOND
+
+
+class FundingPointBatch:
+    """Append-only packed funding points; iterates as FundingPointRecord.
+
+    Timestamps are stored as naive UTC microseconds (aware datetimes are converted),
+    matching the TIMESTAMP columns of the funding hypertables.
+    """
+
+    __slots__ = ("_contract_ids", "_funding_rates", "_timestamps")
+
+    def __init__(
+        self,
+        points: Iterable[FundingPointRecord | tuple[uuid.UUID, datetime.datetime, float]] = (),
+    ) -> None:
+        self._contract_ids = bytearray()
+        self._timestamps = array("q")
+        self._funding_rates = array("d")
+        self.extend(points)
+
+    @classmethod
+    def from_models(cls, points: Iterable[BaseFundingPoint]) -> FundingPointBatch:
+        return cls((point.contract_id, point.timestamp, point.funding_rate) for point in points)
+
+    def append(
+        self,
+        contract_id: uuid.UUID,
+        timestamp: datetime.datetime,
+        funding_rate: float,
+    ) -> None:
+        self._contract_ids += contract_id.bytes
+        self._timestamps.append(_to_micros(timestamp))
+        self._funding_rates.append(funding_rate)
+
+    def extend(
+        self,
+        points: Iterable[FundingPointRecord | tuple[uuid.UUID, datetime.datetime, float]],
+    ) -> None:
+        for contract_id, timestamp, funding_rate in points:
+            self.append(contract_id, timestamp, funding_rate)
+
+    def __len__(self) -> int:
+        return len(self._funding_rates)
+
+    def __getitem__(self, index: int) -> FundingPointRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FundingPointBatch index out of range")
+        return FundingPointRecord(
+            uuid.UUID(bytes=bytes(self._contract_ids[index * 16 : index * 16 + 16])),
+            EPOCH + self._timestamps[index] * MICROSECOND,
+            self._funding_rates[index],
+        )
+
+    def __iter__(self) -> Iterator[FundingPointRecord]:
+        contract_ids = memoryview(self._contract_ids)
+        for index, (micros, funding_rate) in enumerate(
+            zip(self._timestamps, self._funding_rates, strict=True)
+        ):
+            yield FundingPointRecord(
+                uuid.UUID(bytes=bytes(contract_ids[index * 16 : index * 16 + 16])),
+                EPOCH + micros * MICROSECOND,
+                funding_rate,
+            )
+
+    @property
+    def contract_id_bytes(self) -> memoryview:
+        """Packed 16-byte contract ids (read-only view)."""
+        return memoryview(self._contract_ids).toreadonly()
+
+    @property
+    def timestamps_us(self) -> array[int]:
+        """Naive UTC timestamps as Unix microseconds."""
+        return self._timestamps
+
+    @property
+    def funding_rates(self) -> array[float]:
+        return self._funding_rates
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            len(self._contract_ids)
+            + self._timestamps.itemsize * len(self._timestamps)
+            + self._funding_rates.itemsize * len(self._funding_rates)
+        )
+
+    def deduplicated(self) -> FundingPointBatch:
+        """Return a batch with one point per (contract_id, timestamp), last one winning,
+        in order of first occurrence."""
+        contract_ids = bytes(self._contract_ids)
+        latest: dict[tuple[bytes, int], int] = {}
+        for index, micros in enumerate(self._timestamps):
+            latest[(contract_ids[index * 16 : index * 16 + 16], micros)] = index
+
+        batch = FundingPointBatch()
+        for (contract_id, micros), index in latest.items():
+            batch._contract_ids += contract_id
+            batch._timestamps.append(micros)
+            batch._funding_rates.append(self._funding_rates[index])
+        return batch
+
+    def to_models(self, model: type[FundingPointModel]) -> list[FundingPointModel]:
+        return [record.to_model(model) for record in self]
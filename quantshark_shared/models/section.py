@@ -17,6 +17,6 @@ class Section(NameModel, table=True):
     contracts: list["Contract"] = Relationship(
         back_populates="section",
         sa_relationship_kwargs={
-            "lazy": "selectin",
+            "lazy": "select",
         },
     )
@@ -0,0 +1,57 @@
+"""Read paths for funding and contract data."""
+
+from quantshark_shared.queries.contract_search import (
+    CONTRACT_SEARCH_SQL,
+    ContractSearchHit,
+    search_contracts,
+    search_contracts_batch,
+)
+from quantshark_shared.queries.funding_latest import (
+    LATEST_FUNDING_SQL,
+    LatestFunding,
+    get_latest_funding,
+)
+from quantshark_shared.queries.funding_series import (
+    FUNDING_SERIES_SQL,
+    FundingSeriesPoint,
+    get_funding_series,
+)
+from quantshark_shared.queries.historical_rollups import (
+    HISTORICAL_ROLLUPS,
+    HistoricalFundingBucket,
+    RollupGranularity,
+    get_historical_rollup,
+)
+from quantshark_shared.queries.streaming import (
+    TimeWindow,
+    WindowSpec,
+    chunk_windows,
+    fixed_windows,
+    iter_csv,
+    iter_ndjson,
+    stream_funding_points,
+)
+
+__all__ = [
+    "CONTRACT_SEARCH_SQL",
+    "ContractSearchHit",
+    "FUNDING_SERIES_SQL",
+    "FundingSeriesPoint",
+    "HISTORICAL_ROLLUPS",
+    "HistoricalFundingBucket",
+    "LATEST_FUNDING_SQL",
+    "LatestFunding",
+    "RollupGranularity",
+    "TimeWindow",
+    "WindowSpec",
+    "chunk_windows",
+    "fixed_windows",
+    "get_funding_series",
+    "get_historical_rollup",
+    "get_latest_funding",
+    "iter_csv",
+    "iter_ndjson",
+    "search_contracts",
+    "search_contracts_batch",
+    "stream_funding_points",
+]
@@ -0,0 +1,49 @@
+"""Typed access to the search_contracts ranked contract search."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+CONTRACT_SEARCH_SQL = text(
+    """
+    SELECT query_index, contract_id, score, rank
+    FROM search_contracts(CAST(:queries AS TEXT[]), :limit);
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ContractSearchHit:
+    contract_id: uuid.UUID
+    score: int  # sum over query tokens of match_quality's best field tier
+    rank: int  # 1-based
+
+
+async def search_contracts_batch(
+    session: AsyncSession,
+    queries: Sequence[str],
+    limit: int = 20,
+) -> list[list[ContractSearchHit]]:
+    """Resolve many search queries in one round trip; results align with queries."""
+    if not queries:
+        return []
+
+    result = await session.execute(CONTRACT_SEARCH_SQL, {"queries": list(queries), "limit": limit})
+    hits: list[list[ContractSearchHit]] = [[] for _ in queries]
+    for query_index, contract_id, score, rank in result.tuples():
+        hits[query_index - 1].append(ContractSearchHit(contract_id, score, rank))
+    return hits
+
+
+async def search_contracts(
+    session: AsyncSession,
+    query: str,
+    limit: int = 20,
+) -> list[ContractSearchHit]:
+    """Return the best matching contracts for query, best first."""
+    return (await search_contracts_batch(session, [query], limit))[0]
@@ -0,0 +1,78 @@
+"""Typed access to the funding_latest snapshot (newest point per contract)."""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+LATEST_FUNDING_COLUMNS = """
+    contract_id, asset_name, section_name, quote_name, funding_interval,
+    live_timestamp, live_funding_rate,
+    live_rate_1h, live_rate_8h, live_rate_1d, live_rate_365d,
+    historical_timestamp, historical_funding_rate,
+    historical_rate_1h, historical_rate_8h, historical_rate_1d, historical_rate_365d,
+    updated_at
+"""
+
+LATEST_FUNDING_SQL = text(
+    f"""
+    SELECT {LATEST_FUNDING_COLUMNS}
+    FROM funding_latest_enriched
+    ORDER BY asset_name, section_name, quote_name;
+    """
+)
+
+LATEST_FUNDING_BY_ID_SQL = text(
+    f"""
+    SELECT {LATEST_FUNDING_COLUMNS}
+    FROM funding_latest_enriched
+    WHERE contract_id = ANY(CAST(:contract_ids AS UUID[]))
+    ORDER BY asset_name, section_name, quote_name;
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class LatestFunding:
+    contract_id: uuid.UUID
+    asset_name: str
+    section_name: str
+    quote_name: str
+    funding_interval: int  # hours
+    live_timestamp: datetime.datetime | None
+    live_funding_rate: float | None
+    live_rate_1h: float | None
+    live_rate_8h: float | None
+    live_rate_1d: float | None
+    live_rate_365d: float | None
+    historical_timestamp: datetime.datetime | None
+    historical_funding_rate: float | None
+    historical_rate_1h: float | None
+    historical_rate_8h: float | None
+    historical_rate_1d: float | None
+    historical_rate_365d: float | None
+    updated_at: datetime.datetime
+
+
+async def get_latest_funding(
+    session: AsyncSession,
+    contract_ids: Sequence[uuid.UUID] | None = None,
+) -> list[LatestFunding]:
+    """Return the newest live and historical rate per contract, raw and normalized.
+
+    Without contract_ids every non-deprecated contract with funding data is returned.
+    """
+    if contract_ids is None:
+        result = await session.execute(LATEST_FUNDING_SQL)
+    elif not contract_ids:
+        return []
+    else:
+        result = await session.execute(
+            LATEST_FUNDING_BY_ID_SQL, {"contract_ids": list(contract_ids)}
+        )
+    return [LatestFunding(*row) for row in result.tuples()]
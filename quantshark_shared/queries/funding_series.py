@@ -0,0 +1,43 @@
+"""Typed access to the lfp_series tiered funding function."""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+FUNDING_SERIES_SQL = text(
+    """
+    SELECT bucket, contract_id, avg_funding_rate
+    FROM lfp_series(CAST(:contract_ids AS UUID[]), :start, :end);
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FundingSeriesPoint:
+    bucket: datetime.datetime  # end of the aggregation interval
+    contract_id: uuid.UUID
+    avg_funding_rate: float
+
+
+async def get_funding_series(
+    session: AsyncSession,
+    contract_ids: Sequence[uuid.UUID],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> list[FundingSeriesPoint]:
+    """Return the tiered live funding series for contracts in [start, end), ordered by
+    bucket and contract_id."""
+    if not contract_ids:
+        return []
+
+    result = await session.execute(
+        FUNDING_SERIES_SQL,
+        {"contract_ids": list(contract_ids), "start": start, "end": end},
+    )
+    return [FundingSeriesPoint(*row) for row in result.tuples()]
@@ -0,0 +1,62 @@
+"""Typed access to the hfp_* historical funding rollups."""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+RollupGranularity = Literal["1d", "7d", "1M"]
+
+HISTORICAL_ROLLUPS: dict[RollupGranularity, str] = {
+    "1d": "hfp_1day",
+    "7d": "hfp_7day",
+    "1M": "hfp_1month",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class HistoricalFundingBucket:
+    bucket: datetime.datetime  # start of the bucket
+    contract_id: uuid.UUID
+    sum_funding_rate: float  # realized funding over the bucket
+    point_count: int
+    avg_funding_rate: float
+    rate_1h: float
+    rate_8h: float
+    rate_1d: float
+    rate_365d: float  # APR
+
+
+async def get_historical_rollup(
+    session: AsyncSession,
+    contract_ids: Sequence[uuid.UUID],
+    start: datetime.datetime,
+    end: datetime.datetime,
+    granularity: RollupGranularity = "1d",
+) -> list[HistoricalFundingBucket]:
+    """Return normalized historical funding buckets starting in [start, end), ordered by
+    bucket and contract_id."""
+    if not contract_ids:
+        return []
+
+    view_name = HISTORICAL_ROLLUPS[granularity]
+    result = await session.execute(
+        text(
+            f"""
+            SELECT bucket, contract_id, sum_funding_rate, point_count, avg_funding_rate,
+                   rate_1h, rate_8h, rate_1d, rate_365d
+            FROM {view_name}
+            WHERE contract_id = ANY(CAST(:contract_ids AS UUID[]))
+              AND bucket >= :start AND bucket < :end
+            ORDER BY bucket, contract_id;
+            """
+        ),
+        {"contract_ids": list(contract_ids), "start": start, "end": end},
+    )
+    return [HistoricalFundingBucket(*row) for row in result.tuples()]
@@ -0,0 +1,154 @@
+"""Streaming reads of large funding point ranges with NDJSON/CSV sinks."""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import io
+import json
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from typing import Literal
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col
+
+from quantshark_shared.models.base import BaseFundingPoint
+from quantshark_shared.models.records import FundingPointRecord
+
+TimeWindow = tuple[datetime.datetime, datetime.datetime]
+WindowSpec = datetime.timedelta | Literal["chunks"] | None
+
+DEFAULT_BATCH_SIZE = 10_000
+CSV_HEADER = ("contract_id", "timestamp", "funding_rate")
+
+# The view casts TIMESTAMP chunk bounds to timestamptz in the session TimeZone. Casting
+# back in the same session compares them in the column's own type; connections from
+# DBSettings pin TimeZone to UTC, where the round trip is exact (no DST gaps).
+CHUNK_RANGES_SQL = text(
+    """
+    SELECT range_start, range_end
+    FROM (
+        SELECT range_start::TIMESTAMP AS range_start, range_end::TIMESTAMP AS range_end
+        FROM timescaledb_information.chunks
+        WHERE hypertable_name = :hypertable
+    ) AS c
+    WHERE range_end > CAST(:start AS TIMESTAMP)
+      AND range_start < CAST(:end AS TIMESTAMP)
+    ORDER BY range_start;
+    """
+)
+
+
+def fixed_windows(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    step: datetime.timedelta,
+) -> list[TimeWindow]:
+    windows: list[TimeWindow] = []
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + step, end)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+async def chunk_windows(
+    session: AsyncSession,
+    model: type[BaseFundingPoint],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> list[TimeWindow]:
+    """Return the hypertable's chunk ranges overlapping [start, end), clipped to it.
+    Ranges without chunks hold no rows and are skipped."""
+    result = await session.execute(
+        CHUNK_RANGES_SQL,
+        {"hypertable": model.__tablename__, "start": start, "end": end},
+    )
+    return [
+        (max(range_start, start), min(range_end, end))
+        for range_start, range_end in result.tuples()
+    ]
+
+
+async def stream_funding_points(
+    session: AsyncSession,
+    model: type[BaseFundingPoint],
+    start: datetime.datetime,
+    end: datetime.datetime,
+    contract_ids: Sequence[uuid.UUID] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    window: WindowSpec = None,
+) -> AsyncIterator[list[FundingPointRecord]]:
+    """Yield funding points in [start, end) (naive UTC) in batches of at most batch_size,
+    ordered by timestamp and contract_id.
+
+    Rows come from a server-side cursor, so memory stays flat however large the range.
+    ``window`` splits the range into one query per fixed step or per hypertable chunk
+    ("chunks"), which bounds the server-side sort to one window at a time.
+
+    The session must not be used for anything else until the iterator is exhausted.
+    """
+    if window is None:
+        windows = [(start, end)]
+    elif window == "chunks":
+        windows = await chunk_windows(session, model, start, end)
+    else:
+        windows = fixed_windows(start, end, window)
+
+    contract_id = col(model.contract_id)
+    timestamp = col(model.timestamp)
+    for window_start, window_end in windows:
+        statement = (
+            select(contract_id, timestamp, col(model.funding_rate))
+            .where(timestamp >= window_start, timestamp < window_end)
+            .order_by(timestamp, contract_id)
+        )
+        if contract_ids is not None:
+            statement = statement.where(contract_id.in_(contract_ids))
+
+        result = await session.stream(statement, execution_options={"yield_per": batch_size})
+        try:
+            async for rows in result.partitions():
+                yield [FundingPointRecord(*row) for row in rows]
+        finally:
+            await result.close()
+
+
+async def iter_ndjson(
+    batches: AsyncIterable[Sequence[FundingPointRecord]],
+) -> AsyncIterator[bytes]:
+    """Encode streamed batches as newline-delimited JSON, one chunk per batch."""
+    async for batch in batches:
+        yield "".join(
+            json.dumps(
+                {
+                    "contract_id": str(record.contract_id),
+                    "timestamp": record.timestamp.isoformat(),
+                    "funding_rate": record.funding_rate,
+                },
+                separators=(",", ":"),
+            )
+            + "\n"
+            for record in batch
+        ).encode()
+
+
+async def iter_csv(batches: AsyncIterable[Sequence[FundingPointRecord]]) -> AsyncIterator[bytes]:
+    """Encode streamed batches as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    async for batch in batches:
+        writer.writerows(
+            (record.contract_id, record.timestamp.isoformat(), record.funding_rate)
+            for record in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():  # header only: the range was empty
+        yield buffer.getvalue().encode()
@@ -1,7 +1,12 @@
 """Shared settings models."""
 
-from quantshark_shared.settings.db import DBSettings
+from quantshark_shared.settings.db import DBSettings, get_db_settings
+from quantshark_shared.settings.engine import dispose_engines, get_engine, get_sessionmaker
 
 __all__ = [
     "DBSettings",
+    "dispose_engines",
+    "get_db_settings",
+    "get_engine",
+    "get_sessionmaker",
 ]
@@ -1,5 +1,8 @@
 """Database settings shared across applications."""
 
+from functools import cache
+from typing import Any
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy.engine import URL
@@ -13,6 +16,7 @@ class DBSettings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,
     )
 
     host: str = Field(alias="DB_HOST")
@@ -21,6 +25,28 @@ class DBSettings(BaseSettings):
     password: str = Field(alias="DB_PASSWORD")
     dbname: str = Field(alias="DB_DBNAME")
 
+    # Engine tuning
+    pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=30.0, alias="DB_POOL_TIMEOUT")
+    pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")  # seconds, -1 disables
+    pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    statement_timeout: int = Field(default=0, alias="DB_STATEMENT_TIMEOUT")  # ms, 0 disables
+    application_name: str = Field(default="quantshark", alias="DB_APPLICATION_NAME")
+    prepare_threshold: int | None = Field(default=5, alias="DB_PREPARE_THRESHOLD")
+    # PgBouncer in transaction pooling mode: no server-side prepared statements and
+    # no startup options (set statement_timeout and timezone=UTC on the pooler or the
+    # role instead).
+    pgbouncer: bool = Field(default=False, alias="DB_PGBOUNCER")
+
+    # Query instrumentation (quantshark_shared.diagnostics), attached by get_engine()
+    instrument_queries: bool = Field(default=False, alias="DB_INSTRUMENT_QUERIES")
+    instrument_sample_rate: float = Field(default=1.0, alias="DB_INSTRUMENT_SAMPLE_RATE")
+    slow_query_ms: int = Field(default=500, alias="DB_SLOW_QUERY_MS")  # 0 disables capture
+    instrument_explain_analyze: bool = Field(
+        default=False, alias="DB_INSTRUMENT_EXPLAIN_ANALYZE"
+    )  # re-executes slow read-only statements
+
     @property
     def connection_url(self) -> str:
         """Build TimescaleDB SQLAlchemy URL."""
@@ -32,3 +58,38 @@ class DBSettings(BaseSettings):
             port=self.port,
             database=self.dbname,
         ).render_as_string(hide_password=False)
+
+    @property
+    def connect_args(self) -> dict[str, Any]:
+        """Build psycopg connect() arguments."""
+        connect_args: dict[str, Any] = {"application_name": self.application_name}
+        if self.pgbouncer:
+            connect_args["prepare_threshold"] = None
+            return connect_args
+
+        connect_args["prepare_threshold"] = self.prepare_threshold
+        # Timestamps are naive UTC throughout; timestamptz values the server derives
+        # (e.g. chunk ranges) must not shift with the server's default TimeZone
+        options = ["-c timezone=UTC"]
+        if self.statement_timeout:
+            options.append(f"-c statement_timeout={self.statement_timeout}")
+        connect_args["options"] = " ".join(options)
+        return connect_args
+
+    @property
+    def engine_kwargs(self) -> dict[str, Any]:
+        """Build create_async_engine() keyword arguments."""
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": self.connect_args,
+        }
+
+
+@cache
+def get_db_settings() -> DBSettings:
+    """Return process-wide settings, parsing the environment and .env only once."""
+    return DBSettings()  # type: ignore[call-arg]
@@ -0,0 +1,82 @@
+"""Process-wide async engine and session factory registry."""
+
+import os
+import threading
+
+import sqlalchemy_timescaledb  # noqa: F401 need for dialect registration
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from quantshark_shared.settings.db import DBSettings, get_db_settings
+
+_engines: dict[DBSettings, AsyncEngine] = {}
+_sessionmakers: dict[DBSettings, async_sessionmaker[AsyncSession]] = {}
+_lock = threading.Lock()
+
+
+def get_engine(settings: DBSettings | None = None) -> AsyncEngine:
+    """Return the shared engine for settings, creating it on first use."""
+    settings = settings or get_db_settings()
+    engine = _engines.get(settings)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _engines.get(settings)
+        if engine is None:
+            engine = create_async_engine(settings.connection_url, **settings.engine_kwargs)
+            if settings.instrument_queries:
+                _instrument(engine, settings)
+            _engines[settings] = engine
+        return engine
+
+
+def _instrument(engine: AsyncEngine, settings: DBSettings) -> None:
+    # Imported here: diagnostics depends on this module for its default engine
+    from quantshark_shared.diagnostics.instrumentation import (
+        InstrumentationConfig,
+        instrument_engine,
+    )
+
+    instrument_engine(engine, InstrumentationConfig.from_settings(settings))
+
+
+def get_sessionmaker(settings: DBSettings | None = None) -> async_sessionmaker[AsyncSession]:
+    """Return the shared session factory bound to the engine for settings."""
+    settings = settings or get_db_settings()
+    sessionmaker = _sessionmakers.get(settings)
+    if sessionmaker is not None:
+        return sessionmaker
+
+    engine = get_engine(settings)
+    with _lock:
+        sessionmaker = _sessionmakers.get(settings)
+        if sessionmaker is None:
+            sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+            _sessionmakers[settings] = sessionmaker
+        return sessionmaker
+
+
+async def dispose_engines() -> None:
+    """Dispose every registered engine and clear the registry."""
+    with _lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _sessionmakers.clear()
+
+    for engine in engines:
+        await engine.dispose()
+
+
+def _reset_pools_after_fork() -> None:
+    # Connections inherited from the parent belong to it: drop them without closing,
+    # so the child opens its own and the parent's sockets stay intact.
+    for engine in _engines.values():
+        engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
@@ -2,22 +2,74 @@
 
 from quantshark_shared.testing.db import (
     DEFAULT_TIMESCALE_IMAGE,
+    TEMPLATE_DATABASE,
+    TEST_DB_URL_ENV,
     DatabaseConfig,
+    IsolationMode,
+    QueryLog,
+    admin_connection,
     apply_alembic_migrations,
     build_db_url,
+    count_queries,
+    create_database,
+    create_template_database,
+    database_environment,
+    drop_database,
     parse_container_url,
     refresh_materialized_views,
+    reset_database,
     timescaledb_container,
     truncate_all_tables,
 )
+from quantshark_shared.testing.startup import (
+    REUSE_CONTAINER_ENV,
+    StartupPhase,
+    drop_stale_templates,
+    migration_key,
+    reusable_timescaledb_container,
+    startup_phase,
+    template_in_use,
+    template_name,
+)
+from quantshark_shared.testing.synthetic import (
+    DATASETS,
+    SyntheticContract,
+    SyntheticDataset,
+    SyntheticSummary,
+    generate_dataset,
+)
 
 __all__ = [
+    "DATASETS",
     "DEFAULT_TIMESCALE_IMAGE",
+    "REUSE_CONTAINER_ENV",
+    "TEMPLATE_DATABASE",
+    "TEST_DB_URL_ENV",
     "DatabaseConfig",
+    "IsolationMode",
+    "QueryLog",
+    "StartupPhase",
+    "SyntheticContract",
+    "SyntheticDataset",
+    "SyntheticSummary",
+    "admin_connection",
     "apply_alembic_migrations",
     "build_db_url",
+    "count_queries",
+    "create_database",
+    "create_template_database",
+    "database_environment",
+    "drop_database",
+    "drop_stale_templates",
+    "generate_dataset",
+    "migration_key",
     "parse_container_url",
     "refresh_materialized_views",
+    "reset_database",
+    "reusable_timescaledb_container",
+    "startup_phase",
+    "template_in_use",
+    "template_name",
     "timescaledb_container",
     "truncate_all_tables",
 ]
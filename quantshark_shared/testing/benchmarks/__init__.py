@@ -0,0 +1 @@
+"""Benchmarks for the shared data layer, run against a migrated TimescaleDB container."""
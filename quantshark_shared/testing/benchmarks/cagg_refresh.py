@@ -0,0 +1,131 @@
+"""Continuous aggregate refresh duration: flat (rev 009) vs hierarchical (rev 010) tiers.
+
+Each run seeds raw live funding data, materializes every tier, rewrites the last days
+of raw data (an outage backfill) and times the refresh of each tier over its policy
+window and over the whole rewritten range.
+
+Usage: python -m quantshark_shared.testing.benchmarks.cagg_refresh [--contracts N] [--days N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import time
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from quantshark_shared.testing.benchmarks.common import (
+    migrated_database,
+    pause_background_jobs,
+    refresh_continuous_aggregates,
+    seed_contracts,
+    seed_funding_points,
+)
+from quantshark_shared.testing.db import apply_alembic_migrations
+
+LIVE_AGGREGATES = ("lfp_5min", "lfp_15min", "lfp_1hour", "lfp_1day")
+POLICY_WINDOWS = {
+    "lfp_5min": (datetime.timedelta(hours=3), datetime.timedelta(minutes=5)),
+    "lfp_15min": (datetime.timedelta(hours=12), datetime.timedelta(minutes=15)),
+    "lfp_1hour": (datetime.timedelta(days=2), datetime.timedelta(hours=1)),
+    "lfp_1day": (datetime.timedelta(days=3), datetime.timedelta(days=1)),
+}
+OUTAGE = datetime.timedelta(days=3)
+
+
+async def _timed_refresh(
+    engine: AsyncEngine,
+    view_name: str,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> float:
+    started = time.perf_counter()
+    await refresh_continuous_aggregates(engine, [view_name], start, end)
+    return (time.perf_counter() - started) * 1000
+
+
+async def _rewrite_raw(engine: AsyncEngine, since: datetime.datetime) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                """
+                UPDATE live_funding_point SET funding_rate = funding_rate * 1.01
+                WHERE timestamp >= :since;
+                """
+            ),
+            {"since": since},
+        )
+
+
+async def _refresh_timings(engine: AsyncEngine, now: datetime.datetime) -> dict[str, Any]:
+    await pause_background_jobs(engine)
+    await refresh_continuous_aggregates(engine, LIVE_AGGREGATES, None, now)
+
+    await _rewrite_raw(engine, now - OUTAGE)
+    policy_ms: dict[str, float] = {}
+    for view_name in LIVE_AGGREGATES:
+        start_offset, end_offset = POLICY_WINDOWS[view_name]
+        policy_ms[view_name] = await _timed_refresh(
+            engine, view_name, now - start_offset, now - end_offset
+        )
+
+    await _rewrite_raw(engine, now - OUTAGE)
+    backfill_ms: dict[str, float] = {}
+    for view_name in LIVE_AGGREGATES:
+        backfill_ms[view_name] = await _timed_refresh(engine, view_name, now - OUTAGE, now)
+
+    return {
+        "policy_window_ms": policy_ms,
+        "outage_backfill_ms": backfill_ms,
+        "outage_backfill_total_ms": sum(backfill_ms.values()),
+    }
+
+
+async def run(db_url: str, contracts: int, days: int, step_seconds: int) -> dict[str, Any]:
+    engine = create_async_engine(db_url)
+    try:
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        await seed_contracts(engine, contracts)
+        rows = await seed_funding_points(
+            engine,
+            "live_funding_point",
+            now - datetime.timedelta(days=days),
+            now,
+            step=datetime.timedelta(seconds=step_seconds),
+        )
+        flat = await _refresh_timings(engine, now)
+
+        await engine.dispose()
+        await asyncio.to_thread(apply_alembic_migrations, "010")
+        hierarchical = await _refresh_timings(engine, now)
+    finally:
+        await engine.dispose()
+
+    return {
+        "contracts": contracts,
+        "days": days,
+        "rows": rows,
+        "flat": flat,
+        "hierarchical": hierarchical,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contracts", type=int, default=300)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--step-seconds", type=int, default=60)
+    args = parser.parse_args()
+
+    with migrated_database(revision="009") as config:
+        report = asyncio.run(run(config.url, args.contracts, args.days, args.step_seconds))
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Columnar binary COPY reads vs ORM reads of a live funding range: rows/sec and peak RSS.
+
+Each read path runs in a fresh worker process, so peak RSS is not shared between paths.
+
+Usage: python -m quantshark_shared.testing.benchmarks.columnar_reads [--contracts N] [--days N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Literal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import col
+
+from quantshark_shared.funding.columnar import read_funding_columns
+from quantshark_shared.models.live_funding_point import LiveFundingPoint
+from quantshark_shared.testing.benchmarks.common import (
+    bench_contract_ids,
+    migrated_database,
+    pause_background_jobs,
+    seed_contracts,
+    seed_funding_points,
+)
+
+ReadPath = Literal["orm", "numpy", "arrow"]
+READ_PATHS: tuple[ReadPath, ...] = ("orm", "numpy", "arrow")
+
+
+def _peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+async def _read(
+    db_url: str,
+    path: ReadPath,
+    contracts: int,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> dict[str, Any]:
+    engine = create_async_engine(db_url)
+    try:
+        ids = await bench_contract_ids(engine, contracts)
+        async with async_sessionmaker(engine)() as session:
+            baseline_mib = _peak_rss_mib()
+            started = time.perf_counter()
+            if path == "orm":
+                result = await session.execute(
+                    select(LiveFundingPoint).where(
+                        col(LiveFundingPoint.contract_id).in_(ids),
+                        col(LiveFundingPoint.timestamp) >= start,
+                        col(LiveFundingPoint.timestamp) < end,
+                    )
+                )
+                rows = len(result.scalars().all())
+            else:
+                columns = await read_funding_columns(session, "live", ids, start, end)
+                rows = len(columns.to_arrow()) if path == "arrow" else len(columns)
+            seconds = time.perf_counter() - started
+    finally:
+        await engine.dispose()
+
+    peak_mib = _peak_rss_mib()
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else 0.0,
+        "peak_rss_mib": peak_mib,
+        "rss_growth_mib": peak_mib - baseline_mib,
+    }
+
+
+def _run_worker(
+    db_url: str,
+    path: ReadPath,
+    contracts: int,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> dict[str, Any]:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "quantshark_shared.testing.benchmarks.columnar_reads",
+            "--worker",
+            path,
+            "--db-url",
+            db_url,
+            "--contracts",
+            str(contracts),
+            "--start",
+            start.isoformat(),
+            "--end",
+            end.isoformat(),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+async def _seed(db_url: str, contracts: int, days: int, step_minutes: int) -> dict[str, Any]:
+    engine = create_async_engine(db_url)
+    try:
+        await pause_background_jobs(engine)
+        end = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        start = end - datetime.timedelta(days=days)
+        await seed_contracts(engine, contracts)
+        rows = await seed_funding_points(
+            engine,
+            "live_funding_point",
+            start,
+            end,
+            step=datetime.timedelta(minutes=step_minutes),
+        )
+    finally:
+        await engine.dispose()
+    return {"rows": rows, "start": start, "end": end}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contracts", type=int, default=300)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--step-minutes", type=int, default=5)
+    parser.add_argument("--worker", choices=READ_PATHS, help=argparse.SUPPRESS)
+    parser.add_argument("--db-url", help=argparse.SUPPRESS)
+    parser.add_argument("--start", type=datetime.datetime.fromisoformat, help=argparse.SUPPRESS)
+    parser.add_argument("--end", type=datetime.datetime.fromisoformat, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        report = asyncio.run(_read(args.db_url, args.worker, args.contracts, args.start, args.end))
+        print(json.dumps(report))  # noqa: T201
+        return
+
+    with migrated_database() as config:
+        seeded = asyncio.run(_seed(config.url, args.contracts, args.days, args.step_minutes))
+        paths = {
+            path: _run_worker(config.url, path, args.contracts, seeded["start"], seeded["end"])
+            for path in READ_PATHS
+        }
+
+    report = {
+        "contracts": args.contracts,
+        "days": args.days,
+        "rows": seeded["rows"],
+        "paths": paths,
+    }
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
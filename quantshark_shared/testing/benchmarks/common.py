@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import datetime
+import os
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from quantshark_shared.testing.db import (
+    DEFAULT_TIMESCALE_IMAGE,
+    DatabaseConfig,
+    apply_alembic_migrations,
+    timescaledb_container,
+)
+
+BENCH_SECTION = "bench"
+FUNDING_INTERVALS = (1, 4, 8)
+
+
+@dataclass(frozen=True)
+class Timing:
+    runs: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+    max_ms: float
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+@contextmanager
+def migrated_database(
+    image: str = DEFAULT_TIMESCALE_IMAGE,
+    revision: str = "head",
+) -> Iterator[DatabaseConfig]:
+    with timescaledb_container(image) as config:
+        os.environ["DB_HOST"] = config.host
+        os.environ["DB_PORT"] = str(config.port)
+        os.environ["DB_USER"] = config.user
+        os.environ["DB_PASSWORD"] = config.password
+        os.environ["DB_DBNAME"] = config.dbname
+        apply_alembic_migrations(revision)
+        yield config
+
+
+async def measure(func: Callable[[], Awaitable[object]], runs: int = 10) -> Timing:
+    await func()  # warm-up
+    samples: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    return Timing(
+        runs=runs,
+        min_ms=samples[0],
+        median_ms=statistics.median(samples),
+        p95_ms=samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        max_ms=samples[-1],
+    )
+
+
+async def seed_contracts(engine: AsyncEngine, count: int) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("INSERT INTO section (name) VALUES (:name) ON CONFLICT DO NOTHING;"),
+            {"name": BENCH_SECTION},
+        )
+        await connection.execute(
+            text("INSERT INTO quote (name) VALUES ('USDT') ON CONFLICT DO NOTHING;")
+        )
+        await connection.execute(
+            text(
+                """
+                INSERT INTO asset (name)
+                SELECT 'BENCH' || i FROM generate_series(1, :count) i
+                ON CONFLICT DO NOTHING;
+                """
+            ),
+            {"count": count},
+        )
+        await connection.execute(
+            text(
+                """
+                INSERT INTO contract (asset_name, section_name, quote_name, funding_interval,
+                                      synced, deprecated)
+                SELECT 'BENCH' || i, :section, 'USDT',
+                       (CAST(:intervals AS INTEGER[]))[1 + i % :interval_count], false, false
+                FROM generate_series(1, :count) i
+                ON CONFLICT DO NOTHING;
+                """
+            ),
+            {
+                "section": BENCH_SECTION,
+                "intervals": list(FUNDING_INTERVALS),
+                "interval_count": len(FUNDING_INTERVALS),
+                "count": count,
+            },
+        )
+
+
+async def seed_funding_points(
+    engine: AsyncEngine,
+    table_name: str,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    step: datetime.timedelta,
+    seed: float = 0.42,
+) -> int:
+    async with engine.begin() as connection:
+        await connection.execute(text("SELECT setseed(:seed);"), {"seed": seed})
+        result = await connection.execute(
+            text(
+                f"""
+                INSERT INTO {table_name} (contract_id, timestamp, funding_rate)
+                SELECT c.id, ts,
+                       0.0001 * sin(extract(epoch FROM ts) / 86400.0)
+                       + 0.00005 * (random() - 0.5)
+                FROM contract c
+                CROSS JOIN generate_series(
+                    CAST(:start AS TIMESTAMP), CAST(:end AS TIMESTAMP),
+                    CAST(:step AS INTERVAL)
+                ) ts
+                WHERE c.section_name = :section
+                ON CONFLICT DO NOTHING;
+                """
+            ),
+            {"start": start, "end": end, "step": step, "section": BENCH_SECTION},
+        )
+        return result.rowcount
+
+
+async def refresh_continuous_aggregates(
+    engine: AsyncEngine,
+    view_names: Sequence[str],
+    start: datetime.datetime | None,
+    end: datetime.datetime | None,
+) -> None:
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        for view_name in view_names:
+            await autocommit.execute(
+                text(
+                    """
+                    CALL refresh_continuous_aggregate(
+                        CAST(:view_name AS REGCLASS),
+                        CAST(:start AS TIMESTAMP),
+                        CAST(:end AS TIMESTAMP)
+                    );
+                    """
+                ),
+                {"view_name": view_name, "start": start, "end": end},
+            )
+
+
+async def bench_contract_ids(engine: AsyncEngine, limit: int) -> list[uuid.UUID]:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                "SELECT id FROM contract WHERE section_name = :section ORDER BY id LIMIT :limit;"
+            ),
+            {"section": BENCH_SECTION, "limit": limit},
+        )
+        return list(result.scalars())
+
+
+async def pause_background_jobs(engine: AsyncEngine) -> None:
+    """Unschedule policy jobs so retention/compression/refresh don't race a benchmark."""
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                """
+                SELECT alter_job(job_id, scheduled => false)
+                FROM timescaledb_information.jobs
+                WHERE proc_schema = '_timescaledb_functions' AND proc_name LIKE 'policy_%';
+                """
+            )
+        )
@@ -0,0 +1,119 @@
+"""Compression ratio and cold-range query latency on a synthetic dataset.
+
+Usage: python -m quantshark_shared.testing.benchmarks.compression [--contracts N] [--days N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from quantshark_shared.testing.benchmarks.common import (
+    BENCH_SECTION,
+    measure,
+    migrated_database,
+    pause_background_jobs,
+    seed_contracts,
+    seed_funding_points,
+)
+from quantshark_shared.timescale.compression import compress_chunks, get_compression_stats
+
+HYPERTABLE = "historical_funding_point"
+COMPRESS_OLDER_THAN = datetime.timedelta(days=7)
+
+
+async def _query_timings(
+    engine: AsyncEngine,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> dict[str, Any]:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text("SELECT id FROM contract WHERE section_name = :section LIMIT 1;"),
+            {"section": BENCH_SECTION},
+        )
+        contract_id = result.scalar_one()
+
+        async def single_contract_range() -> None:
+            await connection.execute(
+                text(
+                    f"""
+                    SELECT timestamp, funding_rate FROM {HYPERTABLE}
+                    WHERE contract_id = :contract_id
+                      AND timestamp >= :start AND timestamp < :end
+                    ORDER BY timestamp;
+                    """
+                ),
+                {"contract_id": contract_id, "start": start, "end": end},
+            )
+
+        async def all_contracts_average() -> None:
+            await connection.execute(
+                text(
+                    f"""
+                    SELECT contract_id, avg(funding_rate) FROM {HYPERTABLE}
+                    WHERE timestamp >= :start AND timestamp < :end
+                    GROUP BY contract_id;
+                    """
+                ),
+                {"start": start, "end": end},
+            )
+
+        return {
+            "single_contract_range": (await measure(single_contract_range)).as_dict(),
+            "all_contracts_average": (await measure(all_contracts_average)).as_dict(),
+        }
+
+
+async def run(db_url: str, contracts: int, days: int) -> dict[str, Any]:
+    engine = create_async_engine(db_url)
+    try:
+        await pause_background_jobs(engine)
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        start = now - datetime.timedelta(days=days)
+        await seed_contracts(engine, contracts)
+        rows = await seed_funding_points(
+            engine, HYPERTABLE, start, now, step=datetime.timedelta(hours=1)
+        )
+
+        cold_end = now - COMPRESS_OLDER_THAN - datetime.timedelta(days=1)
+        before = await _query_timings(engine, start, cold_end)
+        chunks = await compress_chunks(engine, HYPERTABLE, COMPRESS_OLDER_THAN)
+        after = await _query_timings(engine, start, cold_end)
+        stats = await get_compression_stats(engine, HYPERTABLE)
+    finally:
+        await engine.dispose()
+
+    return {
+        "hypertable": HYPERTABLE,
+        "contracts": contracts,
+        "days": days,
+        "rows": rows,
+        "compressed_chunks": chunks,
+        "before_bytes": stats.before_bytes,
+        "after_bytes": stats.after_bytes,
+        "compression_ratio": round(stats.ratio, 2),
+        "uncompressed": before,
+        "compressed": after,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contracts", type=int, default=500)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    with migrated_database() as config:
+        report = asyncio.run(run(config.url, args.contracts, args.days))
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""search_contracts (precomputed search documents) vs per-row match_quality search latency.
+
+Seeds contracts with varied asset, section and quote names, checks that both paths
+score every matching contract identically and times single and batched queries.
+
+Usage: python -m quantshark_shared.testing.benchmarks.contract_search [--contracts N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import uuid
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from quantshark_shared.queries.contract_search import CONTRACT_SEARCH_SQL
+from quantshark_shared.testing.benchmarks.common import measure, migrated_database
+
+SECTIONS = ("binance_futures", "bybit_linear", "okx_swap", "gate io", "hyperliquid perp")
+QUOTES = ("USDT", "USDC", "USD")
+SYLLABLES = ("ba", "co", "di", "fe", "lu", "mo", "ne", "ra", "si", "to", "xu", "zen")
+QUERIES = ("btc", "bi", "eth usdt", "binance btc", "mo ne", "ra perp", "zenx", "lumo bybit")
+
+# Current search path: match_quality per contract, per token and per field
+MATCH_QUALITY_SQL = text(
+    """
+    WITH tokens AS (
+        SELECT t.token
+        FROM regexp_split_to_table(lower(trim(:query)), '\\s+') AS t (token)
+        WHERE t.token <> ''
+    ),
+    token_scores AS (
+        SELECT c.id, GREATEST(
+            match_quality(c.asset_name, tk.token),
+            match_quality(c.section_name, tk.token),
+            match_quality(c.quote_name, tk.token)
+        ) AS score
+        FROM contract c
+        CROSS JOIN tokens tk
+    )
+    SELECT id, SUM(score)::BIGINT AS score
+    FROM token_scores
+    GROUP BY id
+    HAVING bool_and(score > 0)
+    ORDER BY score DESC
+    LIMIT :limit;
+    """
+)
+
+
+async def seed_search_contracts(engine: AsyncEngine, count: int) -> None:
+    names = itertools.islice(itertools.product(SYLLABLES, repeat=4), -(-count // len(SECTIONS)))
+    assets = ["BTC", "ETH", *("".join(name).upper() for name in names)]
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO section (name) SELECT unnest(CAST(:names AS TEXT[])) "
+                "ON CONFLICT DO NOTHING;"
+            ),
+            {"names": list(SECTIONS)},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO asset (name) SELECT unnest(CAST(:names AS TEXT[])) "
+                "ON CONFLICT DO NOTHING;"
+            ),
+            {"names": assets},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO quote (name) SELECT unnest(CAST(:names AS TEXT[])) "
+                "ON CONFLICT DO NOTHING;"
+            ),
+            {"names": list(QUOTES)},
+        )
+        await connection.execute(
+            text(
+                """
+                INSERT INTO contract (asset_name, section_name, quote_name, funding_interval,
+                                      synced, deprecated)
+                SELECT a.name, s.name, (CAST(:quotes AS TEXT[]))[1 + a.i % :quote_count],
+                       8, false, false
+                FROM unnest(CAST(:assets AS TEXT[])) WITH ORDINALITY AS a (name, i)
+                CROSS JOIN unnest(CAST(:sections AS TEXT[])) AS s (name)
+                LIMIT :count
+                ON CONFLICT DO NOTHING;
+                """
+            ),
+            {
+                "assets": assets,
+                "sections": list(SECTIONS),
+                "quotes": list(QUOTES),
+                "quote_count": len(QUOTES),
+                "count": count,
+            },
+        )
+
+
+async def _all_scores(
+    connection: AsyncConnection,
+    query: str,
+    limit: int,
+) -> tuple[dict[uuid.UUID, int], dict[uuid.UUID, int]]:
+    params = {"query": query, "queries": [query], "limit": limit}
+    reference = await connection.execute(MATCH_QUALITY_SQL, params)
+    indexed = await connection.execute(CONTRACT_SEARCH_SQL, params)
+    expected: dict[uuid.UUID, int] = {row.id: row.score for row in reference}
+    actual: dict[uuid.UUID, int] = {row.contract_id: row.score for row in indexed}
+    return expected, actual
+
+
+async def run(db_url: str, contracts: int, limit: int) -> dict[str, Any]:
+    engine = create_async_engine(db_url)
+    try:
+        await seed_search_contracts(engine, contracts)
+        async with engine.connect() as connection:
+            mismatched: list[str] = []
+            matches: dict[str, int] = {}
+            for query in QUERIES:
+                expected, actual = await _all_scores(connection, query, contracts + 2)
+                matches[query] = len(expected)
+                if expected != actual:
+                    mismatched.append(query)
+
+            async def match_quality_each() -> None:
+                for query in QUERIES:
+                    await connection.execute(MATCH_QUALITY_SQL, {"query": query, "limit": limit})
+
+            async def search_each() -> None:
+                for query in QUERIES:
+                    await connection.execute(
+                        CONTRACT_SEARCH_SQL, {"queries": [query], "limit": limit}
+                    )
+
+            async def search_batch() -> None:
+                await connection.execute(
+                    CONTRACT_SEARCH_SQL, {"queries": list(QUERIES), "limit": limit}
+                )
+
+            timings = {
+                "match_quality_per_query": (await measure(match_quality_each)).as_dict(),
+                "search_contracts_per_query": (await measure(search_each)).as_dict(),
+                "search_contracts_batch": (await measure(search_batch)).as_dict(),
+            }
+    finally:
+        await engine.dispose()
+
+    return {
+        "contracts": contracts,
+        "queries": list(QUERIES),
+        "matching_contracts": matches,
+        "score_mismatches": mismatched,
+        "timings": timings,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contracts", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with migrated_database() as config:
+        report = asyncio.run(run(config.url, args.contracts, args.limit))
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
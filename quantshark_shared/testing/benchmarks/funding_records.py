@@ -0,0 +1,92 @@
+"""Memory per point and dedup throughput: SQLModel funding points vs FundingPointRecord vs
+FundingPointBatch. Runs in-process, no database needed.
+
+Usage: python -m quantshark_shared.testing.benchmarks.funding_records [--points N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import gc
+import json
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from quantshark_shared.models.live_funding_point import LiveFundingPoint
+from quantshark_shared.models.records import FundingPointBatch, FundingPointRecord
+
+START = datetime.datetime(2024, 1, 1)
+DUPLICATE_EVERY = 10  # every 10th point repeats an earlier (contract_id, timestamp)
+
+
+def _points(count: int, contracts: int) -> Iterator[tuple[uuid.UUID, datetime.datetime, float]]:
+    contract_ids = [uuid.UUID(int=index + 1) for index in range(contracts)]
+    for index in range(count):
+        source = index - 1 if index % DUPLICATE_EVERY == DUPLICATE_EVERY - 1 else index
+        yield (
+            contract_ids[source % contracts],
+            START + datetime.timedelta(minutes=source // contracts),
+            0.0001 * (index % 7),
+        )
+
+
+def _bytes_per_point(build: Callable[[], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return size / count
+
+
+def _throughput(run: Callable[[], int], count: int) -> dict[str, float]:
+    started = time.perf_counter()
+    unique = run()
+    seconds = time.perf_counter() - started
+    return {"unique": unique, "points_per_sec": count / seconds}
+
+
+def run(count: int, contracts: int) -> dict[str, Any]:
+    def models() -> list[LiveFundingPoint]:
+        return [
+            LiveFundingPoint(contract_id=contract_id, timestamp=timestamp, funding_rate=rate)
+            for contract_id, timestamp, rate in _points(count, contracts)
+        ]
+
+    def records() -> list[FundingPointRecord]:
+        return [FundingPointRecord(*point) for point in _points(count, contracts)]
+
+    def batch() -> FundingPointBatch:
+        return FundingPointBatch(_points(count, contracts))
+
+    memory = {
+        "model_bytes_per_point": _bytes_per_point(models, count),
+        "record_bytes_per_point": _bytes_per_point(records, count),
+        "batch_bytes_per_point": _bytes_per_point(batch, count),
+    }
+
+    built_models, built_records, built_batch = models(), records(), batch()
+    dedup = {
+        "model_set": _throughput(lambda: len(set(built_models)), count),
+        "record_set": _throughput(lambda: len(set(built_records)), count),
+        "batch_deduplicated": _throughput(lambda: len(built_batch.deduplicated()), count),
+    }
+    return {"points": count, "contracts": contracts, "memory": memory, "dedup": dedup}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--contracts", type=int, default=500)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.points, args.contracts), indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
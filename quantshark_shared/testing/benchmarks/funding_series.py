@@ -0,0 +1,109 @@
+"""lfp_series function vs lfp_smart view range-query latency.
+
+Usage: python -m quantshark_shared.testing.benchmarks.funding_series [--contracts N] [--days N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import uuid
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from quantshark_shared.queries.funding_series import FUNDING_SERIES_SQL
+from quantshark_shared.testing.benchmarks.common import (
+    bench_contract_ids,
+    measure,
+    migrated_database,
+    pause_background_jobs,
+    refresh_continuous_aggregates,
+    seed_contracts,
+    seed_funding_points,
+)
+
+LIVE_AGGREGATES = ("lfp_5min", "lfp_15min", "lfp_1hour", "lfp_1day")
+SMART_VIEW_SQL = text(
+    """
+    SELECT bucket, contract_id, avg_funding_rate FROM lfp_smart
+    WHERE contract_id = ANY(CAST(:contract_ids AS UUID[]))
+      AND bucket >= :start AND bucket < :end;
+    """
+)
+
+
+async def _compare(
+    engine: AsyncEngine,
+    contract_ids: list[uuid.UUID],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> dict[str, Any]:
+    params = {"contract_ids": contract_ids, "start": start, "end": end}
+    async with engine.connect() as connection:
+
+        async def smart_view() -> None:
+            await connection.execute(SMART_VIEW_SQL, params)
+
+        async def series_function() -> None:
+            await connection.execute(FUNDING_SERIES_SQL, params)
+
+        return {
+            "lfp_smart": (await measure(smart_view)).as_dict(),
+            "lfp_series": (await measure(series_function)).as_dict(),
+        }
+
+
+async def run(db_url: str, contracts: int, days: int, step_minutes: int) -> dict[str, Any]:
+    engine = create_async_engine(db_url)
+    try:
+        await pause_background_jobs(engine)
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        await seed_contracts(engine, contracts)
+        rows = await seed_funding_points(
+            engine,
+            "live_funding_point",
+            now - datetime.timedelta(days=days),
+            now,
+            step=datetime.timedelta(minutes=step_minutes),
+        )
+        await refresh_continuous_aggregates(engine, LIVE_AGGREGATES, None, now)
+
+        ids = await bench_contract_ids(engine, 10)
+        scenarios = {
+            "1_contract_1_day": (ids[:1], datetime.timedelta(days=1)),
+            "1_contract_30_days": (ids[:1], datetime.timedelta(days=30)),
+            "10_contracts_7_days": (ids, datetime.timedelta(days=7)),
+        }
+        results = {
+            name: await _compare(engine, contract_ids, now - span, now)
+            for name, (contract_ids, span) in scenarios.items()
+        }
+    finally:
+        await engine.dispose()
+
+    return {
+        "contracts": contracts,
+        "days": days,
+        "rows": rows,
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contracts", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--step-minutes", type=int, default=5)
+    args = parser.parse_args()
+
+    with migrated_database() as config:
+        report = asyncio.run(run(config.url, args.contracts, args.days, args.step_minutes))
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
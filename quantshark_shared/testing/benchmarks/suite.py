@@ -0,0 +1,359 @@
+"""Benchmark suite for the shared data layer, with results comparable across commits.
+
+For every scale (contracts x days of 5-minute live funding data) a fresh container is
+migrated to head and seeded, then the suite measures:
+
+- aggregate refresh: first materialization of each lfp_* tier
+- lfp_smart range-query latency for a few contract / time-span shapes
+- search_contracts latency, single and batched
+- latest-rate reads: funding_latest snapshot vs a last-point search on the hypertable
+- ingestion throughput: copy_funding_points inserting one new day, then upserting it
+
+Results are flat metrics (name, value, unit, better) plus run metadata, written as JSON.
+``compare`` diffs two result files and exits non-zero when a metric regressed by more
+than the threshold.
+
+Usage:
+    python -m quantshark_shared.testing.benchmarks.suite run \
+        --scale 100x7 --scale 1000x30 --output results/$(git rev-parse --short HEAD).json
+    python -m quantshark_shared.testing.benchmarks.suite compare base.json head.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from quantshark_shared.ingestion.bulk import copy_funding_points
+from quantshark_shared.models.live_funding_point import LiveFundingPoint
+from quantshark_shared.models.records import FundingPointBatch
+from quantshark_shared.queries.contract_search import CONTRACT_SEARCH_SQL
+from quantshark_shared.queries.funding_latest import get_latest_funding
+from quantshark_shared.testing.benchmarks.common import (
+    Timing,
+    bench_contract_ids,
+    measure,
+    migrated_database,
+    pause_background_jobs,
+    refresh_continuous_aggregates,
+    seed_contracts,
+    seed_funding_points,
+)
+from quantshark_shared.testing.benchmarks.funding_series import LIVE_AGGREGATES, SMART_VIEW_SQL
+from quantshark_shared.testing.db import DEFAULT_TIMESCALE_IMAGE
+
+RESULTS_VERSION = 1
+STEP = datetime.timedelta(minutes=5)
+SEARCH_QUERIES = ("bench", "bench12", "bench1 usdt", "bench bench")
+DEFAULT_THRESHOLD = 0.10
+
+Better = Literal["lower", "higher"]
+
+LAST_POINT_SQL = text(
+    """
+    SELECT c.id, l.timestamp, l.funding_rate
+    FROM contract c
+    CROSS JOIN LATERAL (
+        SELECT timestamp, funding_rate FROM live_funding_point
+        WHERE contract_id = c.id
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) l;
+    """
+)
+
+
+@dataclass(frozen=True)
+class Scale:
+    contracts: int
+    days: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.contracts}x{self.days}"
+
+    @classmethod
+    def parse(cls, value: str) -> Scale:
+        contracts, _, days = value.lower().partition("x")
+        try:
+            return cls(int(contracts), int(days))
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"scale must look like CONTRACTSxDAYS: {value}"
+            ) from None
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    value: float
+    unit: str
+    better: Better = "lower"
+
+
+def _latency_metrics(name: str, timing: Timing) -> list[Metric]:
+    return [
+        Metric(f"{name}.median_ms", timing.median_ms, "ms"),
+        Metric(f"{name}.p95_ms", timing.p95_ms, "ms"),
+    ]
+
+
+async def _bench_refresh(engine: AsyncEngine, now: datetime.datetime) -> list[Metric]:
+    metrics: list[Metric] = []
+    for view_name in LIVE_AGGREGATES:  # hierarchical: each tier reads the one below
+        started = time.perf_counter()
+        await refresh_continuous_aggregates(engine, [view_name], None, now)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.append(Metric(f"refresh.{view_name}_ms", elapsed_ms, "ms"))
+    return metrics
+
+
+async def _bench_smart(engine: AsyncEngine, now: datetime.datetime, runs: int) -> list[Metric]:
+    ids = await bench_contract_ids(engine, 10)
+    shapes = {
+        "1_contract_1_day": (ids[:1], datetime.timedelta(days=1)),
+        "1_contract_30_days": (ids[:1], datetime.timedelta(days=30)),
+        "10_contracts_7_days": (ids, datetime.timedelta(days=7)),
+    }
+    metrics: list[Metric] = []
+    async with engine.connect() as connection:
+        for name, (contract_ids, span) in shapes.items():
+            params = {"contract_ids": contract_ids, "start": now - span, "end": now}
+
+            async def query(params: dict[str, Any] = params) -> None:
+                await connection.execute(SMART_VIEW_SQL, params)
+
+            metrics += _latency_metrics(f"lfp_smart.{name}", await measure(query, runs))
+    return metrics
+
+
+async def _bench_search(engine: AsyncEngine, runs: int) -> list[Metric]:
+    async with engine.connect() as connection:
+
+        async def single() -> None:
+            await connection.execute(
+                CONTRACT_SEARCH_SQL, {"queries": ["bench1 usdt"], "limit": 20}
+            )
+
+        async def batch() -> None:
+            await connection.execute(
+                CONTRACT_SEARCH_SQL, {"queries": list(SEARCH_QUERIES), "limit": 20}
+            )
+
+        return _latency_metrics("search.single", await measure(single, runs)) + _latency_metrics(
+            "search.batch", await measure(batch, runs)
+        )
+
+
+async def _bench_latest(engine: AsyncEngine, runs: int) -> list[Metric]:
+    async with engine.begin() as connection:
+        # Seeding bypasses the ingestion path that maintains the snapshot
+        await connection.execute(text("SELECT rebuild_funding_latest();"))
+
+    ids = await bench_contract_ids(engine, 10)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+
+        async def snapshot_all() -> None:
+            await get_latest_funding(session)
+
+        async def snapshot_ids() -> None:
+            await get_latest_funding(session, ids)
+
+        async def last_point_all() -> None:
+            await session.execute(LAST_POINT_SQL)
+
+        return (
+            _latency_metrics("latest.snapshot_all", await measure(snapshot_all, runs))
+            + _latency_metrics("latest.snapshot_10_ids", await measure(snapshot_ids, runs))
+            + _latency_metrics("latest.hypertable_all", await measure(last_point_all, runs))
+        )
+
+
+async def _bench_ingestion(
+    engine: AsyncEngine,
+    now: datetime.datetime,
+    scale: Scale,
+) -> list[Metric]:
+    ids = await bench_contract_ids(engine, scale.contracts)
+    batch = FundingPointBatch(
+        (contract_id, now + STEP * step, 0.0001)
+        for step in range(1, int(datetime.timedelta(days=1) / STEP) + 1)
+        for contract_id in ids
+    )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    metrics: list[Metric] = []
+    for name in ("insert", "upsert"):  # second pass conflicts on every row
+        started = time.perf_counter()
+        async with sessionmaker() as session, session.begin():
+            await copy_funding_points(session, LiveFundingPoint, batch)
+        seconds = time.perf_counter() - started
+        metrics.append(
+            Metric(f"ingestion.{name}_rows_per_s", len(batch) / seconds, "rows/s", "higher")
+        )
+    return metrics
+
+
+async def run_scale(db_url: str, scale: Scale, runs: int) -> dict[str, Any]:
+    engine = create_async_engine(db_url)
+    try:
+        await pause_background_jobs(engine)
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        await seed_contracts(engine, scale.contracts)
+        started = time.perf_counter()
+        rows = await seed_funding_points(
+            engine, "live_funding_point", now - datetime.timedelta(days=scale.days), now, STEP
+        )
+        seed_seconds = time.perf_counter() - started
+
+        metrics = [Metric("seed.rows_per_s", rows / seed_seconds, "rows/s", "higher")]
+        metrics += await _bench_refresh(engine, now)
+        metrics += await _bench_smart(engine, now, runs)
+        metrics += await _bench_search(engine, runs)
+        metrics += await _bench_latest(engine, runs)
+        metrics += await _bench_ingestion(engine, now, scale)
+    finally:
+        await engine.dispose()
+
+    return {
+        "contracts": scale.contracts,
+        "days": scale.days,
+        "rows": rows,
+        "metrics": [asdict(metric) for metric in metrics],
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(scales: Sequence[Scale], runs: int, image: str) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "commit": _git_commit(),
+        "started_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "image": image,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "runs": runs,
+        "scales": {},
+    }
+    for scale in scales:
+        with migrated_database(image) as config:
+            report["scales"][scale.label] = asyncio.run(run_scale(config.url, scale, runs))
+    return report
+
+
+def _metrics_by_key(report: dict[str, Any]) -> dict[tuple[str, str], dict[str, Any]]:
+    return {
+        (scale, metric["name"]): metric
+        for scale, result in report["scales"].items()
+        for metric in result["metrics"]
+    }
+
+
+def compare(
+    base: dict[str, Any],
+    head: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Pair metrics present in both reports; returns rows and whether any regressed.
+
+    change is relative to base and signed so that positive means worse.
+    """
+    base_metrics = _metrics_by_key(base)
+    rows: list[dict[str, Any]] = []
+    regressed = False
+    for key, metric in _metrics_by_key(head).items():
+        previous = base_metrics.get(key)
+        if previous is None or not previous["value"]:
+            continue
+        change = (metric["value"] - previous["value"]) / previous["value"]
+        if metric["better"] == "higher":
+            change = -change
+        is_regression = change > threshold
+        regressed |= is_regression
+        rows.append(
+            {
+                "scale": key[0],
+                "metric": key[1],
+                "unit": metric["unit"],
+                "base": previous["value"],
+                "head": metric["value"],
+                "change": change,
+                "regression": is_regression,
+            }
+        )
+    return rows, regressed
+
+
+def _print_comparison(rows: list[dict[str, Any]]) -> None:
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(  # noqa: T201
+            f"{row['scale']:>12} {row['metric']:<40} {row['base']:>14.3f} -> "
+            f"{row['head']:>14.3f} {row['unit']:<7} {row['change']:+8.1%}{flag}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and write JSON results")
+    run_parser.add_argument("--scale", type=Scale.parse, action="append", dest="scales")
+    run_parser.add_argument("--runs", type=int, default=20)
+    run_parser.add_argument("--image", default=DEFAULT_TIMESCALE_IMAGE)
+    run_parser.add_argument("--output", type=Path)
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("head", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        report = run(args.scales or [Scale(100, 7)], args.runs, args.image)
+        output = json.dumps(report, indent=2)
+        if args.output is None:
+            print(output)  # noqa: T201
+        else:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(output + "\n")
+        return
+
+    base = json.loads(args.base.read_text())
+    head = json.loads(args.head.read_text())
+    rows, regressed = compare(base, head, args.threshold)
+    _print_comparison(rows)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
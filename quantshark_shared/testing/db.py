@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+import os
 from collections.abc import Iterator, Sequence
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from typing import Literal
 
+import psycopg
 import sqlalchemy_timescaledb  # noqa: F401 need for dialect registration
-from sqlalchemy import text
+from alembic import command
+from psycopg import sql
+from sqlalchemy import event, text
 from sqlalchemy.engine import make_url
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 from testcontainers.postgres import PostgresContainer
 
-from alembic import command
 from quantshark_shared.migrations.config import get_alembic_config
 
 DEFAULT_TIMESCALE_IMAGE = "timescale/timescaledb:2.23.0-pg18"
+TEMPLATE_DATABASE = "quantshark_template"
+TEST_DB_URL_ENV = "QUANTSHARK_TEST_DB_URL"
+
+# Per-test isolation of the db_session fixture:
+# - "database": the worker's database is replaced by a fresh template clone after each
+#   test; anything goes, including DDL and committed writes from other connections
+# - "savepoint": the test runs inside a transaction that is rolled back; cheapest, but
+#   only for tests whose writes go through db_session and that run no DDL or
+#   non-transactional statements (continuous aggregate refresh, compression)
+# - "truncate": TRUNCATE every public table after each test
+IsolationMode = Literal["database", "savepoint", "truncate"]
 
 
 @dataclass(frozen=True)
@@ -26,6 +42,15 @@ class DatabaseConfig:
     dbname: str
 
 
+@dataclass
+class QueryLog:
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
 def build_db_url(host: str, port: int, user: str, password: str, dbname: str) -> str:
     return f"timescaledb+psycopg://{user}:{password}@{host}:{port}/{dbname}"
 
@@ -59,9 +84,125 @@ def timescaledb_container(image: str = DEFAULT_TIMESCALE_IMAGE) -> Iterator[Data
         yield parse_container_url(raw_sync_url)
 
 
-def apply_alembic_migrations() -> None:
+@contextmanager
+def database_environment(config: DatabaseConfig) -> Iterator[None]:
+    """Point DB_* variables (read by DBSettings and the migration env) at config, restoring
+    the previous values afterwards."""
+    values = {
+        "DB_HOST": config.host,
+        "DB_PORT": str(config.port),
+        "DB_USER": config.user,
+        "DB_PASSWORD": config.password,
+        "DB_DBNAME": config.dbname,
+    }
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def admin_connection(config: DatabaseConfig) -> psycopg.Connection:
+    """Autocommit psycopg connection to config's database, for CREATE/DROP DATABASE."""
+    return psycopg.connect(
+        host=config.host,
+        port=config.port,
+        user=config.user,
+        password=config.password,
+        dbname=config.dbname,
+        autocommit=True,
+    )
+
+
+def _with_dbname(config: DatabaseConfig, dbname: str) -> DatabaseConfig:
+    return DatabaseConfig(
+        url=build_db_url(config.host, config.port, config.user, config.password, dbname),
+        host=config.host,
+        port=config.port,
+        user=config.user,
+        password=config.password,
+        dbname=dbname,
+    )
+
+
+def create_database(
+    config: DatabaseConfig,
+    dbname: str,
+    template: str | None = None,
+) -> DatabaseConfig:
+    """Create a database on config's server, empty or cloned from template, and return
+    its config. Cloning copies files, so it costs about as much as the template's size."""
+    statement = sql.SQL("CREATE DATABASE {}").format(sql.Identifier(dbname))
+    if template is not None:
+        statement += sql.SQL(" TEMPLATE {}").format(sql.Identifier(template))
+    with admin_connection(config) as connection:
+        connection.execute(statement)
+    return _with_dbname(config, dbname)
+
+
+def drop_database(config: DatabaseConfig, dbname: str) -> None:
+    """Drop dbname if it exists, terminating its open connections."""
+    with admin_connection(config) as connection:
+        connection.execute(
+            sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE);").format(sql.Identifier(dbname))
+        )
+
+
+def create_template_database(
+    config: DatabaseConfig,
+    dbname: str = TEMPLATE_DATABASE,
+    revision: str = "head",
+) -> DatabaseConfig:
+    """Migrate dbname once per server and freeze it as a template for create_database.
+
+    Safe to call from several processes (e.g. pytest-xdist workers on one server): an
+    advisory lock serializes them and a finished template is reused. TimescaleDB's
+    scheduler is stopped for the template (timescaledb_pre_restore), since CREATE
+    DATABASE ... TEMPLATE fails while anything is connected to it. That database-level
+    setting is not copied to clones.
+    """
+    with admin_connection(config) as connection:
+        connection.execute("SELECT pg_advisory_lock(hashtext(%s));", (dbname,))
+        try:
+            ready = connection.execute(
+                "SELECT 1 FROM pg_database WHERE datname = %s AND datistemplate;", (dbname,)
+            ).fetchone()
+            if ready is None:
+                drop_database(config, dbname)  # left over from an interrupted run
+                template = create_database(config, dbname)
+                with database_environment(template):
+                    apply_alembic_migrations(revision)
+                with admin_connection(template) as template_connection:
+                    template_connection.execute("SELECT timescaledb_pre_restore();")
+                connection.execute(
+                    sql.SQL(
+                        "ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false;"
+                    ).format(sql.Identifier(dbname))
+                )
+                connection.execute(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s;",
+                    (dbname,),
+                )
+        finally:
+            connection.execute("SELECT pg_advisory_unlock(hashtext(%s));", (dbname,))
+    return _with_dbname(config, dbname)
+
+
+def reset_database(server: DatabaseConfig, dbname: str, template: str) -> None:
+    """Replace dbname with a fresh clone of template, keeping its name (and URLs).
+    Connection pools pointing at it must be disposed first."""
+    drop_database(server, dbname)
+    create_database(server, dbname, template=template)
+
+
+def apply_alembic_migrations(revision: str = "head") -> None:
     config = get_alembic_config()
-    command.upgrade(config, "head")
+    command.upgrade(config, revision)
 
 
 async def truncate_all_tables(session: AsyncSession, exclude: set[str] | None = None) -> None:
@@ -78,11 +219,81 @@ async def truncate_all_tables(session: AsyncSession, exclude: set[str] | None =
     await session.commit()
 
 
-async def refresh_materialized_views(engine: AsyncEngine, view_names: Sequence[str]) -> None:
+@contextmanager
+def count_queries(engine: AsyncEngine) -> Iterator[QueryLog]:
+    """Record every statement the engine sends while the block runs, for query-count
+    assertions (e.g. that a loader profile avoids extra SELECT IN round trips)."""
+    log = QueryLog()
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        log.statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        yield log
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+async def _materialized_view_order(
+    connection: AsyncConnection,
+    view_names: Sequence[str],
+) -> list[tuple[str, bool]]:
+    """Return (name, is_populated) for the requested materialized views, dependencies
+    first. Names that are not materialized views are dropped."""
+    result = await connection.execute(
+        text(
+            "SELECT matviewname, ispopulated FROM pg_matviews WHERE schemaname = current_schema();"
+        )
+    )
+    populated = {row[0]: row[1] for row in result.fetchall()}
+
+    # Rewrite-rule dependencies between relations (views and materialized views)
+    result = await connection.execute(
+        text(
+            """
+            SELECT DISTINCT dependent.relname, dependency.relname
+            FROM pg_rewrite r
+            JOIN pg_depend d ON d.classid = 'pg_rewrite'::regclass AND d.objid = r.oid
+                            AND d.refclassid = 'pg_class'::regclass
+            JOIN pg_class dependent ON dependent.oid = r.ev_class
+            JOIN pg_class dependency ON dependency.oid = d.refobjid
+            WHERE d.refobjid <> r.ev_class
+              AND dependent.relnamespace = current_schema()::TEXT::regnamespace;
+            """
+        )
+    )
+    sorter: TopologicalSorter[str] = TopologicalSorter()
+    for dependent, dependency in result.fetchall():
+        sorter.add(dependent, dependency)
+    for view_name in view_names:
+        sorter.add(view_name)
+
+    requested = set(view_names)
+    return [
+        (name, populated[name])
+        for name in sorter.static_order()
+        if name in requested and name in populated
+    ]
+
+
+async def refresh_materialized_views(
+    engine: AsyncEngine,
+    view_names: Sequence[str],
+    concurrently: bool = False,
+) -> None:
+    """Refresh materialized views in dependency order.
+
+    With concurrently=True populated views are refreshed with REFRESH ... CONCURRENTLY
+    (requires a unique index) so readers are not blocked. Names that are not
+    materialized views, such as the trigger-maintained contract_enriched table, are
+    skipped.
+    """
     if not view_names:
         return
 
     async with engine.connect() as connection:
         autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
-        for view_name in view_names:
-            await autocommit.execute(text(f"REFRESH MATERIALIZED VIEW {view_name};"))
+        for view_name, is_populated in await _materialized_view_order(autocommit, view_names):
+            mode = "CONCURRENTLY " if concurrently and is_populated else ""
+            await autocommit.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{view_name};"))
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import os
 from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from contextlib import ExitStack
 
 import pytest
 import pytest_asyncio
@@ -16,12 +17,31 @@ from sqlalchemy.ext.asyncio import (
 from quantshark_shared.models.contract import Contract
 from quantshark_shared.testing.db import (
     DEFAULT_TIMESCALE_IMAGE,
+    TEST_DB_URL_ENV,
     DatabaseConfig,
-    apply_alembic_migrations,
+    IsolationMode,
+    create_database,
+    create_template_database,
+    database_environment,
+    drop_database,
+    parse_container_url,
+    reset_database,
     timescaledb_container,
     truncate_all_tables,
 )
 from quantshark_shared.testing.helpers.data_helpers import create_contract
+from quantshark_shared.testing.startup import (
+    REUSE_CONTAINER_ENV,
+    STARTUP_PHASES,
+    drop_stale_templates,
+    format_startup_report,
+    reusable_timescaledb_container,
+    startup_phase,
+    template_exists,
+    template_in_use,
+    template_name,
+)
+from quantshark_shared.testing.synthetic import SyntheticSummary, generate_dataset
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -41,31 +61,86 @@ def db_image() -> str:
     return DEFAULT_TIMESCALE_IMAGE
 
 
+@pytest.fixture(scope="session")
+def db_isolation() -> IsolationMode:
+    """How db_session isolates tests; see IsolationMode."""
+    return "database"
+
+
+@pytest.fixture(scope="session")
+def db_worker(request: pytest.FixtureRequest) -> str:
+    """pytest-xdist worker id ("gw0", ...), or "main" without xdist."""
+    workerinput: dict[str, str] = getattr(request.config, "workerinput", {})
+    return workerinput.get("workerid", "main")
+
+
+@pytest.fixture(scope="session")
+def db_reuse_container() -> bool:
+    """Keep the container running after the session and reuse it (and its migrated
+    template) in the next one; opt in with REUSE_CONTAINER_ENV=1."""
+    return os.environ.get(REUSE_CONTAINER_ENV, "").lower() in {"1", "true", "yes"}
+
+
+@pytest.fixture(scope="session")
+def db_server(db_image: str, db_reuse_container: bool) -> Iterator[DatabaseConfig]:
+    """Server for all test databases: TEST_DB_URL_ENV when set (shared by every xdist
+    worker), a long-lived container with db_reuse_container, otherwise a container per
+    pytest process."""
+    with ExitStack() as stack:
+        with startup_phase("server") as phase:
+            url = os.environ.get(TEST_DB_URL_ENV)
+            if url:
+                config = parse_container_url(url)
+                phase.detail = "external"
+            elif db_reuse_container:
+                config, started = reusable_timescaledb_container(db_image)
+                phase.detail = "new reusable container" if started else "reused container"
+            else:
+                config = stack.enter_context(timescaledb_container(db_image))
+                phase.detail = "new container"
+        yield config
+
+
+@pytest.fixture(scope="session")
+def db_template(db_server: DatabaseConfig, db_image: str) -> Iterator[DatabaseConfig]:
+    """Migrated template, named after the migration files so a long-lived server keeps
+    one per migration state and rebuilds it only when migrations change. It is marked in
+    use for the session, so other sessions on the server leave it in place."""
+    dbname = template_name(db_image)
+    with template_in_use(db_server, dbname):
+        with startup_phase("template") as phase:
+            phase.detail = "reused" if template_exists(db_server, dbname) else "migrated"
+            template = create_template_database(db_server, dbname)
+            dropped = drop_stale_templates(db_server, keep=dbname)
+            if dropped:
+                phase.detail += f", dropped {len(dropped)} stale"
+        yield template
+
+
 @pytest.fixture(scope="session")
 def db_config(
-    db_image: str,
+    db_server: DatabaseConfig,
+    db_template: DatabaseConfig,
+    db_worker: str,
 ) -> Iterator[DatabaseConfig]:
-    previous = {
-        "DB_HOST": os.environ.get("DB_HOST"),
-        "DB_PORT": os.environ.get("DB_PORT"),
-        "DB_USER": os.environ.get("DB_USER"),
-        "DB_PASSWORD": os.environ.get("DB_PASSWORD"),
-        "DB_DBNAME": os.environ.get("DB_DBNAME"),
-    }
-    with timescaledb_container(db_image) as config:
-        os.environ["DB_HOST"] = config.host
-        os.environ["DB_PORT"] = str(config.port)
-        os.environ["DB_USER"] = config.user
-        os.environ["DB_PASSWORD"] = config.password
-        os.environ["DB_DBNAME"] = config.dbname
-        apply_alembic_migrations()
+    """This worker's migrated database, cloned from the template."""
+    dbname = f"test_{db_worker}"
+    with startup_phase("clone") as phase:
+        phase.detail = dbname
+        drop_database(db_server, dbname)
+        config = create_database(db_server, dbname, template=db_template.dbname)
+    with database_environment(config):
         yield config
+    drop_database(db_server, dbname)
+
 
-    for key, value in previous.items():
-        if value is None:
-            os.environ.pop(key, None)
-        else:
-            os.environ[key] = value
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """Report where test database startup time went."""
+    if not STARTUP_PHASES:
+        return
+    terminalreporter.section("test database startup")
+    for line in format_startup_report(STARTUP_PHASES):
+        terminalreporter.write_line(line)
 
 
 @pytest.fixture(scope="session")
@@ -80,6 +155,7 @@ def db_engine_kwargs() -> dict[str, object]:
         "pool_pre_ping": True,
         "pool_size": 5,
         "max_overflow": 10,
+        "connect_args": {"options": "-c timezone=UTC"},  # as DBSettings connections
     }
 
 
@@ -108,17 +184,43 @@ async def engine(
 @pytest_asyncio.fixture()
 async def db_session(
     engine: AsyncEngine,
+    db_isolation: IsolationMode,
+    db_server: DatabaseConfig,
+    db_template: DatabaseConfig,
+    db_config: DatabaseConfig,
     db_session_kwargs: dict[str, object],
     db_truncate_exclude: set[str],
 ) -> AsyncGenerator[AsyncSession]:
+    if db_isolation == "savepoint":
+        # commit() releases a savepoint; the outer transaction is rolled back at the end
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                **db_session_kwargs,  # type: ignore[arg-type]
+            )
+            try:
+                yield session
+            finally:
+                await session.close()
+                await transaction.rollback()
+        return
+
     session_factory = async_sessionmaker(engine, **db_session_kwargs)  # type: ignore[arg-type]
     session = session_factory()
     try:
         yield session
     finally:
         await session.rollback()
-        await truncate_all_tables(session, exclude=db_truncate_exclude)
+        if db_isolation == "truncate":
+            await truncate_all_tables(session, exclude=db_truncate_exclude)
         await session.close()
+        if db_isolation == "database":
+            await engine.dispose()
+            await asyncio.to_thread(
+                reset_database, db_server, db_config.dbname, db_template.dbname
+            )
 
 
 @pytest_asyncio.fixture()
@@ -140,3 +242,42 @@ async def contract_factory(
         )
 
     return _create_contract
+
+
+@pytest.fixture(scope="session")
+def synthetic_dataset_name() -> str:
+    """Name of the quantshark_shared.testing.synthetic DATASETS entry to pre-seed."""
+    return "small"
+
+
+@pytest.fixture(scope="session")
+def synthetic_db_config(
+    db_server: DatabaseConfig,
+    db_template: DatabaseConfig,
+    db_worker: str,
+    synthetic_dataset_name: str,
+) -> Iterator[DatabaseConfig]:
+    # Separate database: db_session resets the worker's database after each test
+    dbname = f"synthetic_{synthetic_dataset_name}_{db_worker}"
+    drop_database(db_server, dbname)
+    yield create_database(db_server, dbname, template=db_template.dbname)
+    drop_database(db_server, dbname)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def synthetic_engine(
+    synthetic_db_config: DatabaseConfig,
+    db_engine_kwargs: dict[str, object],
+) -> AsyncGenerator[AsyncEngine]:
+    db_engine = create_async_engine(synthetic_db_config.url, **db_engine_kwargs)
+    yield db_engine
+    await db_engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def synthetic_dataset(
+    synthetic_engine: AsyncEngine,
+    synthetic_dataset_name: str,
+) -> SyntheticSummary:
+    """Seed the named dataset once per session; tests must treat it as read-only."""
+    return await generate_dataset(synthetic_engine, synthetic_dataset_name)
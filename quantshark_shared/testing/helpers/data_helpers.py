@@ -6,6 +6,7 @@ from sqlmodel import col
 
 from quantshark_shared.models.asset import Asset
 from quantshark_shared.models.contract import Contract
+from quantshark_shared.models.quote import Quote
 from quantshark_shared.models.section import Section
 
 
@@ -35,6 +36,19 @@ async def get_or_create_section(session: AsyncSession, name: str) -> Section:
     return section
 
 
+async def get_or_create_quote(session: AsyncSession, name: str) -> Quote:
+    result = await session.execute(select(Quote).where(col(Quote.name) == name))
+    quote = result.scalar_one_or_none()
+    if quote:
+        return quote
+
+    quote = Quote(name=name)
+    session.add(quote)
+    await session.commit()
+    await session.refresh(quote)
+    return quote
+
+
 async def create_contract(
     session: AsyncSession,
     asset_name: str = "BTC",
@@ -44,12 +58,13 @@ async def create_contract(
 ) -> Contract:
     asset = await get_or_create_asset(session, asset_name)
     section = await get_or_create_section(session, section_name)
+    quote = await get_or_create_quote(session, quote_name)
 
     contract = Contract(
         asset_name=asset.name,
         section_name=section.name,
         funding_interval=funding_interval,
-        quote_name=quote_name,
+        quote_name=quote.name,
     )
     session.add(contract)
     await session.commit()
@@ -1,6 +1,11 @@
-from quantshark_shared.testing.db import refresh_materialized_views, truncate_all_tables
+from quantshark_shared.testing.db import (
+    count_queries,
+    refresh_materialized_views,
+    truncate_all_tables,
+)
 
 __all__ = [
+    "count_queries",
     "refresh_materialized_views",
     "truncate_all_tables",
 ]
@@ -0,0 +1,202 @@
+"""Test database startup: a container reusable across sessions and per-phase timings.
+
+With reuse enabled the TimescaleDB container outlives the pytest session (it is created
+outside testcontainers' reaper and found again by label), and the migrated template
+database inside it is named after migration_key(), so later sessions skip both the
+container start and the migration replay until a migration or the image changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib import resources
+
+import psycopg
+from alembic.script import ScriptDirectory
+from psycopg import sql
+from testcontainers.core.docker_client import DockerClient
+
+from quantshark_shared.migrations.config import get_alembic_config
+from quantshark_shared.testing.db import (
+    TEMPLATE_DATABASE,
+    DatabaseConfig,
+    admin_connection,
+    build_db_url,
+)
+
+REUSE_CONTAINER_ENV = "QUANTSHARK_TEST_REUSE_CONTAINER"
+REUSE_LABEL = "io.quantshark.testing.reuse"
+POSTGRES_USER = "test"
+POSTGRES_PASSWORD = "test"
+POSTGRES_DB = "test"
+READY_TIMEOUT = 60.0
+# Advisory lock class for templates in use: sessions hold it shared on their template,
+# drop_stale_templates only drops templates it can lock exclusively
+TEMPLATE_IN_USE_LOCK = "quantshark_template_in_use"
+
+
+@dataclass
+class StartupPhase:
+    """One timed step of test database startup; detail says which path it took."""
+
+    name: str
+    seconds: float = 0.0
+    detail: str = ""
+
+
+STARTUP_PHASES: list[StartupPhase] = []
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[StartupPhase]:
+    """Time a startup step into STARTUP_PHASES; set ``detail`` on the yielded phase."""
+    phase = StartupPhase(name)
+    started = time.perf_counter()
+    try:
+        yield phase
+    finally:
+        phase.seconds = time.perf_counter() - started
+        STARTUP_PHASES.append(phase)
+
+
+def format_startup_report(phases: list[StartupPhase]) -> list[str]:
+    lines = [f"{phase.name:<10} {phase.seconds:7.2f}s  {phase.detail}" for phase in phases]
+    lines.append(f"{'total':<10} {sum(phase.seconds for phase in phases):7.2f}s")
+    return lines
+
+
+def migration_key(image: str) -> str:
+    """Short hash of the image, the migration head and every migration file's contents."""
+    script = ScriptDirectory.from_config(get_alembic_config())
+    digest = hashlib.sha256(image.encode())
+    digest.update(str(script.get_current_head()).encode())
+    versions = resources.files("quantshark_shared.migrations").joinpath("versions")
+    for path in sorted(versions.iterdir(), key=lambda path: path.name):
+        if path.name.endswith(".py"):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def template_name(image: str) -> str:
+    """Template database name for the current migrations on image."""
+    return f"{TEMPLATE_DATABASE}_{migration_key(image)}"
+
+
+def _wait_until_ready(config: DatabaseConfig) -> None:
+    deadline = time.monotonic() + READY_TIMEOUT
+    while True:
+        try:
+            with psycopg.connect(
+                host=config.host,
+                port=config.port,
+                user=config.user,
+                password=config.password,
+                dbname=config.dbname,
+                connect_timeout=2,
+            ):
+                return
+        except psycopg.OperationalError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.25)
+
+
+def reusable_timescaledb_container(image: str) -> tuple[DatabaseConfig, bool]:
+    """Return a running container for image, started now or by an earlier session, and
+    whether it was started now. The container is never stopped by the test session;
+    remove it with ``docker rm -f`` on the REUSE_LABEL label."""
+    docker = DockerClient()
+    labels = {REUSE_LABEL: hashlib.sha256(image.encode()).hexdigest()[:12]}
+    running = docker.client.containers.list(
+        filters={"label": [f"{key}={value}" for key, value in labels.items()], "status": "running"}
+    )
+    started = not running
+    if running:
+        container = running[0]
+    else:
+        container = docker.client.containers.run(
+            image,
+            detach=True,
+            labels=labels,
+            environment={
+                "POSTGRES_USER": POSTGRES_USER,
+                "POSTGRES_PASSWORD": POSTGRES_PASSWORD,
+                "POSTGRES_DB": POSTGRES_DB,
+            },
+            ports={"5432/tcp": None},
+        )
+
+    host = docker.host()
+    port = int(docker.port(container.id or "", 5432))
+    config = DatabaseConfig(
+        url=build_db_url(host, port, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_DB),
+        host=host,
+        port=port,
+        user=POSTGRES_USER,
+        password=POSTGRES_PASSWORD,
+        dbname=POSTGRES_DB,
+    )
+    _wait_until_ready(config)
+    return config, started
+
+
+def template_exists(server: DatabaseConfig, dbname: str) -> bool:
+    with admin_connection(server) as connection:
+        row = connection.execute(
+            "SELECT 1 FROM pg_database WHERE datname = %s AND datistemplate;", (dbname,)
+        ).fetchone()
+    return row is not None
+
+
+@contextmanager
+def template_in_use(server: DatabaseConfig, dbname: str) -> Iterator[None]:
+    """Mark template dbname as in use until exit, so concurrent sessions on the same
+    server (e.g. other checkouts on one QUANTSHARK_TEST_DB_URL) do not drop it."""
+    with admin_connection(server) as connection:
+        connection.execute(
+            "SELECT pg_advisory_lock_shared(hashtext(%s), hashtext(%s));",
+            (TEMPLATE_IN_USE_LOCK, dbname),
+        )
+        yield  # the lock goes with the connection
+
+
+def drop_stale_templates(server: DatabaseConfig, keep: str) -> list[str]:
+    """Drop templates built for other migration keys that no session is using; returns
+    their names."""
+    dropped: list[str] = []
+    with admin_connection(server) as connection:
+        names = [
+            row[0]
+            for row in connection.execute(
+                "SELECT datname FROM pg_database WHERE datistemplate AND datname LIKE %s "
+                "AND datname <> %s;",
+                (f"{TEMPLATE_DATABASE}_%", keep),
+            )
+        ]
+        for name in names:
+            lock = (TEMPLATE_IN_USE_LOCK, name)
+            locked = connection.execute(
+                "SELECT pg_try_advisory_lock(hashtext(%s), hashtext(%s));", lock
+            ).fetchone()
+            if locked is None or not locked[0]:
+                continue  # in use by another session
+            try:
+                identifier = sql.Identifier(name)
+                try:
+                    connection.execute(
+                        sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false;").format(identifier)
+                    )
+                except psycopg.errors.InvalidCatalogName:
+                    continue  # dropped by another worker
+                connection.execute(
+                    sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE);").format(identifier)
+                )
+                dropped.append(name)
+            finally:
+                connection.execute("SELECT pg_advisory_unlock(hashtext(%s), hashtext(%s));", lock)
+    return dropped
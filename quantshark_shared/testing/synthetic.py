@@ -0,0 +1,295 @@
+"""Seedable high-volume synthetic contracts and funding points.
+
+Contracts are created with one set-based INSERT. Funding rates follow a per-contract
+mean-reverting (Ornstein-Uhlenbeck) hourly premium with rare jumps, scaled to each
+contract's funding_interval and clamped to an exchange-style cap. Historical points are
+settlements every funding_interval hours; live points are predictions every live_step.
+Rows are streamed with binary COPY straight into the hypertables, so a dataset of
+millions of points loads in seconds. The same dataset and seed always produce the same
+rows.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import random
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import cast
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from quantshark_shared.ingestion.bulk import (
+    COPY_CHUNK_ROWS,
+    COPY_HEADER,
+    COPY_ROW,
+    COPY_TRAILER,
+    PG_EPOCH_US,
+)
+from quantshark_shared.timescale.backfill import aggregate_order
+
+HOUR_US = 3_600_000_000
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Hourly premium process: long-run mean and spread of per-contract means, reversion
+# speed (per hour), volatility (per sqrt hour), jump probability and size (per hour)
+MEAN_HOURLY_RATE = 0.0000125  # 0.01% per 8h
+MEAN_SPREAD = 0.00001
+REVERSION = 0.05
+VOLATILITY = 0.000004
+JUMP_PROBABILITY = 0.002
+JUMP_SIZE = 0.0002
+RATE_CAP_8H = 0.0075  # +-0.75% per 8h, scaled to the funding interval
+
+
+@dataclass(frozen=True)
+class SyntheticDataset:
+    name: str
+    contracts: int
+    historical_days: int
+    live_days: int  # keep within the 7-day live retention policy
+    live_step: datetime.timedelta = datetime.timedelta(minutes=1)
+    seed: int = 42
+    sections: tuple[str, ...] = ("binance_futures", "bybit_linear", "okx_swap", "hyperliquid")
+    quotes: tuple[str, ...] = ("USDT", "USDC")
+    funding_intervals: tuple[int, ...] = (1, 4, 8, 8)  # sampled uniformly: 8h is common
+    end: datetime.datetime | None = None  # naive UTC; None: the current hour
+
+    @property
+    def asset_prefix(self) -> str:
+        return f"SYN{self.name.upper()}"
+
+
+@dataclass(frozen=True)
+class SyntheticContract:
+    id: uuid.UUID
+    asset_name: str
+    section_name: str
+    quote_name: str
+    funding_interval: int
+
+
+@dataclass(frozen=True)
+class SyntheticSummary:
+    dataset: SyntheticDataset
+    contracts: list[SyntheticContract]
+    start: datetime.datetime
+    end: datetime.datetime
+    historical_rows: int
+    live_rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = self.historical_rows + self.live_rows
+        return rows / self.seconds if self.seconds else 0.0
+
+
+DATASETS = {
+    "tiny": SyntheticDataset("tiny", contracts=20, historical_days=30, live_days=1),
+    "small": SyntheticDataset("small", contracts=200, historical_days=180, live_days=3),
+    "large": SyntheticDataset("large", contracts=2_000, historical_days=365, live_days=7),
+}
+
+
+def _rate_process(
+    rng: random.Random,
+    start_us: int,
+    step_us: int,
+    count: int,
+    funding_interval: int,
+    mean: float,
+) -> Iterator[tuple[int, float]]:
+    """Yield (timestamp_us, funding_rate) for one contract at a fixed step."""
+    dt = step_us / HOUR_US
+    decay = math.exp(-REVERSION * dt)
+    noise = VOLATILITY * math.sqrt((1 - decay * decay) / (2 * REVERSION))
+    jump_probability = JUMP_PROBABILITY * dt
+    cap = RATE_CAP_8H * funding_interval / 8
+    hourly = mean
+    for index in range(count):
+        hourly = mean + (hourly - mean) * decay + rng.gauss(0.0, noise)
+        if rng.random() < jump_probability:
+            hourly += rng.choice((-1, 1)) * JUMP_SIZE
+        yield start_us + index * step_us, min(max(hourly * funding_interval, -cap), cap)
+
+
+def _copy_stream(
+    dataset: SyntheticDataset,
+    contracts: list[SyntheticContract],
+    start_us: int,
+    end_us: int,
+    live: bool,
+) -> Iterator[bytes]:
+    yield COPY_HEADER
+    pack = COPY_ROW.pack_into
+    chunk = bytearray(COPY_ROW.size * COPY_CHUNK_ROWS)
+    filled = 0
+    for index, contract in enumerate(contracts):
+        # One stream per contract and table: adding contracts never changes earlier ones
+        rng = random.Random(f"{dataset.seed}:{index}:{'live' if live else 'historical'}")
+        mean = random.Random(f"{dataset.seed}:{index}").gauss(MEAN_HOURLY_RATE, MEAN_SPREAD)
+        step_us = dataset.live_step // MICROSECOND if live else contract.funding_interval * HOUR_US
+        first_us = -(-start_us // step_us) * step_us  # first step boundary at or after start
+        count = max(0, -(-(end_us - first_us) // step_us))  # points in [first, end)
+        contract_id = contract.id.bytes
+        for micros, funding_rate in _rate_process(
+            rng, first_us, step_us, count, contract.funding_interval, mean
+        ):
+            pack(
+                chunk,
+                filled * COPY_ROW.size,
+                3,
+                16,
+                contract_id,
+                8,
+                micros - PG_EPOCH_US,
+                8,
+                funding_rate,
+            )
+            filled += 1
+            if filled == COPY_CHUNK_ROWS:
+                yield bytes(chunk)
+                filled = 0
+    yield bytes(chunk[: filled * COPY_ROW.size])
+    yield COPY_TRAILER
+
+
+async def _copy_points(
+    connection: AsyncConnection, table_name: str, stream: Iterator[bytes]
+) -> int:
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = cast(psycopg.AsyncConnection, raw_connection.driver_connection)
+    async with driver_connection.cursor() as cursor:
+        copy_sql = sql.SQL(
+            "COPY {} (contract_id, timestamp, funding_rate) FROM STDIN (FORMAT BINARY)"
+        ).format(sql.Identifier(table_name))
+        async with cursor.copy(copy_sql) as copy:
+            for data in stream:
+                await copy.write(data)
+        return cursor.rowcount
+
+
+async def create_contracts(
+    connection: AsyncConnection,
+    dataset: SyntheticDataset,
+) -> list[SyntheticContract]:
+    """Insert the dataset's assets, sections, quotes and contracts in four statements."""
+    rng = random.Random(f"{dataset.seed}:contracts")
+    assets = [f"{dataset.asset_prefix}{index:06d}" for index in range(dataset.contracts)]
+    sections = [dataset.sections[index % len(dataset.sections)] for index in range(len(assets))]
+    quotes = [dataset.quotes[index % len(dataset.quotes)] for index in range(len(assets))]
+    intervals = [rng.choice(dataset.funding_intervals) for _ in assets]
+
+    await connection.execute(
+        text(
+            "INSERT INTO asset (name) SELECT unnest(CAST(:names AS TEXT[])) "
+            "ON CONFLICT DO NOTHING;"
+        ),
+        {"names": assets},
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO section (name) SELECT unnest(CAST(:names AS TEXT[])) "
+            "ON CONFLICT DO NOTHING;"
+        ),
+        {"names": list(dataset.sections)},
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO quote (name) SELECT unnest(CAST(:names AS TEXT[])) "
+            "ON CONFLICT DO NOTHING;"
+        ),
+        {"names": list(dataset.quotes)},
+    )
+    result = await connection.execute(
+        text(
+            """
+            INSERT INTO contract (asset_name, section_name, quote_name, funding_interval,
+                                  synced, deprecated)
+            SELECT a, s, q, i, true, false
+            FROM unnest(
+                CAST(:assets AS TEXT[]), CAST(:sections AS TEXT[]),
+                CAST(:quotes AS TEXT[]), CAST(:intervals AS INTEGER[])
+            ) AS t (a, s, q, i)
+            RETURNING id, asset_name, section_name, quote_name, funding_interval;
+            """
+        ),
+        {"assets": assets, "sections": sections, "quotes": quotes, "intervals": intervals},
+    )
+    contracts = [SyntheticContract(*row) for row in result.tuples()]
+    contracts.sort(key=lambda contract: contract.asset_name)  # RETURNING order is unspecified
+    return contracts
+
+
+async def refresh_all_aggregates(engine: AsyncEngine, end: datetime.datetime) -> None:
+    """Materialize every continuous aggregate up to end, lower tiers first."""
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        for view_name in await aggregate_order(autocommit):
+            await autocommit.execute(
+                text(
+                    "CALL refresh_continuous_aggregate("
+                    "CAST(:view_name AS REGCLASS), NULL, CAST(:end AS TIMESTAMP));"
+                ),
+                {"view_name": view_name, "end": end},
+            )
+
+
+async def generate_dataset(
+    engine: AsyncEngine,
+    dataset: SyntheticDataset | str,
+    refresh_aggregates: bool = True,
+) -> SyntheticSummary:
+    """Create the dataset's contracts and fill both funding hypertables.
+
+    Contracts must not exist yet. funding_latest is rebuilt from the loaded points and,
+    unless refresh_aggregates is False, every continuous aggregate is materialized.
+    """
+    if isinstance(dataset, str):
+        dataset = DATASETS[dataset]
+
+    started = time.perf_counter()
+    end = dataset.end or datetime.datetime.now(datetime.UTC).replace(
+        tzinfo=None, minute=0, second=0, microsecond=0
+    )
+    start = end - datetime.timedelta(days=dataset.historical_days)
+    live_start = end - datetime.timedelta(days=dataset.live_days)
+    end_us = (end - EPOCH) // MICROSECOND
+    historical_start_us = (start - EPOCH) // MICROSECOND
+    live_start_us = (live_start - EPOCH) // MICROSECOND
+
+    async with engine.begin() as connection:
+        contracts = await create_contracts(connection, dataset)
+        historical_rows = await _copy_points(
+            connection,
+            "historical_funding_point",
+            _copy_stream(dataset, contracts, historical_start_us, end_us, live=False),
+        )
+        live_rows = await _copy_points(
+            connection,
+            "live_funding_point",
+            _copy_stream(dataset, contracts, live_start_us, end_us, live=True),
+        )
+        # COPY bypasses the ingestion path that maintains the snapshot
+        await connection.execute(text("SELECT rebuild_funding_latest();"))
+
+    if refresh_aggregates:
+        await refresh_all_aggregates(engine, end)
+
+    return SyntheticSummary(
+        dataset=dataset,
+        contracts=contracts,
+        start=start,
+        end=end,
+        historical_rows=historical_rows,
+        live_rows=live_rows,
+        seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,41 @@
+"""TimescaleDB maintenance helpers."""
+
+from quantshark_shared.timescale.backfill import (
+    BackfillReport,
+    BackfillSlice,
+    SliceResult,
+    backfill_aggregate,
+    backfill_aggregates,
+    plan_slices,
+)
+from quantshark_shared.timescale.compression import (
+    FUNDING_COMPRESSION_POLICIES,
+    CompressionPolicy,
+    CompressionStats,
+    compress_chunks,
+    enable_compression,
+    get_compression_stats,
+)
+from quantshark_shared.timescale.version import (
+    INTERNAL_CATALOG_VERSIONS,
+    require_internal_catalog,
+    timescaledb_version,
+)
+
+__all__ = [
+    "FUNDING_COMPRESSION_POLICIES",
+    "INTERNAL_CATALOG_VERSIONS",
+    "BackfillReport",
+    "BackfillSlice",
+    "CompressionPolicy",
+    "CompressionStats",
+    "SliceResult",
+    "backfill_aggregate",
+    "backfill_aggregates",
+    "compress_chunks",
+    "enable_compression",
+    "get_compression_stats",
+    "plan_slices",
+    "require_internal_catalog",
+    "timescaledb_version",
+]
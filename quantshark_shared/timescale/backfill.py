@@ -0,0 +1,432 @@
+"""Resumable, sliced backfill of continuous aggregates.
+
+A backfill refreshes an aggregate in bucket-aligned time slices instead of one long
+refresh_continuous_aggregate call. Slices of one aggregate do not overlap, so up to
+``concurrency`` of them refresh at once, each on its own autocommit connection. Every
+finished slice is checkpointed in cagg_backfill_progress (migration 017); an interrupted
+run resumes where it stopped and only the slices in flight are refreshed again. Slice
+boundaries sit on a fixed grid, so a resume finds the earlier checkpoints even after
+retention has moved the oldest source data.
+
+Aggregates are processed in hierarchy order, lower tiers first. The backfill range never
+starts before the oldest data of the aggregate's source: refreshing a range whose source
+data was dropped by retention deletes the aggregate rows for that range. From a source
+with a retention policy the oldest bucket is partial and is skipped; from one without,
+it holds all the data there is and is refreshed.
+
+Usage:
+    python -m quantshark_shared.timescale.backfill lfp_1hour lfp_1day \
+        --start 2026-01-01 --slice-hours 24 --concurrency 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from itertools import pairwise
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from quantshark_shared.settings.engine import get_engine
+from quantshark_shared.timescale.version import require_internal_catalog
+
+DEFAULT_SLICE = datetime.timedelta(days=1)
+DEFAULT_CONCURRENCY = 2
+
+# Hierarchy depth from the information views: a tier's source is the materialization
+# hypertable of the tier it reads
+AGGREGATE_ORDER_SQL = text(
+    """
+    WITH RECURSIVE tier AS (
+        SELECT ca.view_name, ca.materialization_hypertable_schema,
+               ca.materialization_hypertable_name, 0 AS depth
+        FROM timescaledb_information.continuous_aggregates ca
+        WHERE NOT EXISTS (
+            SELECT 1 FROM timescaledb_information.continuous_aggregates parent
+            WHERE parent.materialization_hypertable_schema = ca.hypertable_schema
+              AND parent.materialization_hypertable_name = ca.hypertable_name
+        )
+        UNION ALL
+        SELECT ca.view_name, ca.materialization_hypertable_schema,
+               ca.materialization_hypertable_name, tier.depth + 1
+        FROM timescaledb_information.continuous_aggregates ca
+        JOIN tier
+            ON ca.hypertable_schema = tier.materialization_hypertable_schema
+           AND ca.hypertable_name = tier.materialization_hypertable_name
+    )
+    SELECT view_name FROM tier ORDER BY depth, view_name;
+    """
+)
+
+# Source relation (raw hypertable or lower tier's materialization), materialization,
+# bucket width and whether the source has a retention policy, for one aggregate;
+# relation and column names come back quoted. Only the bucket width needs the internal
+# catalog (see quantshark_shared.timescale.version).
+AGGREGATE_SQL = text(
+    """
+    SELECT
+        format('%I.%I', ca.hypertable_schema, ca.hypertable_name),
+        quote_ident(source_time.column_name),
+        format('%I.%I', ca.materialization_hypertable_schema,
+               ca.materialization_hypertable_name),
+        quote_ident(mat_time.column_name),
+        (
+            SELECT bf.bucket_width
+            FROM _timescaledb_catalog.continuous_aggs_bucket_function bf
+            JOIN _timescaledb_catalog.hypertable mat ON mat.id = bf.mat_hypertable_id
+            WHERE mat.schema_name = ca.materialization_hypertable_schema
+              AND mat.table_name = ca.materialization_hypertable_name
+        ),
+        EXISTS (
+            SELECT 1 FROM timescaledb_information.jobs j
+            WHERE j.proc_name = 'policy_retention'
+              AND j.hypertable_schema = ca.hypertable_schema
+              AND j.hypertable_name = ca.hypertable_name
+        )
+    FROM timescaledb_information.continuous_aggregates ca
+    CROSS JOIN LATERAL (
+        SELECT column_name FROM timescaledb_information.dimensions d
+        WHERE d.hypertable_schema = ca.hypertable_schema
+          AND d.hypertable_name = ca.hypertable_name
+        ORDER BY dimension_number LIMIT 1
+    ) source_time
+    CROSS JOIN LATERAL (
+        SELECT column_name FROM timescaledb_information.dimensions d
+        WHERE d.hypertable_schema = ca.materialization_hypertable_schema
+          AND d.hypertable_name = ca.materialization_hypertable_name
+        ORDER BY dimension_number LIMIT 1
+    ) mat_time
+    WHERE ca.view_schema = current_schema() AND ca.view_name = :view_name;
+    """
+)
+
+# Slice boundaries on the bucket grid: end rounded down and start rounded up to a bucket
+# boundary, so no slice materializes a partial bucket, unless round_down says the bucket
+# holding start is complete. Inner boundaries sit on a fixed slice grid (time_bucket's
+# default origin), not counted from start, so they do not move when retention drops the
+# oldest source chunks between an interrupted run and its resume.
+SLICE_BOUNDARIES_SQL = text(
+    """
+    WITH bounds AS (
+        SELECT
+            CASE WHEN CAST(:round_down AS BOOLEAN)
+                THEN time_bucket(CAST(:width AS INTERVAL), CAST(:start AS TIMESTAMP))
+                ELSE time_bucket(
+                    CAST(:width AS INTERVAL),
+                    CAST(:start AS TIMESTAMP) + CAST(:width AS INTERVAL) - INTERVAL '1 microsecond'
+                )
+            END AS first,
+            time_bucket(CAST(:width AS INTERVAL), CAST(:end AS TIMESTAMP)) AS last
+    )
+    SELECT grid.boundary
+    FROM bounds, (
+        SELECT first AS boundary FROM bounds
+        UNION
+        SELECT time_bucket(CAST(:width AS INTERVAL), time_bucket(CAST(:slice AS INTERVAL), ts))
+        FROM bounds, generate_series(
+            time_bucket(CAST(:slice AS INTERVAL), bounds.first),
+            bounds.last,
+            CAST(:slice AS INTERVAL)
+        ) ts
+        UNION
+        SELECT last FROM bounds
+    ) grid
+    WHERE bounds.last > bounds.first
+      AND grid.boundary >= bounds.first
+      AND grid.boundary <= bounds.last
+    ORDER BY grid.boundary;
+    """
+)
+
+PROGRESS_SQL = text(
+    "SELECT slice_start, slice_end FROM cagg_backfill_progress WHERE view_name = :view_name;"
+)
+
+CHECKPOINT_SQL = text(
+    """
+    INSERT INTO cagg_backfill_progress
+        (view_name, slice_start, slice_end, materialized_rows, seconds)
+    VALUES (:view_name, :start, :end, :rows, :seconds)
+    ON CONFLICT (view_name, slice_start, slice_end) DO UPDATE
+    SET materialized_rows = EXCLUDED.materialized_rows,
+        seconds = EXCLUDED.seconds,
+        finished_at = NOW() AT TIME ZONE 'UTC';
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BackfillSlice:
+    start: datetime.datetime
+    end: datetime.datetime
+
+
+@dataclass(frozen=True, slots=True)
+class SliceResult:
+    view_name: str
+    start: datetime.datetime
+    end: datetime.datetime
+    rows: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class BackfillReport:
+    view_name: str
+    start: datetime.datetime | None  # None: the source has no data
+    end: datetime.datetime
+    slices: int
+    skipped: int  # checkpointed by an earlier run
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def slices_per_second(self) -> float:
+        refreshed = self.slices - self.skipped
+        return refreshed / self.seconds if self.seconds else 0.0
+
+
+async def aggregate_order(connection: AsyncConnection) -> list[str]:
+    """Continuous aggregate names, lower tiers first."""
+    return list((await connection.execute(AGGREGATE_ORDER_SQL)).scalars().all())
+
+
+async def _aggregate_relations(
+    connection: AsyncConnection, view_name: str
+) -> tuple[str, str, str, str, str, bool]:
+    """(source, source time column, materialization, its time column, bucket width,
+    whether the source has a retention policy)"""
+    await require_internal_catalog(connection)
+    result = await connection.execute(AGGREGATE_SQL, {"view_name": view_name})
+    row = result.tuples().one_or_none()
+    if row is None:
+        raise ValueError(f"Not a continuous aggregate: {view_name}")
+    return row
+
+
+def _checkpointed(backfill_slice: BackfillSlice, done: Sequence[BackfillSlice]) -> bool:
+    # Covered, not only equal: a resumed run's first slice shrinks when retention has
+    # dropped source chunks since the checkpoint was written
+    return any(
+        checkpoint.start <= backfill_slice.start and backfill_slice.end <= checkpoint.end
+        for checkpoint in done
+    )
+
+
+async def plan_slices(
+    connection: AsyncConnection,
+    view_name: str,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    slice_width: datetime.timedelta = DEFAULT_SLICE,
+) -> list[BackfillSlice]:
+    """Bucket-aligned slices covering [start, end), clamped to the source's data.
+
+    start defaults to the oldest source data and end to now (naive UTC). A start inside a
+    bucket skips that bucket, except at the oldest data of a source without retention.
+    """
+    source, source_time, _, _, bucket_width, retained = await _aggregate_relations(
+        connection, view_name
+    )
+
+    oldest = (await connection.execute(text(f"SELECT min({source_time}) FROM {source};"))).scalar()
+    if oldest is None:
+        return []
+    # Without retention nothing precedes the oldest row, so its bucket is already complete
+    round_down = not retained and (start is None or start <= oldest)
+    start = oldest if start is None else max(start, oldest)
+    end = end or datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+    result = await connection.execute(
+        SLICE_BOUNDARIES_SQL,
+        {
+            "width": bucket_width,
+            "start": start,
+            "end": end,
+            "slice": slice_width,
+            "round_down": round_down,
+        },
+    )
+    boundaries = list(result.scalars().all())
+    return [BackfillSlice(*pair) for pair in pairwise(boundaries)]
+
+
+async def _refresh_slice(
+    engine: AsyncEngine,
+    view_name: str,
+    materialization: str,
+    materialization_time: str,
+    backfill_slice: BackfillSlice,
+) -> SliceResult:
+    params = {"view_name": view_name, "start": backfill_slice.start, "end": backfill_slice.end}
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        started = time.perf_counter()
+        await autocommit.execute(
+            text(
+                "CALL refresh_continuous_aggregate(CAST(:view_name AS REGCLASS), "
+                "CAST(:start AS TIMESTAMP), CAST(:end AS TIMESTAMP));"
+            ),
+            params,
+        )
+        seconds = time.perf_counter() - started
+        rows = (
+            await autocommit.execute(
+                text(
+                    f"SELECT count(*) FROM {materialization} "
+                    f"WHERE {materialization_time} >= :start AND {materialization_time} < :end;"
+                ),
+                params,
+            )
+        ).scalar_one()
+        await autocommit.execute(CHECKPOINT_SQL, {**params, "rows": rows, "seconds": seconds})
+    return SliceResult(view_name, backfill_slice.start, backfill_slice.end, rows, seconds)
+
+
+async def backfill_aggregate(
+    engine: AsyncEngine,
+    view_name: str,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    slice_width: datetime.timedelta = DEFAULT_SLICE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    restart: bool = False,
+    on_slice: Callable[[SliceResult], None] | None = None,
+) -> BackfillReport:
+    """Refresh one aggregate slice by slice, skipping slices checkpointed earlier.
+
+    restart=True forgets the aggregate's checkpoints first. on_slice is called after
+    each refreshed slice, in completion order.
+    """
+    end = end or datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+    async with engine.connect() as connection:
+        _, _, materialization, materialization_time, _, _ = await _aggregate_relations(
+            connection, view_name
+        )
+        slices = await plan_slices(connection, view_name, start, end, slice_width)
+        if restart:
+            await connection.execute(
+                text("DELETE FROM cagg_backfill_progress WHERE view_name = :view_name;"),
+                {"view_name": view_name},
+            )
+            await connection.commit()
+        done = [
+            BackfillSlice(*row)
+            for row in (await connection.execute(PROGRESS_SQL, {"view_name": view_name}))
+        ]
+
+    pending = [
+        backfill_slice for backfill_slice in slices if not _checkpointed(backfill_slice, done)
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def refresh(backfill_slice: BackfillSlice) -> SliceResult:
+        async with semaphore:
+            result = await _refresh_slice(
+                engine, view_name, materialization, materialization_time, backfill_slice
+            )
+        if on_slice is not None:
+            on_slice(result)
+        return result
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(refresh(backfill_slice) for backfill_slice in pending))
+    return BackfillReport(
+        view_name=view_name,
+        start=slices[0].start if slices else None,
+        end=slices[-1].end if slices else end,
+        slices=len(slices),
+        skipped=len(slices) - len(pending),
+        rows=sum(result.rows for result in results),
+        seconds=time.perf_counter() - started,
+    )
+
+
+async def backfill_aggregates(
+    engine: AsyncEngine | None = None,
+    view_names: Sequence[str] | None = None,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    slice_width: datetime.timedelta = DEFAULT_SLICE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    restart: bool = False,
+    on_slice: Callable[[SliceResult], None] | None = None,
+) -> list[BackfillReport]:
+    """Backfill view_names (default: every continuous aggregate), lower tiers first."""
+    engine = engine or get_engine()
+    async with engine.connect() as connection:
+        ordered = await aggregate_order(connection)
+    if view_names is not None:
+        unknown = set(view_names) - set(ordered)
+        if unknown:
+            raise ValueError(f"Not continuous aggregates: {', '.join(sorted(unknown))}")
+        ordered = [view_name for view_name in ordered if view_name in view_names]
+
+    # One end for every tier, so upper tiers never read past what lower tiers cover
+    end = end or datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+    return [
+        await backfill_aggregate(
+            engine, view_name, start, end, slice_width, concurrency, restart, on_slice
+        )
+        for view_name in ordered
+    ]
+
+
+def _print_slice(result: SliceResult) -> None:
+    print(  # noqa: T201
+        f"{result.view_name:<12} {result.start:%Y-%m-%d %H:%M} -> {result.end:%Y-%m-%d %H:%M}"
+        f" {result.rows:>10} rows {result.seconds:8.2f}s"
+    )
+
+
+def _print_report(report: BackfillReport) -> None:
+    print(  # noqa: T201
+        f"{report.view_name:<12} {report.slices - report.skipped}/{report.slices} slices"
+        f" ({report.skipped} resumed), {report.rows} rows in {report.seconds:.1f}s:"
+        f" {report.rows_per_second:,.0f} rows/s, {report.slices_per_second:.2f} slices/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("views", nargs="*", help="aggregates to backfill (default: all)")
+    parser.add_argument("--start", type=datetime.datetime.fromisoformat, help="naive UTC")
+    parser.add_argument("--end", type=datetime.datetime.fromisoformat, help="naive UTC")
+    parser.add_argument("--slice-hours", type=float, default=DEFAULT_SLICE.total_seconds() / 3600)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--restart", action="store_true", help="ignore earlier checkpoints")
+    args = parser.parse_args()
+
+    async def run() -> list[BackfillReport]:
+        engine = get_engine()
+        try:
+            return await backfill_aggregates(
+                engine,
+                args.views or None,
+                args.start,
+                args.end,
+                datetime.timedelta(hours=args.slice_hours),
+                args.concurrency,
+                args.restart,
+                _print_slice,
+            )
+        finally:
+            await engine.dispose()
+
+    for report in asyncio.run(run()):
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
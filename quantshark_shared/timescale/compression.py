@@ -0,0 +1,115 @@
+"""Native columnar compression helpers for funding hypertables."""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    hypertable: str
+    compress_after: datetime.timedelta
+    segmentby: str = "contract_id"
+    orderby: str = "timestamp DESC"
+
+
+@dataclass(frozen=True)
+class CompressionStats:
+    hypertable: str
+    total_chunks: int
+    compressed_chunks: int
+    before_bytes: int
+    after_bytes: int
+
+    @property
+    def ratio(self) -> float:
+        """Uncompressed / compressed size of the compressed chunks (0 if none)."""
+        if not self.after_bytes:
+            return 0.0
+        return self.before_bytes / self.after_bytes
+
+
+# Mirrors migration 007
+FUNDING_COMPRESSION_POLICIES = (
+    CompressionPolicy("live_funding_point", datetime.timedelta(days=3)),
+    CompressionPolicy("historical_funding_point", datetime.timedelta(days=7)),
+)
+
+
+async def enable_compression(engine: AsyncEngine, policy: CompressionPolicy) -> None:
+    """Enable compression on a hypertable and (re)create its compression policy."""
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await autocommit.execute(
+            text(
+                f"""
+                ALTER TABLE {policy.hypertable} SET (
+                    timescaledb.compress,
+                    timescaledb.compress_segmentby = '{policy.segmentby}',
+                    timescaledb.compress_orderby = '{policy.orderby}'
+                );
+                """
+            )
+        )
+        await autocommit.execute(
+            text("SELECT remove_compression_policy(:hypertable, if_exists => true);"),
+            {"hypertable": policy.hypertable},
+        )
+        await autocommit.execute(
+            text("SELECT add_compression_policy(:hypertable, CAST(:after AS INTERVAL));"),
+            {"hypertable": policy.hypertable, "after": policy.compress_after},
+        )
+
+
+async def compress_chunks(
+    engine: AsyncEngine,
+    hypertable: str,
+    older_than: datetime.timedelta,
+) -> int:
+    """Compress every uncompressed chunk older than older_than now, without waiting for
+    the policy job. Returns the number of chunks processed."""
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        result = await autocommit.execute(
+            text(
+                """
+                SELECT compress_chunk(c, if_not_compressed => true)
+                FROM show_chunks(CAST(:hypertable AS REGCLASS),
+                                 older_than => CAST(:older_than AS INTERVAL)) c;
+                """
+            ),
+            {"hypertable": hypertable, "older_than": older_than},
+        )
+        return len(result.fetchall())
+
+
+async def get_compression_stats(engine: AsyncEngine, hypertable: str) -> CompressionStats:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                """
+                SELECT
+                    coalesce(total_chunks, 0),
+                    coalesce(number_compressed_chunks, 0),
+                    coalesce(before_compression_total_bytes, 0),
+                    coalesce(after_compression_total_bytes, 0)
+                FROM hypertable_compression_stats(CAST(:hypertable AS REGCLASS));
+                """
+            ),
+            {"hypertable": hypertable},
+        )
+        row = result.one_or_none()
+
+    if row is None:
+        return CompressionStats(hypertable, 0, 0, 0, 0)
+    return CompressionStats(
+        hypertable=hypertable,
+        total_chunks=row[0],
+        compressed_chunks=row[1],
+        before_bytes=row[2],
+        after_bytes=row[3],
+    )
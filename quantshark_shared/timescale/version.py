@@ -0,0 +1,43 @@
+"""TimescaleDB version guard for queries on its internal catalog.
+
+Metadata is read from the timescaledb_information views where they carry it; those are
+stable across releases. The rest (continuous aggregate bucket widths, the hypertable ids
+cagg_watermark takes, chunk index names) comes from _timescaledb_catalog and
+_timescaledb_functions, whose layout changes between versions. Queries on them are
+written against INTERNAL_CATALOG_VERSIONS and refuse to run on other versions.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# [first, last) extension versions the internal catalog queries are written against
+INTERNAL_CATALOG_VERSIONS = ((2, 15), (3, 0))
+
+TIMESCALEDB_VERSION_SQL = text(
+    "SELECT extversion FROM pg_extension WHERE extname = 'timescaledb';"
+)
+
+
+def parse_version(version: str) -> tuple[int, ...]:
+    """(2, 23, 0) for "2.23.0"; pre-release suffixes such as "-dev" are ignored."""
+    return tuple(int(part) for part in version.split("-", 1)[0].split("."))
+
+
+async def timescaledb_version(connection: AsyncConnection) -> tuple[int, ...] | None:
+    """Installed TimescaleDB extension version, None if the extension is not installed."""
+    version = (await connection.execute(TIMESCALEDB_VERSION_SQL)).scalar()
+    return None if version is None else parse_version(version)
+
+
+async def require_internal_catalog(connection: AsyncConnection) -> None:
+    """Raise RuntimeError unless the installed TimescaleDB is in INTERNAL_CATALOG_VERSIONS."""
+    version = await timescaledb_version(connection)
+    first, last = INTERNAL_CATALOG_VERSIONS
+    if version is None or not first <= version < last:
+        installed = "not installed" if version is None else ".".join(map(str, version))
+        raise RuntimeError(
+            f"TimescaleDB {installed}: internal catalog queries support "
+            f"{'.'.join(map(str, first))} up to {'.'.join(map(str, last))} (exclusive)"
+        )
@@ -0,0 +1 @@
+from quantshark_shared.testing.fixtures import *  # noqa: F403
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from quantshark_shared.catalog import Listing, sync_catalog
+
+LISTINGS = [
+    Listing("BTC", "USDT", 8, market_cap_rank=1),
+    Listing("ETH", "USDT", 8, market_cap_rank=2),
+    Listing("SOL", "USDC", 4),
+]
+
+
+async def _row_versions(session: AsyncSession) -> dict[str, str]:
+    """xmin of every asset, quote and contract row: unchanged unless the row was written."""
+    result = await session.execute(
+        text(
+            """
+            SELECT 'asset:' || name, xmin::TEXT FROM asset
+            UNION ALL SELECT 'quote:' || name, xmin::TEXT FROM quote
+            UNION ALL SELECT 'contract:' || asset_name || '/' || quote_name, xmin::TEXT
+            FROM contract
+            """
+        )
+    )
+    return dict(result.tuples().all())
+
+
+async def _contracts(session: AsyncSession) -> dict[str, tuple[int, bool]]:
+    result = await session.execute(
+        text(
+            "SELECT asset_name || '/' || quote_name, funding_interval, deprecated "
+            "FROM contract WHERE section_name = 'CEX';"
+        )
+    )
+    return {key: (interval, deprecated) for key, interval, deprecated in result.tuples()}
+
+
+async def _contract_id(session: AsyncSession, asset_name: str, quote_name: str) -> uuid.UUID:
+    result = await session.execute(
+        text(
+            "SELECT id FROM contract WHERE section_name = 'CEX' "
+            "AND asset_name = :asset_name AND quote_name = :quote_name;"
+        ),
+        {"asset_name": asset_name, "quote_name": quote_name},
+    )
+    return result.scalar_one()
+
+
+async def test_sync_creates_section_assets_quotes_and_contracts(db_session: AsyncSession) -> None:
+    diff = await sync_catalog(db_session, "CEX", LISTINGS)
+    await db_session.commit()
+
+    assert diff.section_created
+    assert sorted(diff.assets_created) == ["BTC", "ETH", "SOL"]
+    assert sorted(diff.quotes_created) == ["USDC", "USDT"]
+    assert len(diff.contracts_created) == 3
+    assert not diff.contracts_updated and not diff.contracts_deprecated
+    assert await _contracts(db_session) == {
+        "BTC/USDT": (8, False),
+        "ETH/USDT": (8, False),
+        "SOL/USDC": (4, False),
+    }
+
+
+async def test_unchanged_listings_write_nothing(db_session: AsyncSession) -> None:
+    await sync_catalog(db_session, "CEX", LISTINGS)
+    await db_session.commit()
+    before = await _row_versions(db_session)
+
+    diff = await sync_catalog(db_session, "CEX", list(reversed(LISTINGS)))
+    await db_session.commit()
+
+    assert not diff.changed
+    assert await _row_versions(db_session) == before
+
+
+async def test_interval_change_updates_only_that_contract(db_session: AsyncSession) -> None:
+    await sync_catalog(db_session, "CEX", LISTINGS)
+    await db_session.commit()
+    before = await _row_versions(db_session)
+
+    diff = await sync_catalog(db_session, "CEX", [*LISTINGS[:2], Listing("SOL", "USDC", 8)])
+    await db_session.commit()
+
+    assert diff.contracts_updated == [await _contract_id(db_session, "SOL", "USDC")]
+    assert not diff.contracts_created and not diff.contracts_reactivated
+    assert (await _contracts(db_session))["SOL/USDC"] == (8, False)
+    after = await _row_versions(db_session)
+    assert after["contract:SOL/USDC"] != before["contract:SOL/USDC"]
+    assert after["contract:BTC/USDT"] == before["contract:BTC/USDT"]
+
+
+async def test_missing_listings_are_deprecated_then_reactivated(db_session: AsyncSession) -> None:
+    await sync_catalog(db_session, "CEX", LISTINGS)
+    await db_session.commit()
+    eth = await _contract_id(db_session, "ETH", "USDT")
+
+    deprecated = await sync_catalog(db_session, "CEX", [LISTINGS[0], LISTINGS[2]])
+    await db_session.commit()
+
+    assert deprecated.contracts_deprecated == [eth]
+    assert (await _contracts(db_session))["ETH/USDT"] == (8, True)
+
+    reactivated = await sync_catalog(db_session, "CEX", LISTINGS)
+    await db_session.commit()
+
+    assert reactivated.contracts_reactivated == [eth]
+    assert not reactivated.contracts_created and not reactivated.contracts_deprecated
+    assert (await _contracts(db_session))["ETH/USDT"] == (8, False)
+
+
+async def test_deprecate_missing_false_keeps_unlisted_contracts(db_session: AsyncSession) -> None:
+    await sync_catalog(db_session, "CEX", LISTINGS)
+    await db_session.commit()
+
+    diff = await sync_catalog(db_session, "CEX", LISTINGS[:1], deprecate_missing=False)
+
+    assert not diff.contracts_deprecated
+    assert all(not deprecated for _, deprecated in (await _contracts(db_session)).values())
+
+
+async def test_rank_updates_only_differing_assets(db_session: AsyncSession) -> None:
+    await sync_catalog(db_session, "CEX", LISTINGS)
+    await db_session.commit()
+
+    diff = await sync_catalog(
+        db_session,
+        "DEX",
+        [
+            Listing("ETH", "USDT", 8, market_cap_rank=3),
+            Listing("BTC", "USDT", 8, market_cap_rank=1),
+        ],
+    )
+
+    assert diff.ranks_updated == ["ETH"]
+    assert not diff.assets_created
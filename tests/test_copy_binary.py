@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import datetime
+import struct
+import uuid
+
+import numpy as np
+import pytest
+
+from quantshark_shared.funding.columnar import decode_copy_binary
+from quantshark_shared.ingestion.bulk import (
+    COPY_CHUNK_ROWS,
+    COPY_HEADER,
+    COPY_ROW,
+    COPY_SIGNATURE,
+    COPY_TRAILER,
+    PG_EPOCH_US,
+    encode_copy_binary,
+)
+from quantshark_shared.models import FundingPointBatch
+
+CONTRACT_A = uuid.UUID("5f0c6e2a-3b1d-4c8e-9a7f-0123456789ab")
+CONTRACT_B = uuid.UUID("00000000-0000-0000-0000-000000000001")
+ROW_ID = CONTRACT_A.bytes
+ROW_MICROS = 820_540_800_000_000  # 2026-01-01, counted from the PostgreSQL epoch
+
+
+def _stream(*rows: bytes, extension: bytes = b"") -> bytes:
+    header = COPY_SIGNATURE + bytes(4) + struct.pack(">i", len(extension)) + extension
+    return header + b"".join(rows) + COPY_TRAILER
+
+
+def test_batch_round_trips_through_binary_copy() -> None:
+    points = [
+        (CONTRACT_A, datetime.datetime(2026, 1, 1), 0.0001),
+        (CONTRACT_B, datetime.datetime(1999, 12, 31, 23, 59, 59, 999999), -0.00025),
+        (CONTRACT_A, datetime.datetime(2026, 1, 1, 8, 0, 0, 1), 0.0),
+    ]
+
+    columns = decode_copy_binary(b"".join(encode_copy_binary(FundingPointBatch(points))))
+
+    assert len(columns) == 3
+    assert columns.contract_uuids() == [point[0] for point in points]
+    assert columns.timestamp.tolist() == [point[1] for point in points]
+    assert columns.rate.tolist() == [point[2] for point in points]
+
+
+def test_round_trip_across_encoder_chunks() -> None:
+    count = COPY_CHUNK_ROWS + 3
+    start = datetime.datetime(2026, 1, 1)
+    batch = FundingPointBatch(
+        (
+            CONTRACT_A if index % 2 else CONTRACT_B,
+            start + index * datetime.timedelta(seconds=1),
+            index / 1e6,
+        )
+        for index in range(count)
+    )
+
+    columns = decode_copy_binary(b"".join(encode_copy_binary(batch)))
+
+    assert len(columns) == count
+    assert columns.rate.tolist() == [index / 1e6 for index in range(count)]
+    expected = np.datetime64(start, "us") + np.arange(count) * np.timedelta64(1, "s")
+    assert (columns.timestamp == expected).all()
+    assert columns.contract_uuids()[:2] == [CONTRACT_B, CONTRACT_A]
+
+
+def test_empty_batch_round_trips() -> None:
+    stream = b"".join(encode_copy_binary(FundingPointBatch()))
+
+    assert stream == COPY_HEADER + COPY_TRAILER
+    assert len(decode_copy_binary(stream)) == 0
+
+
+def test_header_extension_is_skipped() -> None:
+    row = COPY_ROW.pack(3, 16, ROW_ID, 8, ROW_MICROS, 8, 0.5)
+
+    columns = decode_copy_binary(_stream(row, extension=b"\x00\x01\x02\x03"))
+
+    assert columns.contract_uuids() == [CONTRACT_A]
+    assert columns.timestamp.tolist() == [
+        datetime.datetime(1970, 1, 1) + datetime.timedelta(microseconds=ROW_MICROS + PG_EPOCH_US)
+    ]
+    assert columns.rate.tolist() == [0.5]
+
+
+def test_null_field_is_rejected() -> None:
+    # A NULL rate is a -1 length with no value bytes
+    row = struct.pack(">hi16siqi", 3, 16, ROW_ID, 8, ROW_MICROS, -1)
+
+    with pytest.raises(ValueError, match="NULL"):
+        decode_copy_binary(_stream(row, row, row))
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        COPY_ROW.pack(3, 16, ROW_ID, 4, ROW_MICROS, 8, 0.5),  # timestamp width
+        COPY_ROW.pack(3, 16, ROW_ID, 8, ROW_MICROS, 4, 0.5),  # rate width
+        COPY_ROW.pack(2, 16, ROW_ID, 8, ROW_MICROS, 8, 0.5),  # field count
+    ],
+)
+def test_wrong_field_width_is_rejected(row: bytes) -> None:
+    valid = COPY_ROW.pack(3, 16, ROW_ID, 8, ROW_MICROS, 8, 0.5)
+
+    with pytest.raises(ValueError):
+        decode_copy_binary(_stream(valid, row))
+
+
+def test_float4_rate_is_rejected() -> None:
+    row = struct.pack(">hi16siqif", 3, 16, ROW_ID, 8, ROW_MICROS, 4, 0.5)
+
+    with pytest.raises(ValueError):
+        decode_copy_binary(_stream(row))
+
+
+def test_missing_signature_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Not a binary COPY stream"):
+        decode_copy_binary(b"PGCOPY\n" + bytes(12) + COPY_TRAILER)
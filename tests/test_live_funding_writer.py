@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import uuid
+from collections.abc import Awaitable, Callable
+
+import pytest
+
+from quantshark_shared.ingestion import writer as writer_module
+from quantshark_shared.ingestion.writer import LiveFundingWriter, OverflowPolicy
+from quantshark_shared.models import FundingPointBatch
+
+CONTRACT_A = uuid.UUID("00000000-0000-0000-0000-00000000000a")
+CONTRACT_B = uuid.UUID("00000000-0000-0000-0000-00000000000b")
+CONTRACT_C = uuid.UUID("00000000-0000-0000-0000-00000000000c")
+T0 = datetime.datetime(2026, 1, 1)
+
+Point = tuple[uuid.UUID, datetime.datetime, float]
+
+
+class FakeSession:
+    async def __aenter__(self) -> FakeSession:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def begin(self) -> FakeSession:
+        return self
+
+
+def fake_sessionmaker() -> FakeSession:
+    return FakeSession()
+
+
+class FakeCopy:
+    """Stands in for copy_funding_points: records each written batch, or runs hook."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[Point]] = []
+        self.hook: Callable[[], Awaitable[None]] | None = None
+
+    async def __call__(
+        self, session: object, model: object, batch: FundingPointBatch, on_conflict: str
+    ) -> None:
+        if self.hook is not None:
+            hook, self.hook = self.hook, None
+            await hook()
+        self.batches.append([tuple(record) for record in batch])
+
+    @property
+    def written(self) -> list[Point]:
+        return [point for batch in self.batches for point in batch]
+
+
+@pytest.fixture
+def fake_copy(monkeypatch: pytest.MonkeyPatch) -> FakeCopy:
+    fake = FakeCopy()
+    monkeypatch.setattr(writer_module, "copy_funding_points", fake)
+    return fake
+
+
+def make_writer(
+    max_batch_size: int = 5_000, max_buffered: int = 50_000, overflow: OverflowPolicy = "block"
+) -> LiveFundingWriter:
+    return LiveFundingWriter(
+        sessionmaker=fake_sessionmaker,  # type: ignore[arg-type]
+        max_batch_size=max_batch_size,
+        flush_interval=3600.0,  # flushes below are explicit or on batch size
+        max_buffered=max_buffered,
+        overflow=overflow,
+    )
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_points_with_the_same_key_coalesce(fake_copy: FakeCopy) -> None:
+    writer = make_writer()
+
+    await writer.put(CONTRACT_A, T0, 0.1)
+    await writer.put(CONTRACT_B, T0, 0.2)
+    await writer.put(CONTRACT_A, T0, 0.3)
+
+    assert writer.buffered == 2
+    assert await writer.flush() == 2
+    assert fake_copy.written == [(CONTRACT_A, T0, 0.3), (CONTRACT_B, T0, 0.2)]
+    metrics = writer.metrics
+    assert (metrics.received, metrics.coalesced, metrics.flushed, metrics.batches) == (3, 1, 2, 1)
+
+
+async def test_blocked_put_is_released_by_a_flush(fake_copy: FakeCopy) -> None:
+    writer = make_writer(max_batch_size=2, max_buffered=2, overflow="block")
+    await writer.put(CONTRACT_A, T0, 0.1)
+    await writer.put(CONTRACT_B, T0, 0.2)
+
+    blocked = asyncio.create_task(writer.put(CONTRACT_C, T0, 0.3))
+    await settle()
+    assert not blocked.done()
+    # A point already buffered is coalesced without waiting for room
+    assert await writer.put(CONTRACT_A, T0, 0.4)
+
+    await writer.flush()
+    assert await asyncio.wait_for(blocked, 1.0) is True
+    assert fake_copy.written == [(CONTRACT_A, T0, 0.4), (CONTRACT_B, T0, 0.2)]
+    assert writer.buffered == 1
+
+
+async def test_overflow_drop_counts_rejected_points(fake_copy: FakeCopy) -> None:
+    writer = make_writer(max_batch_size=2, max_buffered=2, overflow="drop")
+    await writer.put(CONTRACT_A, T0, 0.1)
+    await writer.put(CONTRACT_B, T0, 0.2)
+
+    assert await writer.put(CONTRACT_C, T0, 0.3) is False
+    assert await writer.put(CONTRACT_C, T0 + datetime.timedelta(hours=1), 0.3) is False
+    assert await writer.put(CONTRACT_A, T0, 0.5) is True  # same key: coalesced, not dropped
+
+    assert writer.metrics.dropped == 2
+    assert writer.metrics.received == 5
+    assert writer.buffered == 2
+
+
+async def test_failed_flush_requeues_with_newer_points_winning(fake_copy: FakeCopy) -> None:
+    writer = make_writer()
+    await writer.put(CONTRACT_A, T0, 0.1)
+    await writer.put(CONTRACT_B, T0, 0.2)
+
+    async def fail_after_newer_point() -> None:
+        # Arrives while the batch is being written, then the write fails
+        await writer.put(CONTRACT_A, T0, 0.9)
+        raise ConnectionError("lost connection")
+
+    fake_copy.hook = fail_after_newer_point
+    with pytest.raises(ConnectionError):
+        await writer.flush()
+
+    assert writer.metrics.flush_errors == 1
+    assert writer.buffered == 2
+    assert await writer.flush() == 2
+    assert sorted(fake_copy.written) == [(CONTRACT_A, T0, 0.9), (CONTRACT_B, T0, 0.2)]
+
+
+async def test_requeue_drops_points_without_room(fake_copy: FakeCopy) -> None:
+    writer = make_writer(max_batch_size=1, max_buffered=1, overflow="drop")
+    await writer.put(CONTRACT_A, T0, 0.1)
+
+    async def fill_buffer_then_fail() -> None:
+        await writer.put(CONTRACT_B, T0, 0.2)
+        raise ConnectionError("lost connection")
+
+    fake_copy.hook = fill_buffer_then_fail
+    with pytest.raises(ConnectionError):
+        await writer.flush()
+
+    assert writer.metrics.dropped == 1  # CONTRACT_A could not go back
+    assert await writer.flush() == 1
+    assert fake_copy.written == [(CONTRACT_B, T0, 0.2)]
+
+
+async def test_close_drains_then_rejects_puts(fake_copy: FakeCopy) -> None:
+    writer = make_writer()
+    await writer.start()
+    await writer.put(CONTRACT_A, T0, 0.1)
+    await writer.put(CONTRACT_B, T0, 0.2)
+
+    await writer.close()
+
+    assert sorted(fake_copy.written) == [(CONTRACT_A, T0, 0.1), (CONTRACT_B, T0, 0.2)]
+    assert writer.buffered == 0
+    with pytest.raises(RuntimeError, match="closed"):
+        await writer.put(CONTRACT_C, T0, 0.3)
+
+
+async def test_close_fails_blocked_producers(fake_copy: FakeCopy) -> None:
+    writer = make_writer(max_batch_size=1, max_buffered=1, overflow="block")
+    await writer.put(CONTRACT_A, T0, 0.1)
+    blocked = asyncio.create_task(writer.put(CONTRACT_B, T0, 0.2))
+    await settle()
+
+    await writer.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        await blocked
+    assert fake_copy.written == [(CONTRACT_A, T0, 0.1)]
+
+
+async def test_background_flush_on_batch_size(fake_copy: FakeCopy) -> None:
+    async with make_writer(max_batch_size=2) as writer:
+        await writer.put(CONTRACT_A, T0, 0.1)
+        await writer.put(CONTRACT_B, T0, 0.2)
+        for _ in range(100):
+            if fake_copy.batches:
+                break
+            await asyncio.sleep(0.01)
+
+        assert fake_copy.batches == [[(CONTRACT_A, T0, 0.1), (CONTRACT_B, T0, 0.2)]]
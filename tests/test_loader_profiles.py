@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+from quantshark_shared.models import Asset, Contract, Section, loader_profile
+from quantshark_shared.models.loading import LoaderProfileName
+from quantshark_shared.testing import count_queries
+
+
+def _read_contract(contract: Contract) -> None:
+    assert contract.asset is not None
+    assert contract.section is not None
+
+
+def _read_contracts(owner: Asset | Section) -> None:
+    assert owner.contracts
+
+
+def _read_contract_assets(section: Section) -> None:
+    assert all(contract.asset is not None for contract in section.contracts)
+
+
+# profile -> (model it loads, statements expected, relationships read afterwards)
+PROFILES: dict[LoaderProfileName, tuple[type[SQLModel], int, Callable[..., object]]] = {
+    "contract_with_asset": (Contract, 1, lambda contract: contract.asset),
+    "contract_with_section": (Contract, 1, lambda contract: contract.section),
+    "contract_full": (Contract, 1, _read_contract),
+    "asset_with_contracts": (Asset, 2, _read_contracts),
+    "section_with_contracts": (Section, 2, _read_contracts),
+    "section_full": (Section, 2, _read_contract_assets),
+}
+
+
+@pytest.fixture
+async def seeded(
+    contract_factory: Callable[..., Awaitable[Contract]],
+) -> None:
+    await contract_factory("BTC", "CEX", "USDT")
+    await contract_factory("ETH", "CEX", "USDT")
+    await contract_factory("BTC", "DEX", "USDC")
+
+
+@pytest.fixture
+def session_factory(
+    engine: AsyncEngine,
+    db_session_kwargs: dict[str, object],
+) -> async_sessionmaker[AsyncSession]:
+    # A fresh identity map: nothing is loaded before the measured statement
+    return async_sessionmaker(engine, **db_session_kwargs)  # type: ignore[arg-type]
+
+
+async def test_plain_select_is_one_statement(
+    seeded: None,
+    engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        with count_queries(engine) as queries:
+            contracts = (await session.execute(select(Contract))).scalars().all()
+
+    assert len(contracts) == 3
+    assert queries.count == 1
+
+
+@pytest.mark.parametrize("name", list(PROFILES))
+async def test_loader_profile_statement_count(
+    name: LoaderProfileName,
+    seeded: None,
+    engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    model, expected, read = PROFILES[name]
+    async with session_factory() as session:
+        with count_queries(engine) as queries:
+            result = await session.execute(select(model).options(*loader_profile(name)))
+            rows = result.unique().scalars().all()
+            # Reading what the profile loads must not emit anything more
+            for row in rows:
+                read(row)
+
+    assert rows
+    assert queries.count == expected, queries.statements
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from quantshark_shared.funding import (
+    funding_multipliers,
+    get_funding_multiplier,
+    normalize_funding,
+)
+from quantshark_shared.funding.normalization import _numeric_div, _select_div_scale
+
+# Results of the same expressions on a PostgreSQL server, digits and scale included
+SERVER_DIVISIONS = [
+    ("1", "8.0", "0.12500000000000000000"),
+    ("8760", "3", "2920.0000000000000000"),
+    ("1", "3", "0.33333333333333333333"),
+    ("2", "3", "0.66666666666666666667"),
+    ("8", "8.0", "1.00000000000000000000"),
+    ("10000", "3", "3333.3333333333333333"),
+    ("1", "12", "0.08333333333333333333"),
+]
+
+# get_funding_multiplier(funding_interval, target_hours) on the server
+SERVER_MULTIPLIERS = [
+    (1, 1, "1"),
+    (1, 8760, "8760"),
+    (4, 1, "0.25000000000000000000"),
+    (4, 8, "2.0000000000000000"),
+    (4, 24, "6.0000000000000000"),
+    (4, 8760, "2190.0000000000000000"),
+    (8, 1, "0.12500000000000000000"),
+    (8, 8, "1.00000000000000000000"),
+    (8, 24, "3.0000000000000000"),
+    (8, 8760, "1095.0000000000000000"),
+    (3, 8760, "2920.0000000000000000"),
+    (12, 8760, "730.0000000000000000"),
+]
+
+
+@pytest.mark.parametrize(("dividend", "divisor", "expected"), SERVER_DIVISIONS)
+def test_numeric_division_matches_server(dividend: str, divisor: str, expected: str) -> None:
+    quotient = _numeric_div(Decimal(dividend), Decimal(divisor))
+
+    assert str(quotient) == expected
+
+
+def test_select_div_scale() -> None:
+    assert _select_div_scale(Decimal("1"), Decimal("8.0")) == 20
+    assert _select_div_scale(Decimal("8760"), Decimal("3")) == 16
+
+
+@pytest.mark.parametrize(("interval", "target", "expected"), SERVER_MULTIPLIERS)
+def test_funding_multiplier_matches_server(interval: int, target: int, expected: str) -> None:
+    assert str(get_funding_multiplier(interval, target)) == expected
+
+
+def test_funding_multipliers_are_correctly_rounded_floats() -> None:
+    multipliers = funding_multipliers([1, 3, 8, 3], 1)
+
+    assert multipliers.tolist() == [
+        1.0,
+        float(Decimal("0.33333333333333333333")),
+        0.125,
+        float(Decimal("0.33333333333333333333")),
+    ]
+
+
+def test_normalize_funding_every_target() -> None:
+    rates = np.array([0.0001, -0.0002])
+
+    normalized = normalize_funding(rates, [8, 4])
+
+    assert normalized.rate_1h.tolist() == [0.0001 * 0.125, -0.0002 * 0.25]
+    assert normalized.rate_8h.tolist() == [0.0001 * 1.0, -0.0002 * 2.0]
+    assert normalized.rate_1d.tolist() == [0.0001 * 3.0, -0.0002 * 6.0]
+    assert normalized.rate_365d.tolist() == [0.0001 * 1095.0, -0.0002 * 2190.0]
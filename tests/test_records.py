@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import datetime
+import uuid
+
+import pytest
+
+from quantshark_shared.ingestion.bulk import (
+    COPY_HEADER,
+    COPY_ROW,
+    COPY_TRAILER,
+    PG_EPOCH_US,
+    encode_copy_binary,
+)
+from quantshark_shared.models import FundingPointBatch, FundingPointRecord
+
+CONTRACT_A = uuid.UUID("00000000-0000-0000-0000-00000000000a")
+CONTRACT_B = uuid.UUID("00000000-0000-0000-0000-00000000000b")
+T0 = datetime.datetime(2026, 1, 1, 0, 0)
+T1 = datetime.datetime(2026, 1, 1, 8, 0, 0, 123456)
+
+
+def test_record_equality_and_hash_ignore_rate() -> None:
+    first = FundingPointRecord(CONTRACT_A, T0, 0.0001)
+    second = FundingPointRecord(CONTRACT_A, T0, 0.0002)
+
+    assert first == second
+    assert (first != second) is False
+    assert hash(first) == hash(second)
+    assert first != FundingPointRecord(CONTRACT_A, T1, 0.0001)
+    assert first != FundingPointRecord(CONTRACT_B, T0, 0.0001)
+    assert len({first, second}) == 1
+
+
+def test_record_never_equals_plain_tuple() -> None:
+    record = FundingPointRecord(CONTRACT_A, T0, 0.0001)
+    plain = (CONTRACT_A, T0, 0.0001)
+
+    assert (record == plain) is False
+    assert (plain == record) is False
+    assert record != plain
+    assert plain != record
+
+
+def test_record_ordering_uses_key_only() -> None:
+    higher_rate = FundingPointRecord(CONTRACT_A, T0, 0.0002)
+    lower_rate = FundingPointRecord(CONTRACT_A, T0, 0.0001)
+    later = FundingPointRecord(CONTRACT_A, T1, 0.0)
+
+    assert not higher_rate < lower_rate
+    assert not lower_rate < higher_rate
+    assert higher_rate <= lower_rate and higher_rate >= lower_rate
+    assert lower_rate < later and later > higher_rate
+    # Equal keys keep their input order under a stable sort
+    assert sorted([later, higher_rate, lower_rate]) == [higher_rate, lower_rate, later]
+    assert [r.funding_rate for r in sorted([higher_rate, lower_rate])] == [0.0002, 0.0001]
+
+
+def test_record_does_not_order_against_plain_tuple() -> None:
+    with pytest.raises(TypeError):
+        _ = FundingPointRecord(CONTRACT_A, T0, 0.0001) < (CONTRACT_A, T1, 0.0)
+
+
+def test_batch_indexing() -> None:
+    batch = FundingPointBatch([(CONTRACT_A, T0, 0.1), (CONTRACT_B, T1, 0.2)])
+
+    assert len(batch) == 2
+    assert batch.nbytes == 2 * (16 + 8 + 8)
+    assert tuple(batch[0]) == (CONTRACT_A, T0, 0.1)
+    assert tuple(batch[-1]) == (CONTRACT_B, T1, 0.2)
+    assert tuple(batch[-2]) == tuple(batch[0])
+    with pytest.raises(IndexError):
+        batch[2]
+    with pytest.raises(IndexError):
+        batch[-3]
+    assert [tuple(record) for record in batch] == [(CONTRACT_A, T0, 0.1), (CONTRACT_B, T1, 0.2)]
+
+
+def test_batch_converts_aware_timestamps_to_naive_utc() -> None:
+    aware = datetime.datetime(
+        2026, 1, 1, 10, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+    )
+
+    batch = FundingPointBatch([(CONTRACT_A, aware, 0.1)])
+
+    assert batch[0].timestamp == datetime.datetime(2026, 1, 1, 8, 0)
+    assert batch[0].timestamp.tzinfo is None
+
+
+def test_batch_deduplicated_keeps_last_value_in_first_occurrence_order() -> None:
+    batch = FundingPointBatch(
+        [
+            (CONTRACT_A, T0, 0.1),
+            (CONTRACT_B, T0, 0.2),
+            (CONTRACT_A, T1, 0.3),
+            (CONTRACT_A, T0, 0.4),
+            (CONTRACT_B, T0, 0.5),
+        ]
+    )
+
+    deduplicated = batch.deduplicated()
+
+    assert [tuple(record) for record in deduplicated] == [
+        (CONTRACT_A, T0, 0.4),
+        (CONTRACT_B, T0, 0.5),
+        (CONTRACT_A, T1, 0.3),
+    ]
+    assert len(batch) == 5  # the source batch is left as is
+
+
+def test_batch_round_trips_through_copy_encoder() -> None:
+    points = [(CONTRACT_A, T0, 0.0001), (CONTRACT_B, T1, -0.00025), (CONTRACT_A, T1, 0.0)]
+
+    stream = b"".join(encode_copy_binary(FundingPointBatch(points)))
+
+    assert stream.startswith(COPY_HEADER) and stream.endswith(COPY_TRAILER)
+    body = stream[len(COPY_HEADER) : -len(COPY_TRAILER)]
+    assert len(body) == len(points) * COPY_ROW.size
+    decoded = []
+    for offset in range(0, len(body), COPY_ROW.size):
+        fields, id_len, contract_id, ts_len, micros, rate_len, rate = COPY_ROW.unpack_from(
+            body, offset
+        )
+        assert (fields, id_len, ts_len, rate_len) == (3, 16, 8, 8)
+        timestamp = datetime.datetime(1970, 1, 1) + datetime.timedelta(
+            microseconds=micros + PG_EPOCH_US
+        )
+        decoded.append((uuid.UUID(bytes=contract_id), timestamp, rate))
+    assert decoded == points